@@ -0,0 +1,157 @@
+"""
+Benchmark routing and rendering of JavaScript-built parameter pages.
+
+Serves static parameter pages and pages whose table is built by a script
+(with an image, a web font and an ad script attached) from a local fixture
+server. First checks which pages the collector would send to the browser,
+including the saved pages in benchmarks/fixtures/extraction/, then renders
+the script-built pages the old way (a new Chrome per URL, everything
+loaded) and on the browser pool. The rendering needs Chrome and
+chromedriver and is skipped without them.
+
+Usage: python benchmarks/bench_browser_pool.py [pages]
+Defaults to 12 script-built pages and as many static ones.
+"""
+
+import glob
+import os
+import sys
+import time
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_fetch_engine import PAGE_TEMPLATE, FixtureServer
+from utils.browser_pool import BrowserPool, create_driver, needs_browser
+from utils.parameter_extraction import extract_page
+
+EXTRACTION_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "extraction")
+
+SCRIPT_PAGE_TEMPLATE = """<html><head>
+<style>@font-face {{ font-family: Brand; src: url(/assets/brand.woff2); }} body {{ font-family: Brand; }}</style>
+<script src="/ads/doubleclick.net/tag.js"></script>
+</head><body>
+<div id="root"></div>
+<img src="/assets/banner-{page}.png">
+<script>
+var rows = [["Mild Steel", "3 mm", "19 V", "130 A"], ["Mild Steel", "6 mm", "22 V", "180 A"]];
+setTimeout(function () {{
+  var html = "<h1>MIG settings {page}</h1><table><tr><th>Material</th><th>Thickness</th>"
+    + "<th>Voltage</th><th>Amperage</th></tr>";
+  rows.forEach(function (row) {{ html += "<tr><td>" + row.join("</td><td>") + "</td></tr>"; }});
+  document.getElementById("root").innerHTML = html + "</table>";
+}}, 100);
+</script>
+</body></html>"""
+
+# Blocked by the pool's BROWSER_BLOCKED_URLS patterns
+ASSETS = {
+    "/assets/brand.woff2": ("font/woff2", os.urandom(30000)),
+    "/ads/doubleclick.net/tag.js": ("application/javascript", b"var ad = 1;"),
+}
+
+
+def fixture_site(num_pages):
+    """Static and script-built parameter pages, keyed by path."""
+    pages = dict(ASSETS)
+    for page in range(num_pages):
+        pages[f"/static/{page}"] = ("text/html", PAGE_TEMPLATE.format(page=page, images="").encode())
+        pages[f"/dynamic/{page}"] = ("text/html", SCRIPT_PAGE_TEMPLATE.format(page=page).encode())
+        pages[f"/assets/banner-{page}.png"] = ("image/png", os.urandom(60000))
+    return pages
+
+
+def legacy_driver():
+    """The collector's old setup_web_driver: a fresh headless Chrome loading everything."""
+    chrome_options = Options()
+    chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    return webdriver.Chrome(options=chrome_options)
+
+
+def legacy_render(url):
+    """One URL the old way: start Chrome, load the page, wait for the script, quit."""
+    driver = legacy_driver()
+    try:
+        driver.get(url)
+        time.sleep(0.3)
+        return driver.page_source.encode("utf-8")
+    finally:
+        driver.quit()
+
+
+def chrome_available():
+    try:
+        create_driver().quit()
+        return True
+    except Exception:
+        return False
+
+
+def count_records(contents):
+    return sum(len(extract_page(content)[0]) for content in contents)
+
+
+def main():
+    num_pages = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+
+    print("⏱️  Browser pool benchmark")
+    print("=" * 50)
+
+    pages = fixture_site(num_pages)
+    saved_paths = glob.glob(os.path.join(EXTRACTION_FIXTURES, "*.html"))
+    saved = {os.path.basename(path): open(path, "rb").read() for path in saved_paths}
+    html_pages = {path: body for path, (content_type, body) in pages.items() if content_type == "text/html"}
+    html_pages.update(saved)
+
+    start = time.perf_counter()
+    routed = sorted(path for path, body in html_pages.items() if needs_browser(body))
+    seconds = time.perf_counter() - start
+    print(
+        f"Routing: {len(routed)} of {len(html_pages)} pages need the browser "
+        f"({seconds / len(html_pages) * 1000:.2f} ms/page)"
+    )
+    assert routed == sorted(path for path in html_pages if path.startswith("/dynamic/")), routed
+
+    if not chrome_available():
+        print("\n  Chrome/chromedriver is not installed; skipping the rendering timings")
+        return
+
+    print()
+    with FixtureServer(pages, latency=0.02) as server:
+        urls = [f"{server.base_url}/dynamic/{page}" for page in range(num_pages)]
+
+        start = time.perf_counter()
+        old_contents = [legacy_render(url) for url in urls]
+        old_seconds = time.perf_counter() - start
+        old_requests = server.requests
+        print(
+            f"  {'new Chrome per URL':<30}{old_seconds:>8.2f}s  {len(urls) / old_seconds:>6.1f} pages/s  "
+            f"{old_requests:>4} requests  {count_records(old_contents):>4} records"
+        )
+
+        server.requests = 0
+        pool = BrowserPool()
+        try:
+            results = pool.render_all(urls)
+            stats = pool.stats()
+        finally:
+            pool.close()
+        assert all(result.ok for result in results), [result.error for result in results if not result.ok]
+        print(
+            f"  {f'pool of {pool.size} sessions':<30}{stats['wall_seconds']:>8.2f}s  "
+            f"{stats['pages_per_second']:>6.1f} pages/s  {server.requests:>4} requests  "
+            f"{count_records(result.content for result in results):>4} records"
+        )
+        print(
+            f"      {stats['sessions_started']} sessions started in {stats['startup_seconds']:.1f}s, "
+            f"{stats['sessions_recycled']} recycled"
+        )
+
+
+if __name__ == "__main__":
+    main()
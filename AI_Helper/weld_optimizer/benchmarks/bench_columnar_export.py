@@ -0,0 +1,110 @@
+"""
+Benchmark the Parquet/Arrow export and training read against Excel and SQLite.
+
+Usage: python benchmarks/bench_columnar_export.py [row counts...]
+Defaults to 20k and 100k rows. Each size is built in a temporary database and
+exported to a temporary directory with the data_generator export functions.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_indexes import generate_rows
+from database import columnar_store
+from database.db_manager import DatabaseManager
+from database.init_db import create_database
+from database.populate_data import populate_initial_data
+from utils import data_generator
+
+
+def path_size(path):
+    """Total size in bytes of a file or a directory tree."""
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def timed(func):
+    """Run func once and return (seconds, result)."""
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def best_time(func, repeats=3):
+    """Best wall time in seconds over a few runs."""
+    return min(timed(func)[0] for _ in range(repeats))
+
+
+def run_size(num_rows):
+    """Build a database of the given size, export it every way and time the training reads."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "bench.db")
+        create_database(db_path)
+        populate_initial_data(db_path)
+
+        db_manager = DatabaseManager(db_path)
+        db_manager.add_weld_parameters_bulk(generate_rows(num_rows), batch_size=10000)
+
+        # Point the export functions at the benchmark database
+        data_generator.DatabaseManager = lambda: db_manager
+
+        excel_path = os.path.join(tmp_dir, "export.xlsx")
+        parquet_dir = os.path.join(tmp_dir, "parquet")
+        ipc_dir = os.path.join(tmp_dir, "ipc")
+
+        exports = {
+            "excel": (timed(lambda: data_generator.export_data_to_excel(excel_path))[0], path_size(excel_path)),
+            "parquet": (
+                timed(lambda: data_generator.export_data_to_columnar(parquet_dir, "parquet"))[0],
+                path_size(parquet_dir),
+            ),
+            "ipc": (timed(lambda: data_generator.export_data_to_columnar(ipc_dir, "ipc"))[0], path_size(ipc_dir)),
+        }
+
+        reads = {
+            "excel": best_time(lambda: pd.read_excel(excel_path, sheet_name="Weld Parameters"), repeats=1),
+            "sqlite": best_time(db_manager.get_training_data),
+            "parquet": best_time(lambda: columnar_store.read_training_data(parquet_dir, "parquet")),
+            "ipc": best_time(lambda: columnar_store.read_training_data(ipc_dir, "ipc")),
+            "ipc, one process": best_time(
+                lambda: columnar_store.read_training_data(ipc_dir, "ipc", processes=["GMAW"])
+            ),
+        }
+
+        rows = {
+            "sqlite": len(db_manager.get_training_data()),
+            "parquet": len(columnar_store.read_training_data(parquet_dir, "parquet")),
+            "ipc": len(columnar_store.read_training_data(ipc_dir, "ipc")),
+        }
+        db_manager.close()
+
+    assert len(set(rows.values())) == 1, rows
+
+    print(f"\n{num_rows:,} rows")
+    print(f"  {'export':<20}{'time':>10}{'size':>12}")
+    for name, (seconds, size) in exports.items():
+        print(f"  {name:<20}{seconds:>9.2f}s{size / 1024**2:>10.1f}MB")
+    print(f"  {'training read':<20}{'time':>10}")
+    for name, seconds in reads.items():
+        print(f"  {name:<20}{seconds * 1000:>8.0f}ms")
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [20000, 100000]
+
+    print("⏱️  Columnar export benchmark")
+    print("=" * 50)
+    for num_rows in sizes:
+        run_size(num_rows)
+
+
+if __name__ == "__main__":
+    main()
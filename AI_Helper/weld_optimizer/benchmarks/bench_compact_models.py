@@ -0,0 +1,100 @@
+"""
+Benchmark the compact model export against the joblib pickles.
+
+Usage: python benchmarks/bench_compact_models.py [training samples]
+Both engines are trained in memory on generated data; the pickles and the
+compact export are written to a temporary directory, never to models/.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import joblib
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import models.ml_predictor as ml_predictor
+from models import compact_forest
+from models.ml_predictor import WeldParameterPredictor
+from utils.data_generator import generate_sample_weld_data
+
+
+def dir_size(path):
+    """Total size in bytes of the files in a directory."""
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def best_time(func, repeats=5):
+    """Best wall time in seconds over a few runs."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    num_samples = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+
+    print("⏱️  Compact model format benchmark")
+    print("=" * 50)
+
+    # Compare live inference, not grid lookups
+    ml_predictor.USE_PREDICTION_GRID = False
+
+    train_df = generate_sample_weld_data(num_samples, seed=0)
+    inputs = generate_sample_weld_data(1000, seed=1).to_dict("records")
+
+    for engine in ["per_target", "multi_output"]:
+        predictor = WeldParameterPredictor(engine=engine)
+        predictor.train_models(train_df.copy(), save=False)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pickle_dir = os.path.join(tmp_dir, "pickles")
+            compact_dir = os.path.join(tmp_dir, "compact")
+            os.makedirs(pickle_dir)
+
+            distinct = {id(model): model for model in predictor.models.values()}
+            for lower, upper in predictor.interval_models.values():
+                distinct.update({id(lower): lower, id(upper): upper})
+            for i, model in enumerate(distinct.values()):
+                joblib.dump(model, os.path.join(pickle_dir, f"model_{i}.joblib"))
+            predictor.export_compact(compact_dir)
+
+            pickle_load = best_time(
+                lambda: [joblib.load(os.path.join(pickle_dir, name)) for name in os.listdir(pickle_dir)]
+            )
+            compact_load = best_time(lambda: compact_forest.load_models(compact_dir))
+
+            compact = WeldParameterPredictor(engine=engine)
+            compact.load_compact(compact_dir)
+
+            sklearn_results = predictor.predict_batch(inputs)
+            compact_results = compact.predict_batch(inputs)
+            max_diff = max(
+                abs(a[0][target] - b[0][target]) for a, b in zip(sklearn_results, compact_results) for target in a[0]
+            )
+
+            sklearn_batch = best_time(lambda: predictor.predict_batch(inputs))
+            compact_batch = best_time(lambda: compact.predict_batch(inputs))
+            sklearn_row = best_time(lambda: predictor.predict_batch(inputs[:1]), repeats=50)
+            compact_row = best_time(lambda: compact.predict_batch(inputs[:1]), repeats=50)
+
+            print(f"\n{engine} ({num_samples} training samples)")
+            print(f"  {'':<28}{'joblib':>12}{'compact':>12}")
+            print(
+                f"  {'size on disk (KB)':<28}{dir_size(pickle_dir) / 1024:>12.0f}{dir_size(compact_dir) / 1024:>12.0f}"
+            )
+            print(f"  {'load time (ms)':<28}{pickle_load * 1000:>12.2f}{compact_load * 1000:>12.2f}")
+            print(f"  {'1000-row batch (ms)':<28}{sklearn_batch * 1000:>12.1f}{compact_batch * 1000:>12.1f}")
+            print(f"  {'single-row latency (ms)':<28}{sklearn_row * 1000:>12.2f}{compact_row * 1000:>12.2f}")
+            print(f"  max |sklearn - compact|:    {max_diff:.2e}")
+            assert max_diff < 1e-6
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark the cost of prediction confidence.
+
+Usage: python benchmarks/bench_confidence.py [training samples]
+Random forest, gradient boosting and the multi-output engine are trained in
+memory on generated data. Each is timed predicting without confidence (plain
+model.predict) and with it (predict_matrix), on one row and on a batch.
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import models.ml_predictor as ml_predictor
+from models.ml_predictor import WeldParameterPredictor
+from utils.data_generator import generate_sample_weld_data
+
+
+class SingleCandidatePredictor(WeldParameterPredictor):
+    """Per-target predictor restricted to one candidate model."""
+
+    def __init__(self, candidate):
+        super().__init__(engine="per_target")
+        self.candidate = candidate
+
+    def _candidate_models(self):
+        return {self.candidate: super()._candidate_models()[self.candidate]}
+
+
+def predict_only(predictor, X):
+    """Predictions without confidence: each distinct model's predict, as before confidence existed."""
+    scaler = next(iter(predictor.scalers.values()))
+    X_scaled = ((X - scaler.mean_) / scaler.scale_).astype(np.float32)
+    return [model.predict(X_scaled) for model in {id(m): m for m in predictor.models.values()}.values()]
+
+
+def best_time(func, repeats):
+    """Best wall time in milliseconds over several runs."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main():
+    num_samples = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+
+    print("⏱️  Prediction confidence benchmark")
+    print("=" * 50)
+
+    # Time live inference, not grid lookups
+    ml_predictor.USE_PREDICTION_GRID = False
+
+    train_df = generate_sample_weld_data(num_samples, seed=0)
+    holdout = generate_sample_weld_data(1000, seed=1)
+
+    predictors = {
+        "random_forest": SingleCandidatePredictor("random_forest"),
+        "gradient_boosting": SingleCandidatePredictor("gradient_boosting"),
+        "multi_output": WeldParameterPredictor(engine="multi_output"),
+    }
+
+    print(f"\n{num_samples} training samples, 1000 hold-out rows")
+    print(f"  {'':<20}{'1 row (ms)':^22}{'1000 rows (ms)':^24}{'mean':>8}{'conf/error':>12}")
+    print(f"  {'':<20}{'plain':>8}{'+conf':>8}{'x':>6}{'plain':>9}{'+conf':>9}{'x':>6}{'conf':>8}{'corr':>12}")
+
+    for name, predictor in predictors.items():
+        predictor.train_models(train_df.copy(), save=False)
+        X = predictor.build_feature_matrix(holdout.to_dict("records"))
+        X_row = X[:1]
+
+        # Warm the flattened-tree cache so it is not counted as prediction time
+        predictor.predict_matrix(X_row)
+
+        row_plain = best_time(lambda: predict_only(predictor, X_row), 100)
+        row_conf = best_time(lambda: predictor.predict_matrix(X_row), 100)
+        batch_plain = best_time(lambda: predict_only(predictor, X), 5)
+        batch_conf = best_time(lambda: predictor.predict_matrix(X), 5)
+
+        # Confidence should fall as the error grows: report their correlation
+        predictions, confidence = predictor.predict_matrix(X)
+        mean_conf = np.mean([confidence[target].mean() for target in confidence])
+        correlation = np.mean(
+            [
+                np.corrcoef(confidence[target], np.abs(predictions[target] - holdout[target].to_numpy()))[0, 1]
+                for target in predictions
+            ]
+        )
+
+        print(
+            f"  {name:<20}{row_plain:>8.2f}{row_conf:>8.2f}{row_conf / row_plain:>6.1f}"
+            f"{batch_plain:>9.1f}{batch_conf:>9.1f}{batch_conf / batch_plain:>6.1f}"
+            f"{mean_conf:>8.3f}{correlation:>12.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark the vectorized sample data generator and the streamed database load.
+
+Usage: python benchmarks/bench_data_generator.py [row counts...]
+Defaults to 100k and 1M rows. Loads go into a temporary database.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_manager import DatabaseManager
+from database.init_db import create_database
+from database.populate_data import populate_initial_data
+from utils.data_generator import generate_sample_weld_data, iter_sample_weld_data, populate_database_with_sample_data
+
+
+def timed(func):
+    """Wall time of one call in seconds."""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def load(num_rows, defer_snapshot):
+    """Seconds to stream num_rows generated rows into a fresh database."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "bench.db")
+        create_database(db_path)
+        populate_initial_data(db_path)
+        db_manager = DatabaseManager(db_path)
+        seconds = timed(
+            lambda: populate_database_with_sample_data(
+                num_rows, seed=0, db_manager=db_manager, defer_snapshot=defer_snapshot
+            )
+        )
+
+        assert db_manager.get_parameter_stats()["total"] == num_rows
+        db_manager.close()
+    return seconds
+
+
+def run_size(num_rows):
+    """Time generation and loading of num_rows rows."""
+    generate = timed(lambda: generate_sample_weld_data(num_rows, seed=0))
+    stream = timed(lambda: sum(len(chunk) for chunk in iter_sample_weld_data(num_rows, seed=0)))
+
+    triggers = load(num_rows, defer_snapshot=False)
+    deferred = load(num_rows, defer_snapshot=True)
+
+    print(f"\n{num_rows:,} rows")
+    print(f"  {'generate (one DataFrame)':<36}{generate:>8.2f}s  {num_rows / generate:>12,.0f} rows/s")
+    print(f"  {'generate (streamed chunks)':<36}{stream:>8.2f}s  {num_rows / stream:>12,.0f} rows/s")
+    print(f"  {'load, snapshot triggers':<36}{triggers:>8.2f}s  {num_rows / triggers:>12,.0f} rows/s")
+    print(f"  {'load, deferred snapshot':<36}{deferred:>8.2f}s  {num_rows / deferred:>12,.0f} rows/s")
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100000, 1000000]
+
+    print("⏱️  Sample data generator benchmark")
+    print("=" * 50)
+    for num_rows in sizes:
+        run_size(num_rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark the paginated /database queries against loading the whole table.
+
+Usage: python benchmarks/bench_database_pages.py [row counts...]
+Defaults to 100k and 500k rows. Each size is built in a temporary database.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_indexes import generate_rows
+from benchmarks.bench_training_snapshot import SNAPSHOT_OVERVIEW_QUERY
+from database.db_manager import PARAMETER_PAGE_COLUMNS, DatabaseManager
+from database.init_db import create_database
+from database.populate_data import populate_initial_data
+
+PAGE_SIZE = 50
+
+
+def time_call(func, repeats=3):
+    """Best wall time in milliseconds over a few runs."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def whole_table(db_manager):
+    """The old database view: every row of the table as dicts."""
+    with db_manager.connection() as conn:
+        return pd.read_sql_query(SNAPSHOT_OVERVIEW_QUERY, conn).to_dict("records")
+
+
+def offset_page(db_manager, offset, filters_sql="", sort="id"):
+    """The OFFSET/LIMIT query keyset pagination replaces."""
+    with db_manager.connection() as conn:
+        return conn.execute(
+            f"SELECT {PARAMETER_PAGE_COLUMNS} FROM training_snapshot {filters_sql} "
+            f"ORDER BY {sort}, id LIMIT {PAGE_SIZE} OFFSET {offset}"
+        ).fetchall()
+
+
+def keyset_cursor(db_manager, depth, where, sort):
+    """Cursor of the row just before the given depth, as the previous page would have returned it."""
+    with db_manager.connection() as conn:
+        value, last_id = conn.execute(
+            f"SELECT {sort}, id FROM training_snapshot {where} ORDER BY {sort}, id LIMIT 1 OFFSET {depth - 1}"
+        ).fetchone()
+    return {"value": value, "id": last_id}
+
+
+def run_size(num_rows):
+    """Build a database of the given size and time first and deep pages."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "bench.db")
+        create_database(db_path)
+        populate_initial_data(db_path)
+
+        db_manager = DatabaseManager(db_path)
+        db_manager.add_weld_parameters_bulk(generate_rows(num_rows), batch_size=10000)
+        db_manager.analyze()
+
+        depth = num_rows // 2
+        gmaw_depth = depth // 5
+        gmaw = {"process": "GMAW"}
+        deep_cursor = keyset_cursor(db_manager, depth, "", "thickness")
+        gmaw_cursor = keyset_cursor(db_manager, gmaw_depth, "WHERE process = 'GMAW'", "thickness")
+
+        timings = {
+            "whole table (old view)": time_call(lambda: whole_table(db_manager), 1),
+            "first page": time_call(lambda: db_manager.get_parameter_page(sort="thickness")),
+            f"page at row {depth:,}, OFFSET": time_call(lambda: offset_page(db_manager, depth, sort="thickness")),
+            f"page at row {depth:,}, keyset": time_call(
+                lambda: db_manager.get_parameter_page(sort="thickness", after=deep_cursor)
+            ),
+            f"GMAW page at {gmaw_depth:,}, OFFSET": time_call(
+                lambda: offset_page(db_manager, gmaw_depth, "WHERE process = 'GMAW'", sort="thickness")
+            ),
+            f"GMAW page at {gmaw_depth:,}, keyset": time_call(
+                lambda: db_manager.get_parameter_page(gmaw, sort="thickness", after=gmaw_cursor)
+            ),
+            "GMAW statistics": time_call(lambda: db_manager.get_parameter_stats(gmaw)),
+        }
+
+        # Keyset and OFFSET must land on the same rows
+        keyset_ids = [row["id"] for row in db_manager.get_parameter_page(sort="thickness", after=deep_cursor)["rows"]]
+        offset_ids = [row[0] for row in offset_page(db_manager, depth, sort="thickness")]
+        assert keyset_ids == offset_ids
+        db_manager.close()
+
+    print(f"\n{num_rows:,} rows")
+    for name, ms in timings.items():
+        print(f"  {name:<36}{ms:>10.1f}ms")
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100000, 500000]
+
+    print("⏱️  /database pagination benchmark")
+    print("=" * 50)
+    for num_rows in sizes:
+        run_size(num_rows)
+
+
+if __name__ == "__main__":
+    main()
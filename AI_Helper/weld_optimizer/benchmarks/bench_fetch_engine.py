@@ -0,0 +1,229 @@
+"""
+Benchmark the collector's fetch engine against the old serial download loop.
+
+Runs fully offline: each "host" is a local HTTP server on its own port,
+serving fixture parameter pages that link to chart images, with a fixed
+response latency. Some pages answer 503 once so the retries get exercised.
+
+Usage: python benchmarks/bench_fetch_engine.py [hosts] [pages per host] [latency ms]
+Defaults to 4 hosts, 10 pages each and 50 ms latency.
+"""
+
+import hashlib
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.fetch_engine import FetchEngine
+
+CHARTS_PER_PAGE = 2
+CHART_BYTES = 40000
+OLD_SOURCE_SLEEP = 1.0  # The old loop slept this long between sources
+
+PAGE_TEMPLATE = """<html><body>
+<h1>MIG settings {page}</h1>
+<table>
+<tr><th>Material</th><th>Thickness</th><th>Voltage</th><th>Amperage</th><th>Wire Speed</th><th>Travel Speed</th></tr>
+<tr><td>Mild Steel</td><td>3 mm</td><td>19 V</td><td>130 A</td><td>250</td><td>8</td></tr>
+<tr><td>Mild Steel</td><td>6 mm</td><td>22 V</td><td>180 A</td><td>300</td><td>7</td></tr>
+</table>
+{images}
+</body></html>"""
+
+
+class FixtureServer:
+    """Local stand-in web server for offline fetch tests.
+
+    Serves pages (path -> (content type, bytes)) after latency seconds.
+    Paths in flaky answer 503 the first time they are requested. With
+    validators, responses carry an ETag and Last-Modified and matching
+    conditional requests get a 304. Tracks the request count, body bytes
+    sent and the most requests it had in flight at once.
+    """
+
+    LAST_MODIFIED = "Mon, 06 Jan 2025 08:00:00 GMT"
+
+    def __init__(self, pages, latency=0.0, flaky=(), validators=False):
+        self.pages = pages
+        self.latency = latency
+        self.flaky = set(flaky)
+        self.validators = validators
+        self.requests = 0
+        self.not_modified = 0
+        self.bytes_sent = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                fixture._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handle(self, handler):
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            fail = handler.path in self.flaky
+            self.flaky.discard(handler.path)
+
+        try:
+            time.sleep(self.latency)
+            if handler.path not in self.pages:
+                handler.send_error(404)
+            elif fail:
+                handler.send_response(503)
+                handler.send_header("Retry-After", "0")
+                handler.send_header("Content-Length", "0")
+                handler.end_headers()
+            else:
+                content_type, body = self.pages[handler.path]
+                etag = f'"{hashlib.sha1(body).hexdigest()}"'
+                if self.validators and handler.headers.get("If-None-Match") == etag:
+                    with self._lock:
+                        self.not_modified += 1
+                    handler.send_response(304)
+                    handler.send_header("ETag", etag)
+                    handler.end_headers()
+                    return
+
+                handler.send_response(200)
+                handler.send_header("Content-Type", content_type)
+                handler.send_header("Content-Length", str(len(body)))
+                if self.validators:
+                    handler.send_header("ETag", etag)
+                    handler.send_header("Last-Modified", self.LAST_MODIFIED)
+                handler.end_headers()
+                handler.wfile.write(body)
+                with self._lock:
+                    self.bytes_sent += len(body)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def fixture_pages(num_pages):
+    """Parameter pages, each linking CHARTS_PER_PAGE chart images."""
+    pages = {}
+    for page in range(num_pages):
+        images = []
+        for chart in range(CHARTS_PER_PAGE):
+            path = f"/charts/{page}-{chart}.png"
+            pages[path] = ("image/png", os.urandom(CHART_BYTES))
+            images.append(f'<img src="{path}" alt="welding parameter chart">')
+        pages[f"/settings/{page}"] = ("text/html", PAGE_TEMPLATE.format(page=page, images="\n".join(images)).encode())
+    return pages
+
+
+def chart_links(html):
+    """Chart image paths linked from a fixture page."""
+    return [part.split('"')[0] for part in html.split('<img src="')[1:]]
+
+
+def crawl_serial(page_urls):
+    """The old loop: one page at a time, then its images, each with a fresh requests.get."""
+    count = 0
+    total = 0
+    for url in page_urls:
+        response = requests.get(url, timeout=10)
+        count += 1
+        total += len(response.content)
+        for path in chart_links(response.text):
+            image = requests.get(url.split("/settings/")[0] + path, timeout=10)
+            count += 1
+            total += len(image.content)
+    return count, total
+
+
+def crawl_engine(engine, page_urls):
+    """The collector's two passes: all pages concurrently, then all linked images."""
+    pages = engine.fetch_all(page_urls)
+    image_urls = []
+    for result in pages:
+        base_url = result.url.split("/settings/")[0]
+        image_urls.extend(base_url + path for path in chart_links(result.content.decode()))
+    images = engine.fetch_all(image_urls)
+
+    assert all(result.ok for result in pages + images)
+    return len(pages) + len(images), sum(len(result.content) for result in pages + images)
+
+
+def main():
+    num_hosts = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    pages_per_host = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    latency = (int(sys.argv[3]) if len(sys.argv) > 3 else 50) / 1000
+
+    print("⏱️  Fetch engine benchmark")
+    print("=" * 50)
+    print(f"{num_hosts} hosts x {pages_per_host} pages, {CHARTS_PER_PAGE} charts each, {latency * 1000:.0f} ms latency")
+
+    pages = fixture_pages(pages_per_host)
+    servers = [FixtureServer(pages, latency) for _ in range(num_hosts)]
+    for server in servers:
+        server.__enter__()
+
+    try:
+        page_urls = [f"{server.base_url}/settings/{page}" for page in range(pages_per_host) for server in servers]
+
+        start = time.perf_counter()
+        count, total = crawl_serial(page_urls)
+        serial = time.perf_counter() - start
+        print(
+            f"\n  {'serial requests.get':<36}{serial:>8.2f}s  {count / serial:>8.1f} pages/s  "
+            f"{total / serial / 1024:>8.0f} KB/s"
+        )
+        print(f"  {'  + old 1 s sleep per source':<36}{serial + OLD_SOURCE_SLEEP * len(page_urls):>8.2f}s")
+
+        for per_host, host_delay in [(2, 0.0), (4, 0.0), (2, 0.1)]:
+            for server in servers:
+                server.max_in_flight = 0
+                server.flaky = {f"/settings/{page}" for page in range(0, pages_per_host, 5)}
+
+            engine = FetchEngine(max_workers=8, per_host=per_host, host_delay=host_delay, backoff=0.05)
+            count, total = crawl_engine(engine, page_urls)
+            stats = engine.stats()
+            engine.close()
+
+            assert stats["pages"] == count and stats["failures"] == 0
+            assert max(server.max_in_flight for server in servers) <= per_host
+
+            name = f"engine, {per_host}/host, {host_delay * 1000:.0f} ms spacing"
+            print(
+                f"  {name:<36}{stats['busy_seconds']:>8.2f}s  {stats['pages_per_second']:>8.1f} pages/s  "
+                f"{stats['bytes_per_second'] / 1024:>8.0f} KB/s  ({stats['retries']} retries)"
+            )
+    finally:
+        for server in servers:
+            server.__exit__(None, None, None)
+
+
+if __name__ == "__main__":
+    main()
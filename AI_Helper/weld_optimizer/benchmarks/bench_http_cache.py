@@ -0,0 +1,90 @@
+"""
+Benchmark repeated collection runs through the on-disk HTTP cache.
+
+Runs offline against local fixture servers (see bench_fetch_engine.py): one
+host sends ETag/Last-Modified validators, the other sends none, so both the
+304 path and the unchanged-body path are measured. The same crawl runs cold,
+warm, in cache-only mode and with a cache too small to hold everything.
+
+Usage: python benchmarks/bench_http_cache.py [pages per host] [latency ms]
+Defaults to 20 pages per host and 50 ms latency.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_fetch_engine import CHART_BYTES, CHARTS_PER_PAGE, FixtureServer, crawl_engine, fixture_pages
+from utils.fetch_engine import FetchEngine
+from utils.http_cache import HttpCache
+
+
+def run(name, cache, servers, page_urls):
+    """Crawl every page and chart once through the cache and print what it cost."""
+    for server in servers:
+        server.requests = server.not_modified = server.bytes_sent = 0
+    cache.reset_stats()
+
+    engine = FetchEngine(max_workers=8, per_host=4, host_delay=0.0, cache=cache)
+    start = time.perf_counter()
+    count, total = crawl_engine(engine, page_urls)
+    seconds = time.perf_counter() - start
+    engine.close()
+
+    stats = cache.stats()
+    print(
+        f"  {name:<24}{seconds:>7.2f}s  {sum(server.requests for server in servers):>5} requests  "
+        f"{sum(server.not_modified for server in servers):>5} x 304  "
+        f"{sum(server.bytes_sent for server in servers) / 1024:>7.0f} KB sent  "
+        f"{stats['bytes_written'] / 1024:>7.0f} KB written  {stats['size_bytes'] / 1024:>7.0f} KB cached"
+        + (f"  ({stats['evicted']} evicted)" if stats["evicted"] else "")
+    )
+    return count, total
+
+
+def main():
+    pages_per_host = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    latency = (int(sys.argv[2]) if len(sys.argv) > 2 else 50) / 1000
+
+    print("⏱️  HTTP cache benchmark")
+    print("=" * 50)
+    print(
+        f"2 hosts (with and without validators) x {pages_per_host} pages, {CHARTS_PER_PAGE} charts each, "
+        f"{latency * 1000:.0f} ms latency\n"
+    )
+
+    pages = fixture_pages(pages_per_host)
+    servers = [FixtureServer(pages, latency, validators=True), FixtureServer(pages, latency)]
+    for server in servers:
+        server.__enter__()
+
+    try:
+        page_urls = [f"{server.base_url}/settings/{page}" for page in range(pages_per_host) for server in servers]
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = HttpCache(cache_dir, max_bytes=0)
+            expected = run("no cache entries", cache, servers, page_urls)
+            assert run("warm, revalidated", cache, servers, page_urls) == expected
+
+            cache.cache_only = True
+            assert run("cache-only", cache, servers, page_urls) == expected
+            assert sum(server.requests for server in servers) == 0
+            cache.close()
+
+        # Room for about a third of the charts: older bodies get evicted as the crawl goes
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = HttpCache(cache_dir, max_bytes=len(page_urls) * CHARTS_PER_PAGE * CHART_BYTES // 3)
+            run("max_bytes = 1/3 of data", cache, servers, page_urls)
+            assert cache.stats()["size_bytes"] <= cache.max_bytes
+            cache.close()
+    finally:
+        for server in servers:
+            server.__exit__(None, None, None)
+
+
+if __name__ == "__main__":
+    main()
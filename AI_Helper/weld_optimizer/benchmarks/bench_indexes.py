@@ -0,0 +1,130 @@
+"""
+Benchmark weld_parameters queries with and without the secondary indexes.
+
+Usage: python benchmarks/bench_indexes.py [row counts...]
+Defaults to 10k, 100k and 1M rows. Each size is built in a temporary database.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_manager import DatabaseManager
+from database.init_db import INDEXES, create_database, create_indexes
+from database.populate_data import populate_initial_data
+
+QUERIES = {
+    "filter process_id": lambda db: db.get_weld_parameters({"process_id": 2}),
+    "filter base_material + thickness": lambda db: db.get_weld_parameters({"base_material_id": 4, "thickness": 6.0}),
+    "filter position + joint_type": lambda db: db.get_weld_parameters({"position_id": 3, "joint_type_id": 2}),
+    "process codes + thickness range": lambda db: db.get_weld_parameters(
+        {"process_code__in": ["GMAW", "FCAW"], "thickness__between": (3.0, 10.0)}
+    ),
+    "training data (5-way join)": lambda db: db.get_training_data(),
+}
+
+
+def generate_rows(num_rows, seed=42):
+    """Yield random but schema-valid weld_parameters rows."""
+    rng = np.random.default_rng(seed)
+    chunk = 50000
+
+    for start in range(0, num_rows, chunk):
+        n = min(chunk, num_rows - start)
+        base = rng.integers(1, 7, n)
+        filler = rng.integers(7, 14, n)
+        thickness = rng.choice([1.5, 3.0, 6.0, 10.0, 12.0, 15.0, 20.0], n)
+        joint = rng.integers(1, 7, n)
+        position = rng.integers(1, 11, n)
+        process = rng.integers(1, 6, n)
+        voltage = rng.uniform(12, 35, n).round(1)
+        amperage = rng.uniform(80, 400, n).round(0)
+        wire = rng.uniform(0, 600, n).round(0)
+        travel = rng.uniform(2, 15, n).round(1)
+        quality = rng.integers(1, 11, n)
+
+        for i in range(n):
+            yield (
+                int(base[i]),
+                int(filler[i]),
+                float(thickness[i]),
+                int(joint[i]),
+                int(position[i]),
+                int(process[i]),
+                1,
+                float(voltage[i]),
+                float(amperage[i]),
+                float(wire[i]),
+                float(travel[i]),
+                2.4,
+                25,
+                None,
+                None,
+                float(thickness[i]) * 0.8,
+                int(quality[i]),
+                85.0,
+                "benchmark",
+                "benchmark",
+            )
+
+
+def time_query(query, db_manager, repeats=3):
+    """Return the best wall time in milliseconds over a few runs."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        query(db_manager)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run_size(num_rows):
+    """Build a database of the given size and time each query before and after indexing."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "bench.db")
+        create_database(db_path)
+        populate_initial_data(db_path)
+
+        db_manager = DatabaseManager(db_path)
+        db_manager.add_weld_parameters_bulk(generate_rows(num_rows), batch_size=10000)
+
+        # Drop the indexes to get the baseline
+        with db_manager.connection() as conn:
+            for statement in INDEXES:
+                name = statement.split(" IF NOT EXISTS ")[1].split(" ")[0]
+                conn.execute(f"DROP INDEX IF EXISTS {name}")
+            conn.commit()
+        db_manager.analyze()
+
+        baseline = {name: time_query(query, db_manager) for name, query in QUERIES.items()}
+
+        with db_manager.connection() as conn:
+            create_indexes(conn)
+
+        indexed = {name: time_query(query, db_manager) for name, query in QUERIES.items()}
+        db_manager.close()
+
+    print(f"\n{num_rows:,} rows")
+    print(f"  {'query':<36}{'no index':>12}{'indexed':>12}{'speedup':>10}")
+    for name in QUERIES:
+        speedup = baseline[name] / indexed[name] if indexed[name] else float("inf")
+        print(f"  {name:<36}{baseline[name]:>10.1f}ms{indexed[name]:>10.1f}ms{speedup:>9.1f}x")
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000]
+
+    print("⏱️  weld_parameters index benchmark")
+    print("=" * 50)
+    for num_rows in sizes:
+        run_size(num_rows)
+
+
+if __name__ == "__main__":
+    main()
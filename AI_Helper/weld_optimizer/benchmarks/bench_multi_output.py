@@ -0,0 +1,100 @@
+"""
+Benchmark the multi-output engine against the per-target models.
+
+Usage: python benchmarks/bench_multi_output.py [training samples]
+Both engines are trained in memory on the same generated data and scored
+on a separate generated hold-out set. Nothing is saved.
+"""
+
+import io
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+from sklearn.metrics import mean_squared_error, r2_score
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import models.ml_predictor as ml_predictor
+from models.ml_predictor import WeldParameterPredictor
+from utils.data_generator import generate_sample_weld_data
+
+TARGETS = ["voltage", "amperage", "wire_feed_speed", "travel_speed"]
+
+
+def model_size(predictor):
+    """Pickled size in bytes of the distinct fitted models."""
+    distinct = {id(model): model for model in predictor.models.values()}
+    buffer = io.BytesIO()
+    joblib.dump(list(distinct.values()), buffer)
+    return buffer.tell()
+
+
+def single_row_latency(predictor, inputs, repeats=200):
+    """Median live-inference latency in milliseconds for one input."""
+    timings = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        predictor.predict_batch([inputs[i % len(inputs)]])
+        timings.append(time.perf_counter() - start)
+    return np.median(timings) * 1000
+
+
+def main():
+    num_samples = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+
+    print("⏱️  Multi-output vs per-target benchmark")
+    print("=" * 50)
+
+    # The comparison is about live inference, so skip the prediction grid
+    ml_predictor.USE_PREDICTION_GRID = False
+
+    train_df = generate_sample_weld_data(num_samples, seed=0)
+    holdout = generate_sample_weld_data(500, seed=1)
+    inputs = holdout.to_dict("records")
+
+    results = {}
+    for engine in ["per_target", "multi_output"]:
+        predictor = WeldParameterPredictor(engine=engine)
+        predictor.train_models(train_df.copy(), save=False)
+
+        start = time.perf_counter()
+        batch = predictor.predict_batch(inputs)
+        batch_time = time.perf_counter() - start
+
+        scores = {}
+        for target in TARGETS:
+            y_pred = np.array([predictions[target] for predictions, _ in batch])
+            y_true = holdout[target].to_numpy()
+            scores[target] = (r2_score(y_true, y_pred), np.sqrt(mean_squared_error(y_true, y_pred)))
+
+        results[engine] = {
+            "train": predictor.training_times["total"],
+            "latency": single_row_latency(predictor, inputs),
+            "batch": batch_time * 1000,
+            "size": model_size(predictor),
+            "scores": scores,
+        }
+
+    print(f"\n{num_samples} training samples, 500 hold-out inputs")
+    print(f"  {'':<28}{'per_target':>14}{'multi_output':>14}")
+    rows = [
+        ("training time (s)", "train", "{:.2f}"),
+        ("single-row latency (ms)", "latency", "{:.2f}"),
+        ("500-row batch (ms)", "batch", "{:.1f}"),
+        ("model size (KB)", "size", "{:.0f}"),
+    ]
+    for label, key, fmt in rows:
+        values = [results[engine][key] / (1024 if key == "size" else 1) for engine in results]
+        print(f"  {label:<28}" + "".join(f"{fmt.format(value):>14}" for value in values))
+    for target in TARGETS:
+        for metric, k in [("R2", 0), ("RMSE", 1)]:
+            values = [results[engine]["scores"][target][k] for engine in results]
+            print(f"  {target + ' ' + metric:<28}" + "".join(f"{value:>14.3f}" for value in values))
+
+
+if __name__ == "__main__":
+    main()
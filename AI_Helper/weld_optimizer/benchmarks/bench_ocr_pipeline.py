@@ -0,0 +1,127 @@
+"""
+Benchmark the chart OCR pipeline on synthetic parameter chart images.
+
+Compares the old decode path (temporary file, reopened with PIL) with
+in-memory decoding plus OpenCV preprocessing, then runs the full OCR
+pipeline serially and on all cores, cold and with a warm cache. The OCR
+timings need the tesseract binary and are skipped without it.
+
+Usage: python benchmarks/bench_ocr_pipeline.py [images]
+Defaults to 40 images, a quarter of them repeated.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+import pytesseract
+from PIL import Image
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.ocr_pipeline import OcrPipeline, decode_image, preprocess_image
+
+CHART_ROWS = [(1.5, 17, 90), (3, 19, 130), (6, 22, 180), (10, 26, 240), (12, 28, 280)]
+
+
+def chart_image(index, rng):
+    """PNG bytes of a small parameter table, slightly rotated and noisy like a scanned chart."""
+    image = np.full((420, 760), 245, np.uint8)
+    cv2.putText(image, f"Chart {index}: Thickness Voltage Amperage", (30, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.9, 20, 2)
+    for row, (thickness, voltage, amperage) in enumerate(CHART_ROWS):
+        line = f"{thickness} mm    {voltage + index % 3} V    {amperage + index} A"
+        cv2.putText(image, line, (30, 130 + row * 55), cv2.FONT_HERSHEY_SIMPLEX, 0.9, 20, 2)
+
+    rotation = cv2.getRotationMatrix2D((380, 210), rng.uniform(-6, 6), 1.0)
+    image = cv2.warpAffine(image, rotation, (760, 420), borderValue=245)
+    image = np.clip(image + rng.normal(0, 12, image.shape), 0, 255).astype(np.uint8)
+    return cv2.imencode(".png", image)[1].tobytes()
+
+
+def decode_via_temp_file(image_bytes):
+    """The old path: write the download to a temporary file and reopen it with PIL."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as tmp_file:
+        tmp_file.write(image_bytes)
+        tmp_path = tmp_file.name
+    image = Image.open(tmp_path)
+    image.load()
+    os.unlink(tmp_path)
+    return image
+
+
+def timed(func, images):
+    start = time.perf_counter()
+    for image_bytes in images:
+        func(image_bytes)
+    return time.perf_counter() - start
+
+
+def tesseract_available():
+    try:
+        pytesseract.get_tesseract_version()
+        return True
+    except Exception:
+        return False
+
+
+def run_pipeline(name, pipeline, images):
+    pipeline.reset_stats()
+    texts = pipeline.ocr_images(images)
+    stats = pipeline.stats()
+    print(
+        f"  {name:<30}{stats['wall_seconds']:>8.2f}s  {stats['images_per_second']:>8.1f} images/s  "
+        f"{stats['ocr_runs']:>4} OCR runs  {stats['cache_hits']:>4} cache hits"
+    )
+    for pid, worker in stats["workers"].items():
+        print(f"      worker {pid}: {worker['images']} images, {worker['images_per_second']:.1f} images/s")
+    return texts
+
+
+def main():
+    num_images = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+
+    print("⏱️  Chart OCR pipeline benchmark")
+    print("=" * 50)
+
+    rng = np.random.default_rng(0)
+    distinct = [chart_image(index, rng) for index in range(num_images - num_images // 4)]
+    images = distinct + distinct[: num_images // 4]
+    print(
+        f"{len(images)} images ({len(distinct)} distinct), {sum(map(len, images)) / len(images) / 1024:.0f} KB each\n"
+    )
+
+    for name, func in [
+        ("decode, temp file + PIL", decode_via_temp_file),
+        ("decode, in memory", decode_image),
+        ("decode + threshold + deskew", preprocess_image),
+    ]:
+        seconds = timed(func, images)
+        print(f"  {name:<30}{seconds / len(images) * 1000:>8.2f} ms/image")
+
+    if not tesseract_available():
+        print("\n  tesseract is not installed; skipping the OCR timings")
+        return
+
+    print()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        serial = OcrPipeline(workers=1, cache_path=os.path.join(tmp_dir, "serial.db"))
+        expected = run_pipeline("OCR, 1 process", serial, images)
+        serial.close()
+
+        cache_path = os.path.join(tmp_dir, "pool.db")
+        pool = OcrPipeline(workers=-1, cache_path=cache_path)
+        assert run_pipeline(f"OCR, {pool.workers} processes", pool, images) == expected
+        pool.close()
+
+        # A new pipeline on the same cache file, as in the next collection run
+        rerun = OcrPipeline(workers=-1, cache_path=cache_path)
+        assert run_pipeline("OCR, next run (cached)", rerun, images) == expected
+        rerun.close()
+
+
+if __name__ == "__main__":
+    main()
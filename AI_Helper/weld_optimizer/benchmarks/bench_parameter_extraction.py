@@ -0,0 +1,232 @@
+"""
+Benchmark utils/parameter_extraction.py against the collector's old parsers.
+
+Runs each stage over the saved fixture pages and OCR texts in
+benchmarks/fixtures/extraction/: OCR text parsing, table detection, table
+parsing and whole-page extraction. The old implementations are reproduced
+below (the table parser needs lxml for pd.read_html).
+
+OCR records must match the old parser exactly. Table records are checked
+against pd.read_html's reading of the same tables with the new column
+mapping; the old renaming loop let short aliases such as "a" claim the
+wrong columns, so its records are only counted.
+
+Usage: python benchmarks/bench_parameter_extraction.py [repeats]
+"""
+
+import glob
+import os
+import re
+import sys
+import time
+import warnings
+from io import StringIO
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.parameter_extraction import (
+    NUMERIC_FIELDS,
+    clean_parameter_record,
+    contains_welding_parameters,
+    extract_page,
+    parse_text_for_parameters,
+    parse_welding_table,
+    standardize_columns,
+    table_rows,
+    validate_parameter_record,
+)
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "extraction")
+
+
+def legacy_parse_text(text):
+    """The old OCR text parser: three uncompiled searches per line."""
+    parameters = []
+    current_record = {}
+    for line in text.split("\n"):
+        line = line.lower().strip()
+        voltage_match = re.search(r"(\d+(?:\.\d+)?)\s*(?:v|volt|voltage)", line)
+        if voltage_match:
+            current_record["voltage"] = float(voltage_match.group(1))
+        amperage_match = re.search(r"(\d+(?:\.\d+)?)\s*(?:a|amp|amperage|current)", line)
+        if amperage_match:
+            current_record["amperage"] = float(amperage_match.group(1))
+        thickness_match = re.search(r"(\d+(?:\.\d+)?)\s*(?:mm|inch|in|thick)", line)
+        if thickness_match:
+            current_record["thickness"] = float(thickness_match.group(1))
+        if len(current_record) >= 3:
+            parameters.append(current_record.copy())
+            current_record = {}
+    return parameters
+
+
+def legacy_contains(table):
+    """The old table check: the table text rescanned once per keyword."""
+    text = table.get_text().lower()
+    keywords = [
+        "voltage",
+        "amperage",
+        "current",
+        "wire speed",
+        "travel speed",
+        "thickness",
+        "material",
+        "electrode",
+        "gas flow",
+    ]
+    return sum(1 for keyword in keywords if keyword in text) >= 3
+
+
+def legacy_clean(record):
+    cleaned = {}
+    for key, value in record.items():
+        if pd.isna(value):
+            continue
+        if key in NUMERIC_FIELDS:
+            if isinstance(value, str):
+                numbers = re.findall(r"(\d+(?:\.\d+)?)", value)
+                if numbers:
+                    cleaned[key] = float(numbers[0])
+            elif isinstance(value, (int, float)):
+                cleaned[key] = float(value)
+        else:
+            cleaned[key] = str(value).strip()
+    return cleaned if cleaned else None
+
+
+def legacy_validate(record):
+    if not all(field in record for field in ["voltage", "amperage"]):
+        return False
+    ranges = {
+        "voltage": (8, 50),
+        "amperage": (20, 500),
+        "thickness": (0.5, 100),
+        "wire_speed": (50, 800),
+        "travel_speed": (1, 30),
+    }
+    return all(low <= record[field] <= high for field, (low, high) in ranges.items() if field in record)
+
+
+def legacy_parse_table(table):
+    """The old table parser: the table re-serialized and re-parsed by pd.read_html, renamed with nested loops."""
+    try:
+        df = pd.read_html(StringIO(str(table)))[0]
+        df.columns = [col.lower().strip() for col in df.columns]
+        column_mapping = {
+            "material": ["material", "base metal", "base material"],
+            "thickness": ["thickness", "thick", "gauge"],
+            "voltage": ["voltage", "volts", "v"],
+            "amperage": ["amperage", "amps", "current", "a"],
+            "wire_speed": ["wire speed", "wire feed", "wfs", "ipm"],
+            "travel_speed": ["travel speed", "travel", "ts"],
+            "process": ["process", "welding process"],
+            "electrode": ["electrode", "wire", "rod"],
+        }
+        for standard_name, variations in column_mapping.items():
+            for col in df.columns:
+                if any(var in col for var in variations):
+                    df.rename(columns={col: standard_name}, inplace=True)
+                    break
+        records = []
+        for record in df.to_dict("records"):
+            cleaned = legacy_clean(record)
+            if cleaned and legacy_validate(cleaned):
+                records.append(cleaned)
+        return records
+    except Exception:
+        return []
+
+
+def reference_parse_table(table):
+    """pd.read_html's reading of a table, mapped and cleaned like parse_welding_table."""
+    df = pd.read_html(StringIO(str(table)))[0]
+    df.columns = standardize_columns([str(col) for col in df.columns])
+    records = []
+    for record in df.to_dict("records"):
+        cleaned = clean_parameter_record(record)
+        if cleaned and validate_parameter_record(cleaned):
+            records.append(cleaned)
+    return records
+
+
+def legacy_extract_page(content):
+    soup = BeautifulSoup(content, "html.parser")
+    records = []
+    for table in soup.find_all("table"):
+        if legacy_contains(table):
+            records.extend(legacy_parse_table(table))
+    return records
+
+
+def best_of(func, repeats):
+    """Best wall time in microseconds over repeats runs."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e6
+
+
+def report(name, old, new, detail=""):
+    print(f"  {name:<38}{old:>11,.0f} us{new:>11,.0f} us{old / new:>8.1f}x  {detail}")
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    # The old renaming gives some tables duplicate columns, which pandas warns about on every run
+    warnings.filterwarnings("ignore", "DataFrame columns are not unique")
+
+    print("⏱️  Parameter extraction benchmark")
+    print("=" * 50)
+    print(f"  {'':<38}{'old':>14}{'new':>14}")
+
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.txt"))):
+        text = open(path, encoding="utf-8").read()
+        old, new = legacy_parse_text(text), parse_text_for_parameters(text)
+        assert old == new, path
+        report(
+            f"OCR {os.path.basename(path)}",
+            best_of(lambda: legacy_parse_text(text), repeats),
+            best_of(lambda: parse_text_for_parameters(text), repeats),
+            f"{len(new)} records",
+        )
+
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html"))):
+        content = open(path, "rb").read()
+        name = os.path.basename(path)
+        tables = BeautifulSoup(content, "html.parser").find_all("table")
+
+        old_detect = [legacy_contains(table) for table in tables]
+        assert old_detect == [contains_welding_parameters(table.get_text(" ")) for table in tables], name
+        report(
+            f"detect {name}",
+            best_of(lambda: [legacy_contains(table) for table in tables], repeats),
+            best_of(lambda: [contains_welding_parameters(table.get_text(" ")) for table in tables], repeats),
+        )
+
+        matched = [table for table, found in zip(tables, old_detect) if found]
+        for table in matched:
+            assert parse_welding_table(table_rows(table)) == reference_parse_table(table), name
+        if matched:
+            report(
+                f"parse tables {name}",
+                best_of(lambda: [legacy_parse_table(table) for table in matched], repeats),
+                best_of(lambda: [parse_welding_table(table_rows(table)) for table in matched], repeats),
+            )
+
+        old_records, (new_records, _) = legacy_extract_page(content), extract_page(content)
+        report(
+            f"page {name}",
+            best_of(lambda: legacy_extract_page(content), repeats),
+            best_of(lambda: extract_page(content), repeats),
+            f"{len(new_records)} records (old: {len(old_records)})",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark per-row prediction against WeldParameterPredictor.predict_batch.
+
+Usage: python benchmarks/bench_predict_batch.py [batch size]
+Models are trained in memory on generated sample data and never saved.
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.ml_predictor import WeldParameterPredictor
+from utils.data_generator import generate_sample_weld_data
+
+INPUT_COLUMNS = [
+    "thickness",
+    "base_carbon",
+    "base_thermal",
+    "base_melting_point",
+    "base_density",
+    "filler_carbon",
+    "filler_thermal",
+    "process",
+    "position",
+    "joint_type",
+]
+
+
+def legacy_predict(predictor, input_data):
+    """The original one-row DataFrame prediction path, kept for comparison."""
+    input_df = pd.DataFrame([input_data])
+
+    for col, encoder in predictor.encoders.items():
+        if col in input_df.columns:
+            try:
+                input_df[f"{col}_encoded"] = encoder.transform([input_df[col].iloc[0]])
+            except ValueError:
+                input_df[f"{col}_encoded"] = 0
+
+    X = input_df[predictor.feature_columns].fillna(0)
+    return {
+        target: model.predict(predictor.scalers[target].transform(X.to_numpy()))[0]
+        for target, model in predictor.models.items()
+    }
+
+
+def main():
+    batch_size = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    print("⏱️  Batch prediction benchmark")
+    print("=" * 50)
+
+    predictor = WeldParameterPredictor()
+    predictor.train_models(generate_sample_weld_data(1000, seed=0), save=False)
+
+    inputs = generate_sample_weld_data(batch_size, seed=1)[INPUT_COLUMNS].to_dict("records")
+
+    start = time.perf_counter()
+    legacy = [legacy_predict(predictor, row) for row in inputs]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    per_row = [predictor.predict_batch([row])[0] for row in inputs]
+    per_row_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = predictor.predict_batch(inputs)
+    batch_time = time.perf_counter() - start
+
+    max_diff = max(
+        abs(legacy[i][target] - batched[i][0][target]) for i in range(batch_size) for target in predictor.models
+    )
+    assert all(per_row[i][0] == batched[i][0] for i in range(batch_size))
+
+    print(f"\n{batch_size} inputs, {len(predictor.models)} targets")
+    print(f"  legacy per-row (DataFrame):  {legacy_time * 1000:9.1f}ms  {batch_size / legacy_time:10.0f} rows/s")
+    print(f"  live inference per-row:      {per_row_time * 1000:9.1f}ms  {batch_size / per_row_time:10.0f} rows/s")
+    print(f"  predict_batch:               {batch_time * 1000:9.1f}ms  {batch_size / batch_time:10.0f} rows/s")
+    print(f"  speedup vs legacy:           {legacy_time / batch_time:9.1f}x")
+    print(f"  max |legacy - batch|:        {max_diff:.2e}")
+    assert np.isclose(max_diff, 0, atol=1e-9)
+
+    # predict_parameters answers from the precomputed grid when the input is on it
+    if predictor.prediction_grid is not None:
+        start = time.perf_counter()
+        hits = sum(predictor.prediction_grid.lookup(row) is not None for row in inputs)
+        grid_time = time.perf_counter() - start
+        print(f"  prediction grid per-row:     {grid_time * 1000:9.1f}ms  {batch_size / grid_time:10.0f} rows/s")
+        print(f"  grid hit rate:               {hits / batch_size:9.1%}")
+
+
+if __name__ == "__main__":
+    main()
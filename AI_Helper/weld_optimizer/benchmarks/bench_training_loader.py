@@ -0,0 +1,139 @@
+"""
+Benchmark the chunked, compact training-data loader against the original one.
+
+Usage: python benchmarks/bench_training_loader.py [row counts...]
+Defaults to 100k and 500k rows, each in a temporary database. Every loader
+runs in its own subprocess so its peak RSS is measured in isolation.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_indexes import generate_rows
+from database.db_manager import TRAINING_DATA_QUERY, DatabaseManager
+from database.init_db import create_database
+from database.populate_data import populate_initial_data
+from models.ml_predictor import WeldParameterPredictor, peak_rss_mb
+
+FEATURE_COLUMNS = [
+    "thickness",
+    "base_carbon",
+    "base_thermal",
+    "base_melting_point",
+    "base_density",
+    "filler_carbon",
+    "filler_thermal",
+    "process_encoded",
+    "position_encoded",
+    "joint_type_encoded",
+]
+
+
+def legacy_load(db_path):
+    """The original path: one object-dtype DataFrame, then a full copy in prepare_features."""
+    db_manager = DatabaseManager(db_path)
+    with db_manager.connection() as conn:
+        df = pd.read_sql_query(TRAINING_DATA_QUERY, conn)
+
+    df_processed = df.copy()
+    for col in ["process", "position", "joint_type"]:
+        df_processed[f"{col}_encoded"] = LabelEncoder().fit_transform(df_processed[col].fillna("Unknown"))
+    X = df_processed.dropna(subset=FEATURE_COLUMNS)[FEATURE_COLUMNS]
+    return df, X.to_numpy(dtype=np.float32)
+
+
+def chunked_load(db_path):
+    """The streaming loader with compact dtypes and copy-free feature preparation."""
+    predictor = WeldParameterPredictor()
+    predictor.db_manager = DatabaseManager(db_path)
+    df = predictor.db_manager.get_training_data()
+    X = predictor.prepare_features(df)
+    return df, X.to_numpy(dtype=np.float32)
+
+
+LOADERS = {"original": legacy_load, "chunked": chunked_load}
+
+
+def run_child(loader, db_path):
+    """Run one loader and print its measurements as JSON (subprocess entry point)."""
+    rss_before = peak_rss_mb()
+    start = time.perf_counter()
+    df, X = LOADERS[loader](db_path)
+    elapsed = time.perf_counter() - start
+
+    print(
+        json.dumps(
+            {
+                "time": elapsed,
+                "frame_mb": df.memory_usage(deep=True).sum() / 1024**2,
+                "rss_before": rss_before,
+                "rss_after": peak_rss_mb(),
+                "checksum": float(X.sum(dtype=np.float64)),
+            }
+        )
+    )
+
+
+def run_size(num_rows):
+    """Build a database of the given size and measure every loader on it."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "bench.db")
+        create_database(db_path)
+        populate_initial_data(db_path)
+
+        db_manager = DatabaseManager(db_path)
+        db_manager.add_weld_parameters_bulk(generate_rows(num_rows), batch_size=10000)
+        db_manager.close()
+
+        results = {}
+        for loader in LOADERS:
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", loader, db_path],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+            results[loader] = json.loads(output.strip().splitlines()[-1])
+
+    print(f"\n{num_rows:,} rows")
+    print(f"  {'loader':<12}{'time':>10}{'frame':>12}{'peak RSS':>12}{'RSS growth':>12}")
+    for loader, result in results.items():
+        growth = result["rss_after"] - result["rss_before"]
+        print(
+            f"  {loader:<12}{result['time']:>9.2f}s{result['frame_mb']:>10.1f}MB"
+            f"{result['rss_after']:>10.0f}MB{growth:>10.0f}MB"
+        )
+
+    assert np.isclose(results["original"]["checksum"], results["chunked"]["checksum"], rtol=1e-6)
+
+
+def main():
+    if peak_rss_mb() is None:
+        print("Peak RSS is not available on this platform")
+        return
+
+    if sys.argv[1:2] == ["--child"]:
+        run_child(sys.argv[2], sys.argv[3])
+        return
+
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100000, 500000]
+
+    print("⏱️  Training-data loader benchmark")
+    print("=" * 50)
+    for num_rows in sizes:
+        run_size(num_rows)
+
+
+if __name__ == "__main__":
+    main()
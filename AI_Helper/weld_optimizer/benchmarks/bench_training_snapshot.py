@@ -0,0 +1,145 @@
+"""
+Benchmark reading the training_snapshot table against the joins it replaces,
+and the cost of its triggers on bulk inserts.
+
+Usage: python benchmarks/bench_training_snapshot.py [row counts...]
+Defaults to 100k and 500k rows. Each size is built in a temporary database.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_indexes import generate_rows
+from database.db_manager import TRAINING_DATA_QUERY, DatabaseManager
+from database.init_db import TRAINING_SNAPSHOT_SELECT, create_database, training_snapshot_triggers
+from database.populate_data import populate_initial_data
+
+# The per-call joins used before the snapshot existed
+JOINED_TRAINING_QUERY = """
+SELECT wp.id, wp.created_date,
+       wp.thickness, wp.voltage, wp.amperage, wp.wire_feed_speed,
+       wp.travel_speed, wp.electrode_diameter, wp.gas_flow_rate,
+       wp.preheat_temp, wp.interpass_temp, wp.quality_rating,
+       bm.carbon_content as base_carbon, bm.thermal_conductivity as base_thermal,
+       bm.melting_point as base_melting_point, bm.density as base_density,
+       fm.carbon_content as filler_carbon, fm.thermal_conductivity as filler_thermal,
+       proc.code as process, pos.code as position, jt.name as joint_type
+FROM weld_parameters wp
+LEFT JOIN materials bm ON wp.base_material_id = bm.id
+LEFT JOIN materials fm ON wp.filler_material_id = fm.id
+LEFT JOIN joint_types jt ON wp.joint_type_id = jt.id
+LEFT JOIN welding_positions pos ON wp.position_id = pos.id
+LEFT JOIN welding_processes proc ON wp.process_id = proc.id
+WHERE wp.quality_rating IS NOT NULL
+"""
+
+JOINED_OVERVIEW_QUERY = """
+SELECT wp.*,
+       bm.name as base_material,
+       fm.name as filler_material,
+       jt.name as joint_type,
+       pos.code as position_code,
+       proc.code as process_code,
+       sg.name as shielding_gas
+FROM weld_parameters wp
+LEFT JOIN materials bm ON wp.base_material_id = bm.id
+LEFT JOIN materials fm ON wp.filler_material_id = fm.id
+LEFT JOIN joint_types jt ON wp.joint_type_id = jt.id
+LEFT JOIN welding_positions pos ON wp.position_id = pos.id
+LEFT JOIN welding_processes proc ON wp.process_id = proc.id
+LEFT JOIN shielding_gases sg ON wp.shielding_gas_id = sg.id
+"""
+
+# The whole-table database view, read from the snapshot
+SNAPSHOT_OVERVIEW_QUERY = """
+SELECT id, created_date, base_material, filler_material, thickness, joint_type,
+       position AS position_code, process AS process_code, shielding_gas,
+       voltage, amperage, wire_feed_speed, travel_speed, quality_rating
+FROM training_snapshot
+ORDER BY id
+"""
+
+
+def time_query(db_manager, query, repeats=3):
+    """Best wall time in milliseconds for reading a query into a DataFrame."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        with db_manager.connection() as conn:
+            pd.read_sql_query(query, conn)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def time_insert(db_path, num_rows, triggers):
+    """Seconds to bulk insert num_rows into a fresh database, with or without the snapshot triggers."""
+    create_database(db_path)
+    populate_initial_data(db_path)
+
+    db_manager = DatabaseManager(db_path)
+    if not triggers:
+        with db_manager.connection() as conn:
+            for statement in training_snapshot_triggers():
+                name = statement.split(" IF NOT EXISTS ")[1].split(" ")[0]
+                conn.execute(f"DROP TRIGGER {name}")
+            conn.commit()
+
+    start = time.perf_counter()
+    db_manager.add_weld_parameters_bulk(generate_rows(num_rows), batch_size=10000)
+    elapsed = time.perf_counter() - start
+    return db_manager, elapsed
+
+
+def run_size(num_rows):
+    """Build a database of the given size and compare joins with the snapshot."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "bench.db")
+
+        db_manager, plain_insert = time_insert(db_path, num_rows, triggers=False)
+        db_manager.close()
+        db_manager, trigger_insert = time_insert(db_path, num_rows, triggers=True)
+        db_manager.analyze()
+
+        # The snapshot must match the joins it replaces
+        with db_manager.connection() as conn:
+            snapshot = pd.read_sql_query("SELECT * FROM training_snapshot ORDER BY id", conn)
+            joined = pd.read_sql_query(TRAINING_SNAPSHOT_SELECT + " ORDER BY wp.id", conn)
+        assert snapshot.fillna(-1).values.tolist() == joined.fillna(-1).values.tolist()
+
+        timings = {
+            "training data": (
+                time_query(db_manager, JOINED_TRAINING_QUERY),
+                time_query(db_manager, TRAINING_DATA_QUERY),
+            ),
+            "database view": (
+                time_query(db_manager, JOINED_OVERVIEW_QUERY),
+                time_query(db_manager, SNAPSHOT_OVERVIEW_QUERY),
+            ),
+        }
+        db_manager.close()
+
+    print(f"\n{num_rows:,} rows")
+    print(f"  {'read':<20}{'joins':>12}{'snapshot':>12}{'speedup':>10}")
+    for name, (joined_ms, snapshot_ms) in timings.items():
+        print(f"  {name:<20}{joined_ms:>10.1f}ms{snapshot_ms:>10.1f}ms{joined_ms / snapshot_ms:>9.1f}x")
+    print(f"  bulk insert: {plain_insert:.2f}s without triggers, {trigger_insert:.2f}s with")
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100000, 500000]
+
+    print("⏱️  Training snapshot benchmark")
+    print("=" * 50)
+    for num_rows in sizes:
+        run_size(num_rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,94 @@ import os
 DATABASE_NAME = "weld_parameters.db"
 DATABASE_PATH = os.path.join(os.path.dirname(__file__), "database", DATABASE_NAME)
 
+# Connection pool settings (one long-lived connection per worker thread)
+DB_POOL_MAX_USES = 1000  # Recycle a connection after this many checkouts
+DB_POOL_MAX_AGE = 300  # Recycle a connection after this many seconds
+DB_BULK_BATCH_SIZE = 500  # Rows per transaction for bulk inserts
+DB_PRAGMAS = {
+    "journal_mode": "WAL",  # Readers don't block the writer
+    "synchronous": "NORMAL",  # Safe with WAL, far fewer fsyncs
+    "busy_timeout": 5000,  # ms to wait on a locked database
+    "cache_size": -8000,  # 8 MB page cache per connection
+    "temp_store": "MEMORY",
+    "mmap_size": 67108864,  # 64 MB memory-mapped I/O
+}
+
+# Rows per page of the /database view and /api/parameters (keyset paginated)
+DATABASE_PAGE_SIZE = 50
+DATABASE_PAGE_MAX_SIZE = 500
+
+# Seconds between PRAGMA data_version checks for the reference-data cache
+REFERENCE_CACHE_CHECK_INTERVAL = 2.0
+
+# HTTP fetch engine used by the automated data collector. Requests run on a
+# thread pool over one shared session; each host gets at most FETCH_PER_HOST
+# requests in flight, started at least FETCH_HOST_DELAY seconds apart.
+# Failed requests and FETCH_RETRY_STATUSES responses are retried with
+# exponential backoff (or the server's Retry-After).
+FETCH_MAX_WORKERS = 8  # Requests in flight across all hosts
+FETCH_PER_HOST = 2
+FETCH_HOST_DELAY = 1.0
+FETCH_TIMEOUT = 10
+FETCH_RETRIES = 3
+FETCH_BACKOFF = 0.5  # Seconds before the first retry, doubled for each one after
+FETCH_BACKOFF_MAX = 30.0
+FETCH_RETRY_STATUSES = (429, 500, 502, 503, 504)
+FETCH_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+# On-disk cache of fetched pages and images, shared by the collectors.
+# Bodies are stored once per content hash; cached URLs are revalidated with
+# If-None-Match/If-Modified-Since, so unchanged files cost a 304 and no
+# write. The least recently used bodies are evicted beyond HTTP_CACHE_MAX_BYTES.
+# With HTTP_CACHE_ONLY, fetches are served from the cache without any network.
+HTTP_CACHE_DIR = os.path.join(os.path.dirname(__file__), "http_cache")
+HTTP_CACHE_MAX_BYTES = 500 * 1024 * 1024
+HTTP_CACHE_ONLY = False
+
+# OCR of chart images: decoded in memory, binarized and deskewed with OpenCV,
+# then read by tesseract on a process pool. Text is cached by image hash.
+OCR_WORKERS = -1  # Processes running OCR (-1 = all cores, 1 = in the calling process)
+OCR_TESSERACT_CONFIG = "--psm 6"  # Read the chart as one uniform block of text
+OCR_CACHE_PATH = os.path.join(HTTP_CACHE_DIR, "ocr_text.db")
+OCR_MEMORY_CACHE_SIZE = 2000  # Most recently used texts also kept in memory, in front of the SQLite cache
+
+# Headless Chrome pool for pages that only build their content with JavaScript.
+# The collector fetches every page over HTTP first and renders it in a browser
+# only when it yields no parameters and looks like a script-built shell.
+# Sessions are started once and reused; each is restarted after
+# BROWSER_MAX_PAGES pages to bound its memory. Images, fonts and the ad and
+# analytics hosts in BROWSER_BLOCKED_URLS are never loaded.
+BROWSER_POOL_SIZE = 2  # Sessions, each rendering one page at a time
+BROWSER_MAX_PAGES = 50
+BROWSER_PAGE_TIMEOUT = 20  # Seconds for a page to load
+BROWSER_RENDER_WAIT = 3  # Seconds to wait for a table to appear once the page has loaded
+BROWSER_MIN_TEXT_CHARS = 200  # Pages with less visible text than this count as script-built
+BROWSER_LAUNCH_RETRY_INTERVAL = 60  # Seconds renders fail fast after Chrome failed to start, before trying again
+BROWSER_BLOCKED_URLS = [
+    "*.png",
+    "*.jpg",
+    "*.jpeg",
+    "*.gif",
+    "*.webp",
+    "*.svg",
+    "*.ico",
+    "*.woff",
+    "*.woff2",
+    "*.ttf",
+    "*.otf",
+    "*.eot",
+    "*doubleclick.net*",
+    "*googlesyndication.com*",
+    "*googleadservices.com*",
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*amazon-adsystem.com*",
+    "*adnxs.com*",
+    "*facebook.net*",
+    "*taboola.com*",
+    "*outbrain.com*",
+]
+
 # Flask application settings
 SECRET_KEY = "your-secret-key-change-in-production"
 DEBUG = True
@@ -19,6 +107,49 @@ MIN_TRAINING_SAMPLES = 10
 CV_FOLDS = 5
 TEST_SIZE = 0.2
 RANDOM_STATE = 42
+TRAINING_WORKERS = -1  # Processes used for CV folds and model fits (-1 = all cores, 1 = serial)
+
+# Rows per chunk when streaming the training join from SQLite
+TRAINING_CHUNK_SIZE = 50000
+
+# Columnar export of weld_parameters (partitioned by process) and the reference
+# tables, written by utils/data_generator.py --export-columnar. With
+# TRAINING_DATA_SOURCE = "columnar", full training runs read the export
+# (memory-mapped, only the feature and target columns) instead of SQLite.
+# "parquet" files are compressed; "ipc" (Arrow/Feather) files are uncompressed
+# and map straight into memory without decoding.
+COLUMNAR_EXPORT_DIR = os.path.join(os.path.dirname(__file__), "database", "columnar")
+COLUMNAR_FORMAT = "parquet"
+TRAINING_DATA_SOURCE = "sqlite"
+
+# Incremental retraining (update_models) reads only rows added since the
+# models were trained and grows the ensembles with warm-started trees. It
+# falls back to a full refit when the new rows are a large share of the
+# data, when the models' error on them has drifted, or once the ensembles
+# have grown too large.
+INCREMENTAL_MIN_ROWS = 5  # Fewer new rows than this wait for the next update
+INCREMENTAL_MAX_NEW_FRACTION = 0.25  # Of the rows the models were trained on
+INCREMENTAL_DRIFT_RMSE_RATIO = 1.5  # RMSE on new rows vs the models' test RMSE
+INCREMENTAL_BOOSTING_STAGES = 20  # Stages added to gradient boosting models per update
+INCREMENTAL_MAX_TREE_GROWTH = 2.0  # Refit once an ensemble has this multiple of its trees at the last full refit
+
+# Largest number of inputs accepted by /predict_batch
+PREDICT_BATCH_MAX_SIZE = 5000
+
+# Prediction confidence is 1 / (1 + spread / target std). Forests use the spread
+# of their per-tree predictions; gradient boosting targets get a pair of quantile
+# models at these levels, whose interval is converted to a standard deviation.
+CONFIDENCE_QUANTILES = (0.1, 0.9)
+RULE_BASED_CONFIDENCE = 0.6  # Fixed score for the rule-based fallback, which has no uncertainty estimate
+
+# Precomputed prediction grid, built after training and used by /predict
+USE_PREDICTION_GRID = True
+PREDICTION_GRID_FILE = "prediction_grid.npz"
+PREDICTION_GRID_THICKNESSES = [0.8, 1.0, 1.5, 2.0, 3.0, 4.0, 5.0, 6.0, 8.0, 10.0, 12.0, 15.0, 20.0, 25.0]  # mm
+
+# Prediction engine: "per_target" trains one regressor per setting,
+# "multi_output" trains one regressor that predicts all four in one pass
+MODEL_ENGINE = "per_target"
 
 # Model file paths
 MODEL_DIR = os.path.join(os.path.dirname(__file__), "models")
@@ -28,7 +159,29 @@ MODEL_FILES = {
     "wire_feed_speed": "wire_feed_speed_model.joblib",
     "travel_speed": "travel_speed_model.joblib",
 }
+MULTI_OUTPUT_MODEL_FILE = "multi_output_model.joblib"
+INTERVAL_MODEL_FILE = "interval_models.joblib"  # Quantile models behind gradient boosting confidence
+
+# Shared scaler, encoders and feature columns, saved as one artifact
+PREPROCESSING_FILE = "preprocessing.joblib"
+
+# Compact export of the trained ensembles as flat, memory-mappable .npy node
+# arrays. When enabled, save_models also writes the export (to this
+# subdirectory of the model directory) and load_models serves predictions
+# from it with NumPy only.
+USE_COMPACT_MODELS = False
+COMPACT_MODEL_SUBDIR = "compact"
+
+# Versioned model registry: every training run publishes its models to a new
+# MODEL_REGISTRY_DIR/<version>/ directory and manifest.json names the active
+# version. The web app polls the manifest and hot-swaps new versions in.
+# When no version has been published, models load from MODEL_DIR as before.
+USE_MODEL_REGISTRY = True
+MODEL_REGISTRY_DIR = os.path.join(MODEL_DIR, "registry")
+MODEL_REGISTRY_KEEP = 5  # Inactive versions kept on disk for rollback
+MODEL_RELOAD_INTERVAL = 5.0  # Seconds between manifest checks in the web app
 
+# Per-target scaler and encoder files from older model directories (still loaded)
 SCALER_FILES = {
     "voltage": "voltage_scaler.joblib",
     "amperage": "amperage_scaler.joblib",
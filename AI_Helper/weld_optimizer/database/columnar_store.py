@@ -0,0 +1,226 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from config import COLUMNAR_EXPORT_DIR, COLUMNAR_FORMAT, TRAINING_CHUNK_SIZE
+from database.db_manager import TRAINING_CATEGORICAL_COLUMNS, TRAINING_NUMERIC_COLUMNS
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+    from pyarrow import fs
+except ImportError:
+    pa = None
+
+WELD_PARAMETERS_DATASET = "weld_parameters"
+REFERENCE_TABLES = ["materials", "joint_types", "welding_positions", "welding_processes", "shielding_gases"]
+FILE_EXTENSIONS = {"parquet": "parquet", "ipc": "arrow"}
+
+# Partition key of the weld_parameters dataset (one directory per process code)
+PARTITION_COLUMN = "process"
+
+# training_snapshot columns appended to every weld_parameters row
+SNAPSHOT_COLUMNS = [
+    "base_carbon",
+    "base_thermal",
+    "base_melting_point",
+    "base_density",
+    "filler_carbon",
+    "filler_thermal",
+    "process",
+    "position",
+    "joint_type",
+    "base_material",
+    "filler_material",
+    "shielding_gas",
+]
+
+EXPORT_QUERY = f"""
+SELECT wp.*, {", ".join(f"ts.{column}" for column in SNAPSHOT_COLUMNS)}
+FROM weld_parameters wp
+JOIN training_snapshot ts ON ts.id = wp.id
+ORDER BY wp.id
+"""
+
+# Columns a training run reads from the export
+TRAINING_COLUMNS = ["id", "created_date", *TRAINING_NUMERIC_COLUMNS, *TRAINING_CATEGORICAL_COLUMNS]
+
+
+def _require_pyarrow():
+    """Raise a helpful ImportError when pyarrow is missing."""
+    if pa is None:
+        raise ImportError("The columnar export needs pyarrow: pip install pyarrow")
+
+
+def _arrow_type(name, declared_type):
+    """Arrow type for a column declared with the given SQLite type.
+
+    SQLite does not enforce declared types (quality ratings such as 8.1 sit
+    in INTEGER columns), so only id columns are exported as integers.
+    """
+    declared_type = declared_type.upper()
+    if declared_type == "INTEGER" and (name == "id" or name.endswith("_id")):
+        return pa.int64()
+    if declared_type in ("INTEGER", "REAL"):
+        return pa.float64()
+    if declared_type == "TIMESTAMP":
+        return pa.timestamp("us")
+    if declared_type == "BOOLEAN":
+        return pa.bool_()
+    return pa.string()
+
+
+def _table_schema(conn, table):
+    """Arrow fields for a table's columns, from PRAGMA table_info."""
+    return [pa.field(row[1], _arrow_type(row[1], row[2])) for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def _export_schema(conn):
+    """Arrow schema of EXPORT_QUERY's result."""
+    snapshot_fields = {field.name: field for field in _table_schema(conn, "training_snapshot")}
+    return pa.schema(_table_schema(conn, "weld_parameters") + [snapshot_fields[column] for column in SNAPSHOT_COLUMNS])
+
+
+def _to_record_batch(df, schema):
+    """Convert a DataFrame chunk read from SQLite into a record batch of the given schema."""
+    for field in schema:
+        if pa.types.is_timestamp(field.type):
+            df[field.name] = pd.to_datetime(df[field.name])
+    return pa.RecordBatch.from_pandas(df, schema=schema, preserve_index=False)
+
+
+def _file_options(file_format):
+    """Writer options: compressed Parquet, uncompressed Arrow IPC so it can be memory-mapped."""
+    if file_format == "ipc":
+        return ds.IpcFileFormat().make_write_options(compression=None)
+    return ds.ParquetFileFormat().make_write_options(compression="snappy")
+
+
+def _write_table(table, path, file_format):
+    """Write one unpartitioned table."""
+    if file_format == "ipc":
+        feather.write_feather(table, path, compression="uncompressed")
+    else:
+        pq.write_table(table, path, compression="snappy")
+
+
+def export_columnar(
+    db_manager, export_dir=COLUMNAR_EXPORT_DIR, file_format=COLUMNAR_FORMAT, chunk_size=TRAINING_CHUNK_SIZE
+):
+    """Export weld_parameters and the reference tables as columnar files.
+
+    weld_parameters, with the training_snapshot columns, becomes a dataset
+    partitioned by process (weld_parameters/process=<code>/...); each
+    reference table becomes a single <table>.<ext> file. Rows are streamed
+    from SQLite chunk by chunk. The export is written to a staging directory
+    and moved into place when complete. Returns a summary dict.
+    """
+    _require_pyarrow()
+    if file_format not in FILE_EXTENSIONS:
+        raise ValueError(f"Unknown columnar format: {file_format}")
+
+    extension = FILE_EXTENSIONS[file_format]
+    staging_dir = f"{export_dir}.staging"
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    os.makedirs(staging_dir)
+
+    db_manager.ensure_training_snapshot()
+    summary = {"format": file_format, "rows": 0, "reference_tables": {}}
+
+    try:
+        with db_manager.connection() as conn:
+            schema = _export_schema(conn)
+
+            def batches():
+                for chunk in pd.read_sql_query(EXPORT_QUERY, conn, chunksize=chunk_size):
+                    summary["rows"] += len(chunk)
+                    yield _to_record_batch(chunk, schema)
+
+            ds.write_dataset(
+                batches(),
+                os.path.join(staging_dir, WELD_PARAMETERS_DATASET),
+                schema=schema,
+                format=file_format,
+                file_options=_file_options(file_format),
+                partitioning=ds.partitioning(pa.schema([schema.field(PARTITION_COLUMN)]), flavor="hive"),
+                basename_template=f"part-{{i}}.{extension}",
+            )
+            # An empty table writes no partitions; keep the dataset directory anyway
+            os.makedirs(os.path.join(staging_dir, WELD_PARAMETERS_DATASET), exist_ok=True)
+
+            for table in REFERENCE_TABLES:
+                df = pd.read_sql_query(f"SELECT * FROM {table}", conn)
+                arrow_table = pa.Table.from_pandas(
+                    df, schema=pa.schema(_table_schema(conn, table)), preserve_index=False
+                )
+                _write_table(arrow_table, os.path.join(staging_dir, f"{table}.{extension}"), file_format)
+                summary["reference_tables"][table] = len(df)
+
+        shutil.rmtree(export_dir, ignore_errors=True)
+        os.replace(staging_dir, export_dir)
+    except Exception:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+
+    summary["partitions"] = sorted(
+        name.split("=", 1)[1] for name in os.listdir(os.path.join(export_dir, WELD_PARAMETERS_DATASET))
+    )
+    return summary
+
+
+def open_weld_parameters(export_dir=COLUMNAR_EXPORT_DIR, file_format=COLUMNAR_FORMAT):
+    """Open the exported weld_parameters dataset, memory-mapping its files."""
+    _require_pyarrow()
+    path = os.path.join(export_dir, WELD_PARAMETERS_DATASET)
+    if not os.path.isdir(path):
+        raise FileNotFoundError(
+            f"No columnar export found at {export_dir}; run utils/data_generator.py --export-columnar"
+        )
+
+    return ds.dataset(
+        path,
+        format=file_format,
+        partitioning=ds.HivePartitioning.discover(infer_dictionary=True),
+        filesystem=fs.LocalFileSystem(use_mmap=True),
+    )
+
+
+def read_training_data(export_dir=COLUMNAR_EXPORT_DIR, file_format=COLUMNAR_FORMAT, min_id=None, processes=None):
+    """Read training rows from the columnar export.
+
+    Only TRAINING_COLUMNS are read, and filters are pushed down to the scan:
+    rows without a quality rating are skipped, processes limits the read to
+    those process partitions, and min_id keeps only larger ids. The frame
+    matches DatabaseManager.get_training_data: float32 numerics and
+    categorical process, position and joint_type columns.
+    """
+    dataset = open_weld_parameters(export_dir, file_format)
+
+    condition = ds.field("quality_rating").is_valid()
+    if min_id is not None:
+        condition &= ds.field("id") > int(min_id)
+    if processes:
+        condition &= ds.field(PARTITION_COLUMN).isin(list(processes))
+
+    if not dataset.files:
+        columns = {"id": np.int64, "created_date": "datetime64[ns]"}
+        columns.update({column: np.float32 for column in TRAINING_NUMERIC_COLUMNS})
+        columns.update({column: "category" for column in TRAINING_CATEGORICAL_COLUMNS})
+        return pd.DataFrame({column: pd.Series(dtype=dtype) for column, dtype in columns.items()})
+
+    table = dataset.to_table(columns=TRAINING_COLUMNS, filter=condition)
+
+    for column in TRAINING_NUMERIC_COLUMNS:
+        index = table.schema.get_field_index(column)
+        table = table.set_column(index, column, table[column].cast(pa.float32()))
+    for column in TRAINING_CATEGORICAL_COLUMNS:
+        if not pa.types.is_dictionary(table.schema.field(column).type):
+            index = table.schema.get_field_index(column)
+            table = table.set_column(index, column, table[column].dictionary_encode())
+
+    # Release Arrow buffers as pandas takes over each column
+    return table.to_pandas(self_destruct=True, split_blocks=True)
@@ -0,0 +1,156 @@
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+
+class ConnectionPool:
+    """Thread-local pool of long-lived SQLite connections.
+
+    Each worker thread gets its own connection, which is reused across calls
+    and recycled after a number of uses or once it reaches a maximum age.
+    """
+
+    def __init__(self, db_path, pragmas=None, max_uses=1000, max_age=300.0):
+        self.db_path = db_path
+        self.pragmas = pragmas or {}
+        self.max_uses = max_uses
+        self.max_age = max_age
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = {}  # thread ident -> connection, for close_all()
+
+        self._hits = 0
+        self._misses = 0
+        self._recycled = 0
+        self._acquire_time = 0.0
+        self._max_acquire_time = 0.0
+
+    def _open(self):
+        """Open a new connection and apply the configured pragmas."""
+        # check_same_thread is disabled only so close_all() can close
+        # connections owned by other threads; each one is used by a single thread.
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def _should_recycle(self, entry):
+        """Check whether a thread's connection is due for replacement."""
+        if self.max_uses and entry["uses"] >= self.max_uses:
+            return True
+        if self.max_age and time.monotonic() - entry["opened"] >= self.max_age:
+            return True
+        return False
+
+    def _release_dead_threads(self):
+        """Close connections owned by threads that have exited. Caller holds the lock."""
+        alive = {thread.ident for thread in threading.enumerate()}
+        for ident in [ident for ident in self._connections if ident not in alive]:
+            self._connections.pop(ident).close()
+
+    def acquire(self):
+        """Return this thread's connection, opening or recycling it as needed."""
+        start = time.perf_counter()
+        entry = getattr(self._local, "entry", None)
+
+        if entry is not None and self._should_recycle(entry):
+            # Never recycle in the middle of a transaction
+            if not entry["conn"].in_transaction:
+                self._discard(entry)
+                entry = None
+                with self._lock:
+                    self._recycled += 1
+
+        if entry is None:
+            conn = self._open()
+            entry = {"conn": conn, "uses": 0, "opened": time.monotonic()}
+            self._local.entry = entry
+            with self._lock:
+                self._release_dead_threads()
+                # A live thread can reuse the ident of an exited one that never closed its connection
+                stale = self._connections.get(threading.get_ident())
+                if stale is not None:
+                    stale.close()
+                self._connections[threading.get_ident()] = conn
+                self._misses += 1
+        else:
+            with self._lock:
+                self._hits += 1
+
+        entry["uses"] += 1
+        # Threads never wait for each other, so this is the cost of opening or handing back a connection
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._acquire_time += elapsed
+            self._max_acquire_time = max(self._max_acquire_time, elapsed)
+
+        return entry["conn"]
+
+    def _discard(self, entry):
+        """Close a connection owned by the current thread."""
+        with self._lock:
+            self._connections.pop(threading.get_ident(), None)
+        try:
+            entry["conn"].close()
+        except sqlite3.Error:
+            pass
+        self._local.entry = None
+
+    @contextmanager
+    def connection(self):
+        """Context manager yielding this thread's pooled connection.
+
+        Any open transaction is rolled back if the block raises, so the
+        connection is always handed back clean.
+        """
+        conn = self.acquire()
+        try:
+            yield conn
+        except sqlite3.ProgrammingError:
+            # Connection was closed underneath us; drop it so the next call reopens
+            entry = getattr(self._local, "entry", None)
+            if entry is not None and entry["conn"] is conn:
+                self._discard(entry)
+            raise
+        except Exception:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+
+    def close_all(self):
+        """Close every pooled connection."""
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+
+    def stats(self):
+        """Return pool hit/miss and acquire-time counters."""
+        with self._lock:
+            requests = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "recycled": self._recycled,
+                "hit_rate": self._hits / requests if requests else 0.0,
+                "open_connections": len(self._connections),
+                "total_acquire_ms": self._acquire_time * 1000,
+                "avg_acquire_ms": self._acquire_time * 1000 / requests if requests else 0.0,
+                "max_acquire_ms": self._max_acquire_time * 1000,
+            }
+
+    def reset_stats(self):
+        """Reset the hit/miss and acquire-time counters."""
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+            self._recycled = 0
+            self._acquire_time = 0.0
+            self._max_acquire_time = 0.0
@@ -1,158 +1,497 @@
 import sqlite3
-import os
+from itertools import islice
+
+import numpy as np
 import pandas as pd
 
+from config import (
+    DATABASE_PATH,
+    DATABASE_PAGE_MAX_SIZE,
+    DATABASE_PAGE_SIZE,
+    DB_BULK_BATCH_SIZE,
+    DB_POOL_MAX_AGE,
+    DB_POOL_MAX_USES,
+    DB_PRAGMAS,
+    REFERENCE_CACHE_CHECK_INTERVAL,
+    TRAINING_CHUNK_SIZE,
+)
+from database.connection_pool import ConnectionPool
+from database.init_db import create_training_snapshot, drop_training_snapshot_triggers
+from database.query_builder import build_weld_parameter_query
+from database.reference_cache import ReferenceCache
+
+WELD_PARAMETER_INSERT = """
+INSERT INTO weld_parameters
+(base_material_id, filler_material_id, thickness, joint_type_id, position_id,
+ process_id, shielding_gas_id, voltage, amperage, wire_feed_speed, travel_speed,
+ electrode_diameter, gas_flow_rate, preheat_temp, interpass_temp,
+ penetration_depth, quality_rating, success_rate, notes, source)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+USER_FEEDBACK_INSERT = """
+INSERT INTO user_feedback
+(parameter_id, user_voltage, user_amperage, user_wire_feed_speed,
+ user_travel_speed, result_quality, weld_success, defects, comments)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+TRAINING_DATA_QUERY = """
+SELECT id, created_date,
+       thickness, voltage, amperage, wire_feed_speed,
+       travel_speed, electrode_diameter, gas_flow_rate,
+       preheat_temp, interpass_temp, quality_rating,
+       base_carbon, base_thermal, base_melting_point, base_density,
+       filler_carbon, filler_thermal,
+       process, position, joint_type
+FROM training_snapshot
+WHERE quality_rating IS NOT NULL
+"""
+
+PARAMETER_PAGE_COLUMNS = """
+id, created_date, base_material, filler_material, thickness, joint_type,
+position AS position_code, process AS process_code, shielding_gas,
+voltage, amperage, wire_feed_speed, travel_speed, quality_rating
+"""
+
+# Database view filters -> WHERE clause on training_snapshot
+PARAMETER_PAGE_FILTERS = {
+    "process": "process = ?",
+    "base_material": "base_material = ?",
+    "position": "position = ?",
+    "thickness_min": "thickness >= ?",
+    "thickness_max": "thickness <= ?",
+}
+
+# Columns the database view can be sorted on (id breaks ties)
+PARAMETER_SORT_COLUMNS = [
+    "id",
+    "thickness",
+    "voltage",
+    "amperage",
+    "wire_feed_speed",
+    "travel_speed",
+    "quality_rating",
+    "created_date",
+]
+
+# Numeric training columns, loaded as float32
+TRAINING_NUMERIC_COLUMNS = [
+    "thickness",
+    "voltage",
+    "amperage",
+    "wire_feed_speed",
+    "travel_speed",
+    "electrode_diameter",
+    "gas_flow_rate",
+    "preheat_temp",
+    "interpass_temp",
+    "quality_rating",
+    "base_carbon",
+    "base_thermal",
+    "base_melting_point",
+    "base_density",
+    "filler_carbon",
+    "filler_thermal",
+]
+
+# Categorical training columns -> (reference data key, label field)
+TRAINING_CATEGORICAL_COLUMNS = {
+    "process": ("processes", "code"),
+    "position": ("positions", "code"),
+    "joint_type": ("joint_types", "name"),
+}
+
+
+def _keyset_segments(sort, descending, after):
+    """WHERE conditions selecting the rows after a keyset cursor, in page order.
+
+    SQLite sorts NULLs first, so an ascending order reads the NULL sort
+    values before the rest and a descending one reads them last. Each
+    segment is a separate indexable range: a row-value comparison such as
+    (thickness, id) > (?, ?) is a single index seek, where an OR over NULLs
+    would scan the whole index.
+    """
+    id_op = "<" if descending else ">"
+    if sort == "id":
+        return [(f"id {id_op} ?", [after["id"]])] if after else [(None, [])]
+
+    null_rows = (f"{sort} IS NULL", [])
+    value_rows = (f"{sort} IS NOT NULL", [])
+    if after is not None and after["value"] is None:
+        null_rows = (f"{sort} IS NULL AND id {id_op} ?", [after["id"]])
+    elif after is not None:
+        value_rows = (f"({sort}, id) {id_op} (?, ?)", [after["value"], after["id"]])
+
+    if descending:
+        if after is not None and after["value"] is None:
+            return [null_rows]
+        return [value_rows, null_rows]
+
+    if after is not None and after["value"] is not None:
+        return [value_rows]
+    return [null_rows, value_rows]
+
 
 class DatabaseManager:
     """Manages database connections and operations for the weld optimizer."""
 
-    def __init__(self):
-        self.db_path = os.path.join(os.path.dirname(__file__), "weld_parameters.db")
+    def __init__(self, db_path=None):
+        self.db_path = db_path or DATABASE_PATH
+        self.pool = ConnectionPool(self.db_path, pragmas=DB_PRAGMAS, max_uses=DB_POOL_MAX_USES, max_age=DB_POOL_MAX_AGE)
+        self.reference_cache = ReferenceCache(self.pool, check_interval=REFERENCE_CACHE_CHECK_INTERVAL)
+        self._snapshot_ready = False
 
     def get_connection(self):
-        """Get a database connection."""
+        """Get a new, unpooled database connection. The caller must close it."""
         return sqlite3.connect(self.db_path)
 
+    def connection(self):
+        """Borrow this thread's pooled connection (use as a context manager)."""
+        return self.pool.connection()
+
+    def pool_stats(self):
+        """Get connection pool hit/miss and wait-time counters."""
+        return self.pool.stats()
+
+    def close(self):
+        """Close all pooled connections."""
+        self.pool.close_all()
+
+    def get_reference_data(self):
+        """Get materials, joint types, positions, processes and gases from the in-memory cache.
+
+        Returns a dict of lists of row dicts (keys: materials, base_materials,
+        filler_materials, joint_types, positions, processes, shielding_gases).
+        The lists are shared and must be treated as read-only.
+        """
+        return self.reference_cache.get()
+
+    def invalidate_reference_cache(self):
+        """Force the reference data to be reloaded on the next read."""
+        self.reference_cache.invalidate()
+
+    def analyze(self):
+        """Refresh query planner statistics after large data loads."""
+        with self.connection() as conn:
+            conn.execute("ANALYZE")
+            conn.commit()
+
+    def ensure_training_snapshot(self):
+        """Create the training_snapshot table on databases built before it existed."""
+        if self._snapshot_ready:
+            return
+
+        with self.connection() as conn:
+            create_training_snapshot(conn)
+        self._snapshot_ready = True
+
+    def rebuild_training_snapshot(self):
+        """Refill training_snapshot from weld_parameters and the reference tables."""
+        with self.connection() as conn:
+            create_training_snapshot(conn, rebuild=True)
+        self._snapshot_ready = True
+
     def get_materials(self, material_type=None):
         """Get materials from the database."""
-        conn = self.get_connection()
-
-        if material_type:
-            query = "SELECT * FROM materials WHERE type = ?"
-            df = pd.read_sql_query(query, conn, params=[material_type])
-        else:
-            query = "SELECT * FROM materials"
-            df = pd.read_sql_query(query, conn)
+        with self.connection() as conn:
+            if material_type:
+                query = "SELECT * FROM materials WHERE type = ?"
+                df = pd.read_sql_query(query, conn, params=[material_type])
+            else:
+                query = "SELECT * FROM materials"
+                df = pd.read_sql_query(query, conn)
 
-        conn.close()
         return df
 
     def get_joint_types(self):
         """Get all joint types."""
-        conn = self.get_connection()
-        df = pd.read_sql_query("SELECT * FROM joint_types", conn)
-        conn.close()
-        return df
+        with self.connection() as conn:
+            return pd.read_sql_query("SELECT * FROM joint_types", conn)
 
     def get_welding_positions(self):
         """Get all welding positions."""
-        conn = self.get_connection()
-        df = pd.read_sql_query("SELECT * FROM welding_positions", conn)
-        conn.close()
-        return df
+        with self.connection() as conn:
+            return pd.read_sql_query("SELECT * FROM welding_positions", conn)
 
     def get_welding_processes(self):
         """Get all welding processes."""
-        conn = self.get_connection()
-        df = pd.read_sql_query("SELECT * FROM welding_processes", conn)
-        conn.close()
-        return df
+        with self.connection() as conn:
+            return pd.read_sql_query("SELECT * FROM welding_processes", conn)
 
     def get_shielding_gases(self):
         """Get all shielding gases."""
-        conn = self.get_connection()
-        df = pd.read_sql_query("SELECT * FROM shielding_gases", conn)
-        conn.close()
-        return df
+        with self.connection() as conn:
+            return pd.read_sql_query("SELECT * FROM shielding_gases", conn)
+
+    def get_weld_parameters(self, filters=None, order_by=None, limit=None):
+        """Get weld parameters with optional filters.
+
+        filters, order_by and limit are passed to build_weld_parameter_query:
+        plain keys filter on equality, and suffixes such as "__gte", "__in"
+        or "__like" select other operators, e.g. {"process_code__in":
+        ["GMAW", "FCAW"], "thickness__between": (3, 10)}.
+        """
+        query, params = build_weld_parameter_query(filters, order_by=order_by, limit=limit)
+
+        with self.connection() as conn:
+            return pd.read_sql_query(query, conn, params=params)
+
+    def get_parameter_page(self, filters=None, sort="id", descending=False, after=None, limit=DATABASE_PAGE_SIZE):
+        """Get one page of the database view with keyset pagination.
+
+        filters may hold any of PARAMETER_PAGE_FILTERS. Rows are ordered by
+        sort (one of PARAMETER_SORT_COLUMNS), then id. after is the cursor
+        returned with the previous page; the next page starts right after
+        it with an index seek instead of skipping OFFSET rows. Returns a dict
+        with the rows (as dicts) and the cursor of the next page, or None
+        on the last page.
+        """
+        if sort not in PARAMETER_SORT_COLUMNS:
+            raise ValueError(f"Cannot sort by {sort!r}")
+        limit = max(1, min(int(limit), DATABASE_PAGE_MAX_SIZE))
+
+        where_clause, params = self._parameter_filter_clause(filters)
+        direction = "DESC" if descending else "ASC"
+        order_by = f"id {direction}" if sort == "id" else f"{sort} {direction}, id {direction}"
+
+        rows = []
+        self.ensure_training_snapshot()
+        with self.connection() as conn:
+            for condition, cursor_params in _keyset_segments(sort, descending, after):
+                conditions = where_clause + ([condition] if condition else [])
+                query = f"SELECT {PARAMETER_PAGE_COLUMNS} FROM training_snapshot"
+                if conditions:
+                    query += " WHERE " + " AND ".join(conditions)
+                query += f" ORDER BY {order_by} LIMIT ?"
+
+                # One extra row tells whether there is a next page
+                cursor = conn.execute(query, params + cursor_params + [limit + 1 - len(rows)])
+                columns = [column[0] for column in cursor.description]
+                rows.extend(dict(zip(columns, row)) for row in cursor.fetchall())
+                if len(rows) > limit:
+                    break
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = {"value": rows[-1][sort], "id": rows[-1]["id"]}
 
-    def get_weld_parameters(self, filters=None):
-        """Get weld parameters with optional filters."""
-        conn = self.get_connection()
+        return {"rows": rows, "next_cursor": next_cursor}
 
+    def get_parameter_stats(self, filters=None):
+        """Get record, rated-record and base material counts for the database view."""
+        where_clause, params = self._parameter_filter_clause(filters)
         query = """
-        SELECT wp.*,
-               bm.name as base_material,
-               fm.name as filler_material,
-               jt.name as joint_type,
-               pos.code as position_code,
-               proc.code as process_code,
-               sg.name as shielding_gas
-        FROM weld_parameters wp
-        LEFT JOIN materials bm ON wp.base_material_id = bm.id
-        LEFT JOIN materials fm ON wp.filler_material_id = fm.id
-        LEFT JOIN joint_types jt ON wp.joint_type_id = jt.id
-        LEFT JOIN welding_positions pos ON wp.position_id = pos.id
-        LEFT JOIN welding_processes proc ON wp.process_id = proc.id
-        LEFT JOIN shielding_gases sg ON wp.shielding_gas_id = sg.id
+        SELECT COUNT(*), COUNT(quality_rating), COUNT(DISTINCT base_material)
+        FROM training_snapshot
         """
+        if where_clause:
+            query += " WHERE " + " AND ".join(where_clause)
 
-        if filters:
-            where_clause = []
-            params = []
+        self.ensure_training_snapshot()
+        with self.connection() as conn:
+            total, rated, materials = conn.execute(query, params).fetchone()
 
-            for key, value in filters.items():
-                if value is not None:
-                    where_clause.append(f"wp.{key} = ?")
-                    params.append(value)
+        return {"total": total, "rated": rated, "materials": materials}
 
-            if where_clause:
-                query += " WHERE " + " AND ".join(where_clause)
+    def _parameter_filter_clause(self, filters):
+        """WHERE conditions and parameters for the database view filters."""
+        where_clause = []
+        params = []
 
-        df = pd.read_sql_query(query, conn, params=params if filters else None)
-        conn.close()
-        return df
+        for key, value in (filters or {}).items():
+            if key not in PARAMETER_PAGE_FILTERS:
+                raise ValueError(f"Unknown filter: {key}")
+            if value is not None and value != "":
+                where_clause.append(PARAMETER_PAGE_FILTERS[key])
+                params.append(value)
+
+        return where_clause, params
 
     def add_weld_parameter(self, parameters):
         """Add a new weld parameter record."""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.execute(WELD_PARAMETER_INSERT, parameters)
+            conn.commit()
 
-        query = """
-        INSERT INTO weld_parameters
-        (base_material_id, filler_material_id, thickness, joint_type_id, position_id,
-         process_id, shielding_gas_id, voltage, amperage, wire_feed_speed, travel_speed,
-         electrode_diameter, gas_flow_rate, preheat_temp, interpass_temp,
-         penetration_depth, quality_rating, success_rate, notes, source)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        return cursor.lastrowid
+
+    def add_weld_parameters_bulk(self, parameter_rows, batch_size=DB_BULK_BATCH_SIZE, defer_snapshot=False):
+        """Add many weld parameter records in chunked transactions.
+
+        Returns a dict with the inserted count, the first and last inserted
+        ids, and a list of (row_index, error) for rows that were rejected.
+
+        With defer_snapshot, the training_snapshot triggers are dropped for
+        the whole database during the load and the snapshot is rebuilt in one
+        pass afterwards, about twice as fast for large loads. Changes other
+        writers make meanwhile are picked up by the rebuild, but only opt in
+        for offline loads where nothing else uses the database.
         """
+        if not defer_snapshot:
+            return self._insert_bulk(WELD_PARAMETER_INSERT, parameter_rows, batch_size)
 
-        cursor.execute(query, parameters)
-        conn.commit()
-        parameter_id = cursor.lastrowid
-        conn.close()
+        self.ensure_training_snapshot()
+        with self.connection() as conn:
+            drop_training_snapshot_triggers(conn)
 
-        return parameter_id
+        try:
+            return self._insert_bulk(WELD_PARAMETER_INSERT, parameter_rows, batch_size)
+        finally:
+            # A full rebuild, so updates and deletes made while the triggers were gone are not lost
+            with self.connection() as conn:
+                create_training_snapshot(conn, rebuild=True)
 
     def add_user_feedback(self, feedback):
         """Add user feedback for a weld parameter."""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.execute(USER_FEEDBACK_INSERT, feedback)
+            conn.commit()
 
-        query = """
-        INSERT INTO user_feedback
-        (parameter_id, user_voltage, user_amperage, user_wire_feed_speed,
-         user_travel_speed, result_quality, weld_success, defects, comments)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        return cursor.lastrowid
+
+    def add_user_feedback_bulk(self, feedback_rows, batch_size=DB_BULK_BATCH_SIZE):
+        """Add many user feedback records in chunked transactions.
+
+        Returns the same summary dict as add_weld_parameters_bulk.
         """
+        return self._insert_bulk(USER_FEEDBACK_INSERT, feedback_rows, batch_size)
 
-        cursor.execute(query, feedback)
-        conn.commit()
-        feedback_id = cursor.lastrowid
-        conn.close()
+    def _insert_bulk(self, query, rows, batch_size):
+        """Insert rows with executemany, one transaction per chunk.
 
-        return feedback_id
+        If a chunk fails as a whole it is rolled back and retried row by row,
+        so a single bad row is reported instead of aborting the batch.
+        """
+        result = {"inserted": 0, "first_id": None, "last_id": None, "failures": []}
+        rows = iter(rows)
+        offset = 0
 
-    def get_training_data(self):
-        """Get formatted data for ML training."""
-        conn = self.get_connection()
+        with self.connection() as conn:
+            while True:
+                chunk = list(islice(rows, batch_size))
+                if not chunk:
+                    break
 
-        query = """
-        SELECT wp.thickness, wp.voltage, wp.amperage, wp.wire_feed_speed,
-               wp.travel_speed, wp.electrode_diameter, wp.gas_flow_rate,
-               wp.preheat_temp, wp.interpass_temp, wp.quality_rating,
-               bm.carbon_content as base_carbon, bm.thermal_conductivity as base_thermal,
-               bm.melting_point as base_melting_point, bm.density as base_density,
-               fm.carbon_content as filler_carbon, fm.thermal_conductivity as filler_thermal,
-               proc.code as process, pos.code as position, jt.name as joint_type
-        FROM weld_parameters wp
-        LEFT JOIN materials bm ON wp.base_material_id = bm.id
-        LEFT JOIN materials fm ON wp.filler_material_id = fm.id
-        LEFT JOIN joint_types jt ON wp.joint_type_id = jt.id
-        LEFT JOIN welding_positions pos ON wp.position_id = pos.id
-        LEFT JOIN welding_processes proc ON wp.process_id = proc.id
-        WHERE wp.quality_rating IS NOT NULL
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    conn.executemany(query, chunk)
+                    inserted = len(chunk)
+                except (sqlite3.Error, ValueError, TypeError):
+                    conn.rollback()
+                    conn.execute("BEGIN IMMEDIATE")
+                    inserted = 0
+                    for index, row in enumerate(chunk):
+                        try:
+                            conn.execute(query, row)
+                            inserted += 1
+                        except (sqlite3.Error, ValueError, TypeError) as e:
+                            result["failures"].append((offset + index, str(e)))
+
+                if inserted:
+                    # Ids are contiguous: BEGIN IMMEDIATE holds the write lock for the chunk
+                    last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+                    if result["first_id"] is None:
+                        result["first_id"] = last_id - inserted + 1
+                    result["last_id"] = last_id
+                    result["inserted"] += inserted
+                conn.commit()
+                offset += len(chunk)
+
+        return result
+
+    def get_training_data(self, min_id=None, chunk_size=TRAINING_CHUNK_SIZE):
+        """Get formatted data for ML training.
+
+        The matching rows are counted first and each chunk of
+        iter_training_data is copied into columns allocated for that count,
+        so the chunks and the full result are never in memory together.
+        With min_id, only rows with a larger weld_parameters.id are returned,
+        for incremental retraining.
         """
+        self.ensure_training_snapshot()
+        query = "SELECT COUNT(*), MAX(id) FROM training_snapshot WHERE quality_rating IS NOT NULL"
+        params = []
+        if min_id is not None:
+            query += " AND id > ?"
+            params.append(int(min_id))
+        with self.connection() as conn:
+            total, max_id = conn.execute(query, params).fetchone()
+
+        chunks = self.iter_training_data(min_id=min_id, max_id=max_id, chunk_size=chunk_size)
+        if not total:
+            return next(chunks)
+
+        numeric = np.empty((total, len(TRAINING_NUMERIC_COLUMNS)), dtype=np.float32, order="F")
+        columns = {}  # id, created_date and categorical codes
+        filled = 0
+        for chunk in chunks:
+            # Rows changed since the count are dropped rather than overrunning it
+            rows = min(len(chunk), total - filled)
+            numeric[filled : filled + rows] = chunk[TRAINING_NUMERIC_COLUMNS].to_numpy()[:rows]
+            for column in ["id", "created_date", *TRAINING_CATEGORICAL_COLUMNS]:
+                values = chunk[column]
+                values = values.cat.codes.to_numpy() if column in TRAINING_CATEGORICAL_COLUMNS else values.to_numpy()
+                if column not in columns:
+                    columns[column] = np.empty(total, dtype=values.dtype)
+                columns[column][filled : filled + rows] = values[:rows]
+            filled += rows
 
-        df = pd.read_sql_query(query, conn)
-        conn.close()
+        df = pd.DataFrame(numeric[:filled], columns=TRAINING_NUMERIC_COLUMNS, copy=False)
+        df.insert(0, "id", columns["id"][:filled])
+        df.insert(1, "created_date", columns["created_date"][:filled])
+        for column, dtype in self._training_categories().items():
+            df[column] = pd.Categorical.from_codes(columns[column][:filled], dtype=dtype)
         return df
+
+    def iter_training_data(self, min_id=None, max_id=None, chunk_size=TRAINING_CHUNK_SIZE):
+        """Stream the training_snapshot table as DataFrames of at most chunk_size rows, in id order.
+
+        Numeric columns are float32, created_date is datetime64, and process,
+        position and joint_type are categoricals over the reference tables'
+        labels, so they are stored as int8/int16 codes that match across chunks.
+        Rows with ids in (min_id, max_id] are read. Each chunk is read whole
+        before it is yielded, so the pooled connection is not held between
+        chunks and consumers may call back into the manager.
+        Always yields at least one (possibly empty) chunk.
+        """
+        self.ensure_training_snapshot()
+        dtypes = {column: np.float32 for column in TRAINING_NUMERIC_COLUMNS}
+        dtypes.update(self._training_categories())
+
+        last_id = min_id
+        while True:
+            query = TRAINING_DATA_QUERY
+            params = []
+            if last_id is not None:
+                query += " AND id > ?"
+                params.append(int(last_id))
+            if max_id is not None:
+                query += " AND id <= ?"
+                params.append(int(max_id))
+            query += " ORDER BY id LIMIT ?"
+            params.append(int(chunk_size))
+
+            with self.connection() as conn:
+                chunk = pd.read_sql_query(query, conn, params=params, dtype=dtypes)
+            if chunk.empty:
+                break
+            chunk["created_date"] = pd.to_datetime(chunk["created_date"])
+            last_id = int(chunk["id"].iloc[-1])
+            yield chunk
+            if len(chunk) < chunk_size:
+                return
+
+        if last_id == min_id:
+            columns = {"id": np.int64, "created_date": "datetime64[ns]", **dtypes}
+            yield pd.DataFrame({column: pd.Series(dtype=dtype) for column, dtype in columns.items()})
+
+    def _training_categories(self):
+        """Categorical dtypes of the training columns, over the reference tables' labels."""
+        reference = self.get_reference_data()
+        return {
+            column: pd.CategoricalDtype(sorted({row[field] for row in reference[key]}))
+            for column, (key, field) in TRAINING_CATEGORICAL_COLUMNS.items()
+        }
@@ -1,11 +1,188 @@
 import sqlite3
 import os
+import sys
 
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(__file__), "weld_parameters.db")
 
-def create_database():
+# Secondary indexes for the common filter and join columns of weld_parameters.
+# Composite indexes put the equality column first and thickness second so
+# "process X between thickness A and B" style lookups are a single range scan.
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_wp_process_thickness ON weld_parameters (process_id, thickness)",
+    "CREATE INDEX IF NOT EXISTS idx_wp_base_material_thickness ON weld_parameters (base_material_id, thickness)",
+    "CREATE INDEX IF NOT EXISTS idx_wp_position ON weld_parameters (position_id)",
+    "CREATE INDEX IF NOT EXISTS idx_wp_joint_type ON weld_parameters (joint_type_id)",
+    "CREATE INDEX IF NOT EXISTS idx_wp_thickness ON weld_parameters (thickness)",
+    "CREATE INDEX IF NOT EXISTS idx_wp_quality_rating ON weld_parameters (quality_rating)",
+    "CREATE INDEX IF NOT EXISTS idx_materials_type ON materials (type)",
+    "CREATE INDEX IF NOT EXISTS idx_feedback_parameter ON user_feedback (parameter_id)",
+    "CREATE INDEX IF NOT EXISTS idx_environment_parameter ON environmental_conditions (parameter_id)",
+]
+
+
+# Denormalized copy of weld_parameters joined with its reference tables. It
+# holds every column prepare_features and the /database view read, so neither
+# has to repeat the joins. Triggers keep it in sync with weld_parameters and
+# with edits to the reference rows it copies from.
+TRAINING_SNAPSHOT_TABLE = """
+CREATE TABLE IF NOT EXISTS training_snapshot (
+    id INTEGER PRIMARY KEY,  -- weld_parameters.id
+    created_date TIMESTAMP,
+    thickness REAL,
+    voltage REAL,
+    amperage REAL,
+    wire_feed_speed REAL,
+    travel_speed REAL,
+    electrode_diameter REAL,
+    gas_flow_rate REAL,
+    preheat_temp REAL,
+    interpass_temp REAL,
+    quality_rating INTEGER,
+    base_carbon REAL,
+    base_thermal REAL,
+    base_melting_point REAL,
+    base_density REAL,
+    filler_carbon REAL,
+    filler_thermal REAL,
+    process TEXT,
+    position TEXT,
+    joint_type TEXT,
+    base_material TEXT,
+    filler_material TEXT,
+    shielding_gas TEXT
+)
+"""
+
+TRAINING_SNAPSHOT_SELECT = """
+SELECT wp.id, wp.created_date,
+       wp.thickness, wp.voltage, wp.amperage, wp.wire_feed_speed,
+       wp.travel_speed, wp.electrode_diameter, wp.gas_flow_rate,
+       wp.preheat_temp, wp.interpass_temp, wp.quality_rating,
+       bm.carbon_content, bm.thermal_conductivity, bm.melting_point, bm.density,
+       fm.carbon_content, fm.thermal_conductivity,
+       proc.code, pos.code, jt.name,
+       bm.name, fm.name, sg.name
+FROM weld_parameters wp
+LEFT JOIN materials bm ON wp.base_material_id = bm.id
+LEFT JOIN materials fm ON wp.filler_material_id = fm.id
+LEFT JOIN joint_types jt ON wp.joint_type_id = jt.id
+LEFT JOIN welding_positions pos ON wp.position_id = pos.id
+LEFT JOIN welding_processes proc ON wp.process_id = proc.id
+LEFT JOIN shielding_gases sg ON wp.shielding_gas_id = sg.id
+"""
+
+# Indexes behind the filters and sort orders of the paginated /database view
+TRAINING_SNAPSHOT_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_snapshot_process_thickness ON training_snapshot (process, thickness)",
+    "CREATE INDEX IF NOT EXISTS idx_snapshot_base_material_thickness ON training_snapshot (base_material, thickness)",
+    "CREATE INDEX IF NOT EXISTS idx_snapshot_position_thickness ON training_snapshot (position, thickness)",
+    "CREATE INDEX IF NOT EXISTS idx_snapshot_thickness ON training_snapshot (thickness)",
+    "CREATE INDEX IF NOT EXISTS idx_snapshot_quality_rating ON training_snapshot (quality_rating)",
+]
+
+# Reference table -> weld_parameters rows whose snapshot copies a row of it ({row} is NEW or OLD)
+SNAPSHOT_REFERENCES = {
+    "materials": "wp.base_material_id = {row}.id OR wp.filler_material_id = {row}.id",
+    "joint_types": "wp.joint_type_id = {row}.id",
+    "welding_positions": "wp.position_id = {row}.id",
+    "welding_processes": "wp.process_id = {row}.id",
+    "shielding_gases": "wp.shielding_gas_id = {row}.id",
+}
+
+
+def training_snapshot_triggers():
+    """CREATE TRIGGER statements that keep training_snapshot in sync.
+
+    Rows referencing a reference row are re-copied whenever that row is
+    inserted, updated or deleted (a deleted row leaves their columns NULL,
+    as the LEFT JOINs of a rebuild would).
+    """
+    upsert = f"INSERT OR REPLACE INTO training_snapshot {TRAINING_SNAPSHOT_SELECT}"
+    triggers = [
+        f"""CREATE TRIGGER IF NOT EXISTS trg_snapshot_insert AFTER INSERT ON weld_parameters
+        BEGIN {upsert} WHERE wp.id = NEW.id; END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_snapshot_update AFTER UPDATE ON weld_parameters
+        BEGIN DELETE FROM training_snapshot WHERE id = OLD.id; {upsert} WHERE wp.id = NEW.id; END""",
+        """CREATE TRIGGER IF NOT EXISTS trg_snapshot_delete AFTER DELETE ON weld_parameters
+        BEGIN DELETE FROM training_snapshot WHERE id = OLD.id; END""",
+    ]
+    for table, condition in SNAPSHOT_REFERENCES.items():
+        new, old = condition.format(row="NEW"), condition.format(row="OLD")
+        triggers += [
+            f"""CREATE TRIGGER IF NOT EXISTS trg_snapshot_{table}_insert AFTER INSERT ON {table}
+            BEGIN {upsert} WHERE {new}; END""",
+            f"""CREATE TRIGGER IF NOT EXISTS trg_snapshot_{table} AFTER UPDATE ON {table}
+            BEGIN {upsert} WHERE {new} OR {old}; END""",
+            f"""CREATE TRIGGER IF NOT EXISTS trg_snapshot_{table}_delete AFTER DELETE ON {table}
+            BEGIN {upsert} WHERE {old}; END""",
+        ]
+    return triggers
+
+
+def create_training_snapshot(conn, rebuild=False):
+    """Create the training_snapshot table, its triggers and indexes, filling it from weld_parameters.
+
+    An existing snapshot is left alone unless rebuild is True.
+    """
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'training_snapshot'").fetchone()
+
+    conn.execute(TRAINING_SNAPSHOT_TABLE)
+    for statement in training_snapshot_triggers() + TRAINING_SNAPSHOT_INDEXES:
+        conn.execute(statement)
+
+    if rebuild or not exists:
+        conn.execute("DELETE FROM training_snapshot")
+        conn.execute(f"INSERT INTO training_snapshot {TRAINING_SNAPSHOT_SELECT}")
+    conn.commit()
+
+
+def drop_training_snapshot_triggers(conn):
+    """Drop the training_snapshot triggers; create_training_snapshot puts them back."""
+    names = [
+        row[0]
+        for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trg_snapshot_%'")
+    ]
+    for name in names:
+        conn.execute(f"DROP TRIGGER {name}")
+    conn.commit()
+
+
+def create_indexes(conn):
+    """Create the secondary indexes and refresh the query planner statistics."""
+    for statement in INDEXES:
+        conn.execute(statement)
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.commit()
+
+
+def upgrade_database(db_path=None):
+    """Add missing indexes and rebuild the training snapshot (and its triggers) of an existing database.
+
+    The weld parameter data itself is not touched.
+    """
+    db_path = db_path or DEFAULT_DB_PATH
+
+    if not os.path.exists(db_path):
+        print(f"No database found at: {db_path}")
+        return False
+
+    conn = sqlite3.connect(db_path)
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    drop_training_snapshot_triggers(conn)
+    create_training_snapshot(conn, rebuild=True)
+    create_indexes(conn)
+    created = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")} - existing
+    conn.close()
+
+    print(f"Database upgraded at: {db_path} ({len(created)} new indexes)")
+    return True
+
+
+def create_database(db_path=None):
     """Create the weld parameter database with all necessary tables."""
 
-    db_path = os.path.join(os.path.dirname(__file__), "weld_parameters.db")
+    db_path = db_path or DEFAULT_DB_PATH
 
     # Remove existing database to start fresh
     if os.path.exists(db_path):
@@ -155,11 +332,16 @@ def create_database():
     """
     )
 
-    conn.commit()
+    create_training_snapshot(conn)
+    create_indexes(conn)
     conn.close()
 
     print(f"Database created successfully at: {db_path}")
 
 
 if __name__ == "__main__":
-    create_database()
+    # Pass --upgrade to add indexes and rebuild the training snapshot of an existing database
+    if "--upgrade" in sys.argv:
+        upgrade_database()
+    else:
+        create_database()
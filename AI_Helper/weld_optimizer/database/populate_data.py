@@ -2,10 +2,10 @@ import sqlite3
 import os
 
 
-def populate_initial_data():
+def populate_initial_data(db_path=None):
     """Populate the database with initial welding data."""
 
-    db_path = os.path.join(os.path.dirname(__file__), "weld_parameters.db")
+    db_path = db_path or os.path.join(os.path.dirname(__file__), "weld_parameters.db")
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
 
@@ -0,0 +1,178 @@
+from functools import lru_cache
+
+WELD_PARAMETER_SELECT = """
+SELECT wp.*,
+       bm.name as base_material,
+       fm.name as filler_material,
+       jt.name as joint_type,
+       pos.code as position_code,
+       proc.code as process_code,
+       sg.name as shielding_gas
+FROM weld_parameters wp
+LEFT JOIN materials bm ON wp.base_material_id = bm.id
+LEFT JOIN materials fm ON wp.filler_material_id = fm.id
+LEFT JOIN joint_types jt ON wp.joint_type_id = jt.id
+LEFT JOIN welding_positions pos ON wp.position_id = pos.id
+LEFT JOIN welding_processes proc ON wp.process_id = proc.id
+LEFT JOIN shielding_gases sg ON wp.shielding_gas_id = sg.id
+"""
+
+# Filterable and sortable weld_parameters columns
+COLUMNS = [
+    "id",
+    "base_material_id",
+    "filler_material_id",
+    "joint_type_id",
+    "position_id",
+    "process_id",
+    "shielding_gas_id",
+    "thickness",
+    "voltage",
+    "amperage",
+    "wire_feed_speed",
+    "travel_speed",
+    "electrode_diameter",
+    "gas_flow_rate",
+    "preheat_temp",
+    "interpass_temp",
+    "penetration_depth",
+    "quality_rating",
+    "success_rate",
+    "notes",
+    "source",
+    "created_date",
+]
+
+# Columns that accept the like operator
+TEXT_COLUMNS = ["notes", "source"]
+
+# Lookup names -> (foreign key column, lookup table, name column, joined column).
+# Filters on them become "fk IN (SELECT id FROM table WHERE ...)", so the
+# weld_parameters indexes on the foreign keys still apply.
+LOOKUP_COLUMNS = {
+    "base_material": ("base_material_id", "materials", "name", "bm.name"),
+    "filler_material": ("filler_material_id", "materials", "name", "fm.name"),
+    "joint_type": ("joint_type_id", "joint_types", "name", "jt.name"),
+    "position_code": ("position_id", "welding_positions", "code", "pos.code"),
+    "process_code": ("process_id", "welding_processes", "code", "proc.code"),
+    "shielding_gas": ("shielding_gas_id", "shielding_gases", "name", "sg.name"),
+}
+
+# Filter key suffix -> SQL comparison
+OPERATORS = {
+    "eq": "= ?",
+    "gt": "> ?",
+    "gte": ">= ?",
+    "lt": "< ?",
+    "lte": "<= ?",
+    "between": "BETWEEN ? AND ?",
+    "in": "IN",
+    "like": "LIKE ?",
+}
+
+
+def parse_filter_key(key):
+    """Split a filter key such as "thickness__gte" into a validated (column, operator)."""
+    column, _, operator = key.partition("__")
+    operator = operator or "eq"
+
+    if column not in COLUMNS and column not in LOOKUP_COLUMNS:
+        raise ValueError(f"Cannot filter on unknown column: {column}")
+    if operator not in OPERATORS:
+        raise ValueError(f"Unknown filter operator: {operator}")
+    if operator == "like" and column not in TEXT_COLUMNS:
+        raise ValueError(f"like is only supported on {', '.join(TEXT_COLUMNS)}")
+    return column, operator
+
+
+def build_weld_parameter_query(filters=None, order_by=None, limit=None, offset=None):
+    """Build the weld_parameters query for a set of filters.
+
+    filters maps keys of the form "<column>" or "<column>__<operator>" to
+    values, e.g. {"process_code__in": ["GMAW", "FCAW"], "thickness__between":
+    (3, 10), "notes__like": "%spatter%"}. Columns are the weld_parameters
+    columns in COLUMNS and the lookup names in LOOKUP_COLUMNS; operators are
+    the keys of OPERATORS. Filters whose value is None are skipped. order_by
+    is a list of column names, "-" prefixed for descending order.
+
+    Returns (sql, params). The SQL text depends only on the shape of the
+    filters (keys, IN-list lengths, ordering), so it is built once per shape
+    and SQLite's per-connection statement cache reuses the prepared
+    statement.
+    """
+    shape = []
+    params = []
+
+    for key, value in sorted((filters or {}).items()):
+        if value is None:
+            continue
+
+        column, operator = parse_filter_key(key)
+        if operator == "in":
+            if isinstance(value, str):
+                raise ValueError(f"Filter {key} needs a list of values, not a string")
+            values = list(value)
+            if not values:
+                raise ValueError(f"Empty value list for filter: {key}")
+            shape.append((column, operator, len(values)))
+            params.extend(values)
+        elif operator == "between":
+            low, high = value
+            shape.append((column, operator, 2))
+            params.extend([low, high])
+        else:
+            shape.append((column, operator, 1))
+            params.append(value)
+
+    order = tuple(order_by or ())
+    for name in order:
+        if name.lstrip("-") not in COLUMNS and name.lstrip("-") not in LOOKUP_COLUMNS:
+            raise ValueError(f"Cannot order by unknown column: {name}")
+
+    sql = _compile_query(tuple(shape), order, limit is not None, offset is not None)
+    if limit is not None:
+        params.append(int(limit))
+    if offset is not None:
+        params.append(int(offset))
+    return sql, params
+
+
+@lru_cache(maxsize=256)
+def _compile_query(shape, order_by, has_limit, has_offset):
+    """SQL text for a filter shape; cached, since the text never depends on the values."""
+    where_clause = [_condition(column, operator, count) for column, operator, count in shape]
+
+    sql = WELD_PARAMETER_SELECT
+    if where_clause:
+        sql += " WHERE " + " AND ".join(where_clause)
+    if order_by:
+        sql += " ORDER BY " + ", ".join(_order_term(name) for name in order_by)
+    if has_limit:
+        sql += " LIMIT ?"
+        if has_offset:
+            sql += " OFFSET ?"
+    elif has_offset:
+        sql += " LIMIT -1 OFFSET ?"
+    return sql
+
+
+def _condition(column, operator, count):
+    """SQL condition for one filter."""
+    comparison = OPERATORS[operator]
+    if operator == "in":
+        comparison = f"IN ({', '.join('?' * count)})"
+
+    if column in LOOKUP_COLUMNS:
+        foreign_key, table, name_column, _ = LOOKUP_COLUMNS[column]
+        return f"wp.{foreign_key} IN (SELECT id FROM {table} WHERE {name_column} {comparison})"
+
+    return f"wp.{column} {comparison}"
+
+
+def _order_term(name):
+    """ORDER BY term for a column name, "-" prefixed for descending."""
+    column = name.lstrip("-")
+    direction = "DESC" if name.startswith("-") else "ASC"
+    if column in LOOKUP_COLUMNS:
+        return f"{LOOKUP_COLUMNS[column][3]} {direction}"
+    return f"wp.{column} {direction}"
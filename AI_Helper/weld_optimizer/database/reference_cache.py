@@ -0,0 +1,82 @@
+import threading
+import time
+
+# Lookup tables that only change when populate_data.py runs
+REFERENCE_QUERIES = {
+    "materials": "SELECT * FROM materials",
+    "joint_types": "SELECT * FROM joint_types",
+    "positions": "SELECT * FROM welding_positions",
+    "processes": "SELECT * FROM welding_processes",
+    "shielding_gases": "SELECT * FROM shielding_gases",
+}
+
+
+class ReferenceCache:
+    """In-memory copy of the reference tables as plain lists of dicts.
+
+    Changes made by other connections (e.g. populate_data.py running in
+    another process) are detected with PRAGMA data_version, checked at most
+    once per check_interval seconds so steady-state reads never touch SQLite.
+    """
+
+    def __init__(self, pool, check_interval=2.0):
+        self.pool = pool
+        self.check_interval = check_interval
+
+        self._lock = threading.Lock()
+        self._data = None
+        self._last_check = 0.0
+        self._versions = {}  # thread id -> (connection, data_version) when last loaded
+
+        self.hits = 0
+        self.loads = 0
+
+    def _load(self, conn):
+        """Read every reference table into plain Python structures."""
+        data = {}
+        for name, query in REFERENCE_QUERIES.items():
+            cursor = conn.execute(query)
+            columns = [column[0] for column in cursor.description]
+            data[name] = [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+        data["base_materials"] = [m for m in data["materials"] if m["type"] == "base"]
+        data["filler_materials"] = [m for m in data["materials"] if m["type"] == "filler"]
+        return data
+
+    def get(self):
+        """Return the cached reference data, reloading it if the database changed.
+
+        The returned lists are shared between callers and must not be modified.
+        """
+        now = time.monotonic()
+        data = self._data
+        if data is not None and now - self._last_check < self.check_interval:
+            self.hits += 1
+            return data
+
+        with self.pool.connection() as conn:
+            version = conn.execute("PRAGMA data_version").fetchone()[0]
+            with self._lock:
+                # data_version is per connection and only moves when another
+                # connection commits, so a connection we haven't loaded through
+                # yet can't tell us whether anything changed. Keyed by thread, so a
+                # connection the pool has recycled is replaced rather than kept alive
+                thread_id = threading.get_ident()
+                seen = self._versions.get(thread_id)
+                if self._data is None or seen is None or seen[0] is not conn or seen[1] != version:
+                    self._data = self._load(conn)
+                    # Forget the connections of threads that have exited
+                    alive = {thread.ident for thread in threading.enumerate()}
+                    self._versions = {ident: entry for ident, entry in self._versions.items() if ident in alive}
+                    self._versions[thread_id] = (conn, version)
+                    self.loads += 1
+                else:
+                    self.hits += 1
+                self._last_check = now
+                return self._data
+
+    def invalidate(self):
+        """Drop the cached data so the next read reloads it."""
+        with self._lock:
+            self._data = None
+            self._versions = {}
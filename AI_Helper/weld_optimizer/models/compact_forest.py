@@ -0,0 +1,262 @@
+"""
+Compact, memory-mappable export format for the tree ensembles.
+
+Every tree of an ensemble is flattened into shared node arrays (feature,
+threshold, left, right, value) saved as plain .npy files, so they can be
+opened with np.load(mmap_mode="r") and shared between worker processes.
+CompactEnsemble predicts from those arrays with NumPy only.
+"""
+
+import json
+import os
+
+import numpy as np
+
+ARRAYS = ["feature", "threshold", "left", "right", "value", "roots"]
+MANIFEST_FILE = "manifest.json"
+
+
+def _unwrap(model):
+    """Split a fitted model into its tree ensemble and optional target transform."""
+    y_mean = y_scale = None
+    if hasattr(model, "regressor_"):
+        # TransformedTargetRegressor with a StandardScaler on the targets
+        y_mean = model.transformer_.mean_
+        y_scale = model.transformer_.scale_
+        model = model.regressor_
+    return model, y_mean, y_scale
+
+
+def flatten_ensemble(model):
+    """Flatten a fitted RandomForest, ExtraTrees or GradientBoosting regressor into node arrays.
+
+    Returns (arrays, meta): arrays holds the concatenated node arrays for all
+    trees, with child indices made global; meta holds how to combine trees.
+    """
+    ensemble, y_mean, y_scale = _unwrap(model)
+
+    if hasattr(ensemble, "learning_rate"):
+        # Gradient boosting: prediction = init + learning_rate * sum(trees)
+        trees = [estimator.tree_ for estimator in ensemble.estimators_[:, 0]]
+        n_features = ensemble.n_features_in_
+        bias = np.atleast_1d(ensemble.init_.predict(np.zeros((1, n_features)))[0]).astype(np.float64)
+        meta = {"combine": "sum", "scale": float(ensemble.learning_rate), "bias": bias.tolist()}
+    else:
+        # Bagged forests: prediction = mean(trees)
+        trees = [estimator.tree_ for estimator in ensemble.estimators_]
+        meta = {"combine": "mean", "scale": 1.0 / len(trees), "bias": [0.0] * trees[0].n_outputs}
+
+    offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+    feature, threshold, left, right, value = [], [], [], [], []
+
+    for offset, tree in zip(offsets, trees):
+        node_ids = np.arange(tree.node_count)
+        is_leaf = tree.children_left == -1
+
+        # Leaves point at themselves, so traversal can run a fixed number of steps
+        left.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+        right.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+        feature.append(np.where(is_leaf, 0, tree.feature))
+        threshold.append(np.where(is_leaf, np.inf, tree.threshold))
+        value.append(tree.value[:, :, 0])
+
+    arrays = {
+        "feature": np.concatenate(feature).astype(np.int32),
+        "threshold": np.concatenate(threshold).astype(np.float64),
+        "left": np.concatenate(left).astype(np.int32),
+        "right": np.concatenate(right).astype(np.int32),
+        "value": np.concatenate(value).astype(np.float64),
+        "roots": offsets[:-1].astype(np.int32),
+    }
+    meta["max_depth"] = int(max(tree.max_depth for tree in trees))
+    meta["n_outputs"] = int(arrays["value"].shape[1])
+    meta["y_mean"] = None if y_mean is None else np.asarray(y_mean, dtype=np.float64).tolist()
+    meta["y_scale"] = None if y_scale is None else np.asarray(y_scale, dtype=np.float64).tolist()
+    return arrays, meta
+
+
+class CompactEnsemble:
+    """Pure-NumPy predictor over flattened tree arrays."""
+
+    def __init__(self, arrays, meta):
+        for name in ARRAYS:
+            setattr(self, name, arrays[name])
+        self.meta = meta
+        self.bias = np.asarray(meta["bias"], dtype=np.float64)
+        self.y_mean = None if meta["y_mean"] is None else np.asarray(meta["y_mean"])
+        self.y_scale = None if meta["y_scale"] is None else np.asarray(meta["y_scale"])
+
+    @property
+    def n_trees(self):
+        """Number of trees in the ensemble."""
+        return len(self.roots)
+
+    def _leaf_nodes(self, X):
+        """Return the leaf node reached in every tree for every row of a float32 matrix."""
+        nodes = np.broadcast_to(self.roots, (len(X), self.n_trees)).copy()
+
+        # Walk all trees for all rows at once; leaves loop back to themselves
+        for _ in range(self.meta["max_depth"]):
+            x = np.take_along_axis(X, self.feature[nodes], axis=1)
+            nodes = np.where(x <= self.threshold[nodes], self.left[nodes], self.right[nodes])
+
+        return nodes
+
+    def leaf_values(self, X, chunk_size=4096):
+        """Return every tree's leaf value for every row, shape (n_rows, n_trees, n_outputs).
+
+        X must already be scaled; it is compared as float32, like sklearn's trees.
+        """
+        X = np.asarray(X, dtype=np.float32)
+        out = np.empty((len(X), self.n_trees, self.meta["n_outputs"]), dtype=np.float64)
+
+        for start in range(0, len(X), chunk_size):
+            out[start : start + chunk_size] = self.value[self._leaf_nodes(X[start : start + chunk_size])]
+
+        return out
+
+    def combine(self, leaf_values):
+        """Reduce per-tree leaf values to the ensemble prediction."""
+        predictions = self.bias + self.meta["scale"] * leaf_values.sum(axis=1)
+        if self.y_mean is not None:
+            predictions = predictions * self.y_scale + self.y_mean
+        return predictions
+
+    def predict(self, X):
+        """Predict like the source sklearn model: 1-D for one output, 2-D otherwise."""
+        predictions = self.combine(self.leaf_values(X))
+        return predictions[:, 0] if self.meta["n_outputs"] == 1 else predictions
+
+    def predict_with_spread(self, X, chunk_size=4096):
+        """Predict and return the standard deviation of the per-tree predictions.
+
+        Both come from the same traversal. The spread is in target units and
+        only meaningful for bagged forests, whose trees each predict the target.
+        """
+        X = np.asarray(X, dtype=np.float32)
+        n_outputs = self.meta["n_outputs"]
+        predictions = np.empty((len(X), n_outputs), dtype=np.float64)
+        spread = np.empty((len(X), n_outputs), dtype=np.float64)
+
+        for start in range(0, len(X), chunk_size):
+            leaf_values = self.value[self._leaf_nodes(X[start : start + chunk_size])]
+            predictions[start : start + chunk_size] = self.combine(leaf_values)
+            spread[start : start + chunk_size] = leaf_values.std(axis=1)
+
+        if self.y_scale is not None:
+            spread *= self.y_scale
+        if n_outputs == 1:
+            return predictions[:, 0], spread[:, 0]
+        return predictions, spread
+
+    def save(self, export_dir, name):
+        """Write the node arrays as <name>_<array>.npy files."""
+        for array_name in ARRAYS:
+            np.save(os.path.join(export_dir, f"{name}_{array_name}.npy"), getattr(self, array_name))
+
+    @classmethod
+    def load(cls, export_dir, name, meta, mmap=True):
+        """Open the node arrays saved by save(), memory-mapped by default."""
+        mmap_mode = "r" if mmap else None
+        arrays = {
+            array_name: np.load(os.path.join(export_dir, f"{name}_{array_name}.npy"), mmap_mode=mmap_mode)
+            for array_name in ARRAYS
+        }
+        return cls(arrays, meta)
+
+
+class CompactScaler:
+    """Stand-in for a fitted StandardScaler: only mean_ and scale_ are used for prediction."""
+
+    def __init__(self, mean, scale):
+        self.mean_ = np.asarray(mean, dtype=np.float64)
+        self.scale_ = np.asarray(scale, dtype=np.float64)
+
+
+class CompactLabelEncoder:
+    """Stand-in for a fitted LabelEncoder: only classes_ is used for prediction."""
+
+    def __init__(self, classes):
+        self.classes_ = np.asarray(classes)
+
+
+def export_models(
+    export_dir,
+    models,
+    scaler,
+    encoders,
+    feature_columns,
+    multi_output_targets=None,
+    interval_models=None,
+    target_scales=None,
+):
+    """Export fitted models and preprocessing to export_dir.
+
+    models maps target -> fitted sklearn model or CompactEnsemble; targets
+    sharing one model object (the multi-output engine) are exported once.
+    interval_models maps target -> (lower, upper) quantile models.
+    """
+    os.makedirs(export_dir, exist_ok=True)
+
+    manifest = {
+        "feature_columns": list(feature_columns),
+        "scaler": {"mean": scaler.mean_.tolist(), "scale": scaler.scale_.tolist()},
+        "encoders": {col: [str(label) for label in encoder.classes_] for col, encoder in encoders.items()},
+        "multi_output_targets": list(multi_output_targets or []),
+        "target_scales": {target: float(scale) for target, scale in (target_scales or {}).items()},
+        "models": {},
+        "targets": {},
+        "intervals": {},
+    }
+
+    def export(model, name):
+        if not isinstance(model, CompactEnsemble):
+            model = CompactEnsemble(*flatten_ensemble(model))
+        model.save(export_dir, name)
+        manifest["models"][name] = model.meta
+
+    exported = {}  # id(model) -> exported name
+    for target, model in models.items():
+        if id(model) not in exported:
+            name = "multi_output" if multi_output_targets else target
+            export(model, name)
+            exported[id(model)] = name
+        manifest["targets"][target] = exported[id(model)]
+
+    for target, (lower, upper) in (interval_models or {}).items():
+        export(lower, f"{target}_lower")
+        export(upper, f"{target}_upper")
+        manifest["intervals"][target] = [f"{target}_lower", f"{target}_upper"]
+
+    with open(os.path.join(export_dir, MANIFEST_FILE), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    return manifest
+
+
+def load_models(export_dir, mmap=True):
+    """Load an export_models() directory.
+
+    Returns a dict with models, scaler, encoders, feature_columns,
+    multi_output_targets, interval_models and target_scales, in the same
+    shapes WeldParameterPredictor uses for sklearn models.
+    """
+    with open(os.path.join(export_dir, MANIFEST_FILE)) as f:
+        manifest = json.load(f)
+
+    ensembles = {
+        name: CompactEnsemble.load(export_dir, name, meta, mmap=mmap) for name, meta in manifest["models"].items()
+    }
+
+    return {
+        "models": {target: ensembles[name] for target, name in manifest["targets"].items()},
+        "scaler": CompactScaler(manifest["scaler"]["mean"], manifest["scaler"]["scale"]),
+        "encoders": {col: CompactLabelEncoder(classes) for col, classes in manifest["encoders"].items()},
+        "feature_columns": manifest["feature_columns"],
+        "multi_output_targets": manifest["multi_output_targets"],
+        "interval_models": {
+            target: (ensembles[lower], ensembles[upper])
+            for target, (lower, upper) in manifest.get("intervals", {}).items()
+        },
+        "target_scales": manifest.get("target_scales", {}),
+    }
@@ -1,49 +1,170 @@
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
+from sklearn.base import clone
+from sklearn.compose import TransformedTargetRegressor
+from sklearn.ensemble import ExtraTreesRegressor, GradientBoostingRegressor, RandomForestRegressor
 from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.model_selection import train_test_split, cross_val_score
+from sklearn.model_selection import KFold, train_test_split
 from sklearn.metrics import mean_squared_error, r2_score
+from scipy.stats import norm
+from contextlib import contextmanager
+from joblib import Parallel, delayed, effective_n_jobs
 import joblib
 import os
+import shutil
 import sys
+import time
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from config import (
+    COMPACT_MODEL_SUBDIR,
+    CONFIDENCE_QUANTILES,
+    CV_FOLDS,
+    ENCODER_FILES,
+    INCREMENTAL_BOOSTING_STAGES,
+    INCREMENTAL_DRIFT_RMSE_RATIO,
+    INCREMENTAL_MAX_NEW_FRACTION,
+    INCREMENTAL_MAX_TREE_GROWTH,
+    INCREMENTAL_MIN_ROWS,
+    INTERVAL_MODEL_FILE,
+    MIN_TRAINING_SAMPLES,
+    MODEL_DIR,
+    MODEL_ENGINE,
+    MODEL_FILES,
+    MULTI_OUTPUT_MODEL_FILE,
+    PREDICTION_GRID_FILE,
+    PREDICTION_GRID_THICKNESSES,
+    PREPROCESSING_FILE,
+    RANDOM_STATE,
+    SCALER_FILES,
+    TEST_SIZE,
+    TRAINING_DATA_SOURCE,
+    TRAINING_WORKERS,
+    USE_COMPACT_MODELS,
+    USE_MODEL_REGISTRY,
+    USE_PREDICTION_GRID,
+)
+from models import compact_forest
+from models.model_registry import ModelRegistry
+from models.prediction_grid import PredictionGrid
+
 try:
+    from database import columnar_store
     from database.db_manager import DatabaseManager
 except ImportError:
     # Fallback for when running as script
+    columnar_store = None
+
     class DatabaseManager:
-        def get_training_data(self):
+        def get_training_data(self, min_id=None):
             return pd.DataFrame()
 
+        def get_reference_data(self):
+            tables = ["materials", "joint_types", "positions", "processes", "shielding_gases"]
+            return {name: [] for name in tables + ["base_materials", "filler_materials"]}
+
+
+# Width of the CONFIDENCE_QUANTILES interval in standard deviations of a normal distribution
+QUANTILE_INTERVAL_STDS = norm.ppf(CONFIDENCE_QUANTILES[1]) - norm.ppf(CONFIDENCE_QUANTILES[0])
+
+# Up to this many rows, flattened tree arrays beat sklearn's per-call overhead
+COMPACT_PREDICT_MAX_ROWS = 256
+
+# Timed stages of train_models, in the order they run
+TRAINING_STAGES = [
+    "load data",
+    "prepare features",
+    "split and scale",
+    "cross-validation",
+    "fit best models",
+    "prediction grid",
+    "save models",
+]
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where unsupported (Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _score_fold(model, X, y, train_rows, test_rows):
+    """Fit a model on one cross-validation fold and return its R2 on the held-out rows."""
+    model.fit(X[train_rows], y[train_rows])
+    return r2_score(y[test_rows], model.predict(X[test_rows]))
+
+
+def _fit_model(model, X, y, rows):
+    """Fit a model on the given rows in a worker process and hand it back."""
+    return model.fit(X[rows], y[rows])
+
+
+def _moments(y):
+    """[count, mean, variance] of the non-missing values of y."""
+    y = y[~np.isnan(y)]
+    return [int(len(y)), float(y.mean()), float(y.var())] if len(y) else [0, 0.0, 0.0]
+
+
+def _combine_moments(a, b):
+    """[count, mean, variance] of two sets of values, from the moments of each."""
+    count = a[0] + b[0]
+    if not count:
+        return [0, 0.0, 0.0]
+    delta = b[1] - a[1]
+    mean = a[1] + delta * b[0] / count
+    variance = (a[2] * a[0] + b[2] * b[0] + delta * delta * a[0] * b[0] / count) / count
+    return [count, mean, variance]
+
 
 class WeldParameterPredictor:
     """Machine learning model for predicting optimal weld parameters."""
 
-    def __init__(self):
+    def __init__(self, engine=None):
+        self.engine = engine or MODEL_ENGINE  # "per_target" or "multi_output"
         self.models = {}
         self.scalers = {}
         self.encoders = {}
         self.feature_columns = []
         self.db_manager = DatabaseManager()
+        self._encoder_maps = {}  # col -> (encoder, {label: code}) for batch encoding
+        self.prediction_grid = None
+        self.training_times = {}
+        self.multi_output_targets = []  # Column order of a multi-output model's predictions
+        self.interval_models = {}  # target -> (lower, upper) quantile models for gradient boosting
+        self.target_scales = {}  # target -> training std, the unit of the confidence spread
+        self._tree_arrays = {}  # id(model) -> (model, CompactEnsemble), see _compact()
+        self._progress = None  # Optional callable(stage) for the training run in progress
+        self.registry = ModelRegistry()
+        self.model_info = {}  # Version, directory and load time of the models in use
+        self.training_state = {}  # Rows, high-water mark and test RMSE, for update_models()
+
+    def load_training_data(self, source=None):
+        """Read the training data from the database or from its columnar export."""
+        source = source or TRAINING_DATA_SOURCE
+        if source == "columnar":
+            return columnar_store.read_training_data()
+        if source != "sqlite":
+            raise ValueError(f"Unknown training data source: {source}")
+        return self.db_manager.get_training_data()
 
     def prepare_features(self, df):
-        """Prepare features for training."""
-        # Create a copy to avoid modifying original data
-        df_processed = df.copy()
+        """Prepare features for training.
 
+        Builds the feature frame column by column rather than copying df, so
+        the (possibly large) training frame is never duplicated.
+        """
         # Encode categorical variables
         categorical_columns = ["process", "position", "joint_type"]
 
-        for col in categorical_columns:
-            if col not in self.encoders:
-                self.encoders[col] = LabelEncoder()
-                df_processed[f"{col}_encoded"] = self.encoders[col].fit_transform(df_processed[col].fillna("Unknown"))
-            else:
-                df_processed[f"{col}_encoded"] = self.encoders[col].transform(df_processed[col].fillna("Unknown"))
+        encoded = {f"{col}_encoded": self._encode_training_column(col, df[col]) for col in categorical_columns}
 
         # Select features for model
         feature_columns = [
@@ -59,167 +180,879 @@ class WeldParameterPredictor:
             "joint_type_encoded",
         ]
 
+        features = pd.DataFrame(
+            {column: encoded[column] if column in encoded else df[column] for column in feature_columns}, index=df.index
+        )
+
         # Remove rows with missing critical features
-        df_processed = df_processed.dropna(subset=feature_columns)
+        features = features.dropna()
 
         self.feature_columns = feature_columns
-        return df_processed[feature_columns]
+        return features
 
-    def train_models(self):
-        """Train the prediction models."""
-        print("Loading training data...")
-        df = self.db_manager.get_training_data()
+    def _encode_training_column(self, col, values):
+        """Label-encode a training column, fitting the column's encoder on first use.
+
+        Categorical columns (from the compact training loader) are encoded
+        through their integer codes, so no per-row label lookups are needed.
+        Missing values encode as "Unknown"; labels the fitted encoder has not
+        seen raise ValueError, like LabelEncoder.transform.
+        """
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            codes = values.cat.codes.to_numpy()
+            labels = np.asarray(values.cat.categories, dtype=object)
+        else:
+            codes, labels = pd.factorize(values)
+            labels = np.asarray(labels, dtype=object)
+
+        labels = np.append(labels, "Unknown")
+        codes = np.where(codes < 0, len(labels) - 1, codes)
+        present = np.unique(codes)
+
+        if col not in self.encoders:
+            self.encoders[col] = LabelEncoder().fit(labels[present])
+
+        label_codes = np.zeros(len(labels), dtype=np.int16)
+        label_codes[present] = self.encoders[col].transform(labels[present])
+        return label_codes[codes]
+
+    def train_models(self, df=None, save=True, progress=None, source=None):
+        """Train the prediction models.
+
+        Reads the training data from source ("sqlite" or "columnar", default
+        TRAINING_DATA_SOURCE) unless a DataFrame is given.
+        Cross-validation folds for every target and candidate model, and the
+        final fits, run in parallel across TRAINING_WORKERS processes.
+        progress, if given, is called with each stage name as the stage
+        starts; an exception raised from it aborts the run.
+        """
+        self.training_times = {}
+        self._progress = progress
+        total_start = time.perf_counter()
+        rss_before = peak_rss_mb()
+
+        if df is None:
+            print("Loading training data...")
+            with self._timed_stage("load data"):
+                df = self.load_training_data(source)
 
         if df.empty:
             print("No training data available. Please populate the database first.")
             return
 
         print(f"Loaded {len(df)} training samples")
+        if rss_before is not None:
+            print(f"  Peak RSS: {rss_before:.0f} MB before loading, {peak_rss_mb():.0f} MB after")
 
-        # Prepare features
-        X = self.prepare_features(df)
+        # Prepare features, refitting the encoders on this data
+        with self._timed_stage("prepare features"):
+            self.encoders = {}
+            X = self.prepare_features(df)
 
         # Define target variables to predict
         targets = ["voltage", "amperage", "wire_feed_speed", "travel_speed"]
 
-        for target in targets:
-            if target in df.columns:
-                y = df[target].dropna()
-                X_target = X.loc[y.index]
+        # Split and scale once; every target trains on the same scaled matrix
+        with self._timed_stage("split and scale"):
+            X_all = X.to_numpy(dtype=np.float32)
+            train_rows, test_rows = train_test_split(
+                np.arange(len(X_all)), test_size=TEST_SIZE, random_state=RANDOM_STATE
+            )
+
+            scaler = StandardScaler()
+            scaler.fit(X_all[train_rows])
+            X_scaled = scaler.transform(X_all).astype(np.float32)
+            del X_all
+
+            target_values = {
+                target: df.loc[X.index, target].to_numpy(dtype=np.float64) for target in targets if target in df.columns
+            }
 
-                if len(y) < 10:
-                    print(f"Not enough data for {target} (need at least 10 samples, have {len(y)})")
-                    continue
+        parallel = Parallel(n_jobs=TRAINING_WORKERS)
 
-                print(f"\nTraining model for {target}...")
+        self.models = {}
+        self.scalers = {}
+        self.multi_output_targets = []
+        self.interval_models = {}
+        target_moments = {target: _moments(y[train_rows]) for target, y in target_values.items()}
+        self.target_scales = {target: float(np.sqrt(moments[2])) for target, moments in target_moments.items()}
+        self.training_state = {
+            "rows": len(train_rows),  # Rows the models were fitted on
+            "high_water_mark": self._high_water_mark(df),
+            "test_rmse": {},
+            "test_rows": {},  # target -> rows behind test_rmse
+            "target_moments": target_moments,  # target -> [count, mean, variance] of the training values
+        }
 
-                # Split data
-                X_train, X_test, y_train, y_test = train_test_split(X_target, y, test_size=0.2, random_state=42)
+        if self.engine == "multi_output":
+            self._train_multi_output(X_scaled, train_rows, test_rows, target_values, parallel)
+        else:
+            self._train_per_target(X_scaled, train_rows, test_rows, target_values, parallel)
+        self.training_state["trees"] = self._tree_counts()  # Ensemble sizes before any incremental update
 
-                # Scale features
-                scaler = StandardScaler()
-                X_train_scaled = scaler.fit_transform(X_train)
-                X_test_scaled = scaler.transform(X_test)
+        # All targets share the one scaler
+        for target in self.models:
+            self.scalers[target] = scaler
 
-                # Try different models
-                models_to_try = {
-                    "random_forest": RandomForestRegressor(n_estimators=100, random_state=42),
-                    "gradient_boosting": GradientBoostingRegressor(n_estimators=100, random_state=42),
-                }
+        # Precompute predictions for the discrete input space
+        self.prediction_grid = None
+        if USE_PREDICTION_GRID and self.models:
+            with self._timed_stage("prediction grid"):
+                self.build_prediction_grid()
 
-                best_score = -np.inf
-                best_model = None
+        # Save models
+        if save:
+            with self._timed_stage("save models"):
+                self._save_trained(mode="full")
+            print("\nModels trained and saved successfully!")
 
-                for model_name, model in models_to_try.items():
-                    # Cross-validation
-                    cv_scores = cross_val_score(model, X_train_scaled, y_train, cv=5, scoring="r2")
-                    avg_score = np.mean(cv_scores)
+        self.training_times["total"] = time.perf_counter() - total_start
+        print(f"Total training time: {self.training_times['total']:.2f}s")
+        if rss_before is not None:
+            print(f"Peak RSS after training: {peak_rss_mb():.0f} MB")
 
-                    print(f"  {model_name} CV R2: {avg_score:.3f} (+/- {np.std(cv_scores) * 2:.3f})")
+    def update_models(self, save=True, progress=None):
+        """Update the trained models with the rows added since they were trained.
 
-                    if avg_score > best_score:
-                        best_score = avg_score
-                        best_model = model
+        Only rows past the saved high-water mark are read, and TEST_SIZE of
+        them are held out to keep the test RMSE current. Forests get new
+        warm-started trees fitted on the rest, in proportion to the new rows'
+        share of the data, and gradient boosting gets
+        INCREMENTAL_BOOSTING_STAGES more stages whose correction is scaled by
+        that share. The target scales behind confidence are updated with the
+        new values. A full train_models() runs
+        instead when there is no incremental state, when the new rows bring
+        unseen categories, exceed INCREMENTAL_MAX_NEW_FRACTION of the
+        training rows, or when the models' error on them has drifted, and
+        once an ensemble has grown past INCREMENTAL_MAX_TREE_GROWTH times its
+        size at the last full refit.
+        Returns "full", "incremental" or "skipped".
+        """
+        high_water_mark = self.training_state.get("high_water_mark")
+        has_state = high_water_mark is not None and {"target_moments", "trees"} <= self.training_state.keys()
+        if not self.models or not has_state or not self._can_warm_start():
+            print("No incremental training state, running a full refit")
+            self.train_models(save=save, progress=progress)
+            return "full"
 
-                # Train best model on full training set
-                best_model.fit(X_train_scaled, y_train)
+        self.training_times = {}
+        self._progress = progress
+        total_start = time.perf_counter()
 
-                # Test performance
-                y_pred = best_model.predict(X_test_scaled)
-                test_r2 = r2_score(y_test, y_pred)
-                test_rmse = np.sqrt(mean_squared_error(y_test, y_pred))
+        with self._timed_stage("load data"):
+            new_df = self.db_manager.get_training_data(min_id=high_water_mark["id"])
 
-                print(f"  Best model test R2: {test_r2:.3f}")
-                print(f"  Best model test RMSE: {test_rmse:.3f}")
+        if len(new_df) < INCREMENTAL_MIN_ROWS:
+            print(f"{len(new_df)} new training samples, waiting for at least {INCREMENTAL_MIN_ROWS}")
+            return "skipped"
 
-                # Store model and scaler
-                self.models[target] = best_model
-                self.scalers[target] = scaler
+        print(f"Loaded {len(new_df)} new training samples since id {high_water_mark['id']}")
 
-        # Save models
-        self.save_models()
-        print("\nModels trained and saved successfully!")
+        reason = self._full_refit_reason(new_df)
+        if reason:
+            print(f"Running a full refit: {reason}")
+            self.train_models(save=save, progress=progress)
+            return "full"
 
-    def predict_parameters(self, input_data):
-        """Predict welding parameters for given input."""
-        # Prepare input features
-        input_df = pd.DataFrame([input_data])
+        with self._timed_stage("prepare features"):
+            X, target_values = self._feature_rows(new_df)
+            scaler = self.scalers[next(iter(self.models))]
+            X_new = scaler.transform(X.astype(np.float32)).astype(np.float32)
+            train_rows, test_rows = train_test_split(
+                np.arange(len(X_new)), test_size=TEST_SIZE, random_state=RANDOM_STATE
+            )
+
+        with self._timed_stage("fit best models"):
+            self._warm_start_models(X_new[train_rows], {target: y[train_rows] for target, y in target_values.items()})
+        self._tree_arrays = {}  # The ensembles grew, so their flattened arrays are stale
+
+        self._update_training_state(X[test_rows], target_values, train_rows, test_rows)
+        self.training_state["rows"] += len(train_rows)
+        self.training_state["high_water_mark"] = self._high_water_mark(new_df)
+
+        # The predictions changed, so the grid has to be rebuilt
+        self.prediction_grid = None
+        if USE_PREDICTION_GRID:
+            with self._timed_stage("prediction grid"):
+                self.build_prediction_grid()
+
+        if save:
+            with self._timed_stage("save models"):
+                self._save_trained(mode="incremental")
+
+        self.training_times["total"] = time.perf_counter() - total_start
+        print(f"Incremental update with {len(X_new)} samples took {self.training_times['total']:.2f}s")
+        return "incremental"
 
-        # Handle categorical encoding
+    def _high_water_mark(self, df):
+        """Largest weld_parameters id and created_date in a training frame, or None without ids."""
+        if "id" not in df.columns or df["id"].isna().all():
+            return None
+        return {"id": int(df["id"].max()), "created_date": str(df["created_date"].max())}
+
+    def _can_warm_start(self):
+        """True if every model is a fitted sklearn tree ensemble that can grow more trees."""
+        ensembles = (RandomForestRegressor, ExtraTreesRegressor, GradientBoostingRegressor)
+        return all(isinstance(getattr(model, "regressor_", model), ensembles) for model in self.models.values())
+
+    def _full_refit_reason(self, new_df):
+        """Why the new rows need a full refit rather than an incremental update, or None."""
         for col, encoder in self.encoders.items():
-            if col in input_df.columns:
-                try:
-                    input_df[f"{col}_encoded"] = encoder.transform([input_df[col].iloc[0]])
-                except ValueError:
-                    # Handle unknown categories
-                    input_df[f"{col}_encoded"] = 0
+            unseen = set(new_df[col].astype(object).fillna("Unknown")) - set(encoder.classes_)
+            if unseen:
+                return f"new {col} values {sorted(unseen)}"
+
+        if len(new_df) > INCREMENTAL_MAX_NEW_FRACTION * self.training_state["rows"]:
+            return f"{len(new_df)} new rows is over {INCREMENTAL_MAX_NEW_FRACTION:.0%} of {self.training_state['rows']}"
+
+        for target, trees in self._tree_counts().items():
+            trees_at_refit = self.training_state["trees"].get(target)
+            if trees_at_refit and trees >= INCREMENTAL_MAX_TREE_GROWTH * trees_at_refit:
+                return f"{target} model has grown from {trees_at_refit} to {trees} trees"
+
+        # Drift: the current models predict the new rows much worse than their test set
+        X, target_values = self._feature_rows(new_df)
+        predictions, _ = self.predict_matrix(X)
+        for target, y in target_values.items():
+            test_rmse = self.training_state["test_rmse"].get(target)
+            has_target = ~np.isnan(y)
+            if target not in predictions or not test_rmse or not has_target.any():
+                continue
+
+            rmse = np.sqrt(mean_squared_error(y[has_target], predictions[target][has_target]))
+            if rmse > INCREMENTAL_DRIFT_RMSE_RATIO * test_rmse:
+                return f"{target} RMSE on new rows {rmse:.3f} vs {test_rmse:.3f} at training"
+
+        return None
+
+    def _tree_counts(self):
+        """Number of trees (or boosting stages) of each target's model."""
+        return {
+            target: getattr(getattr(model, "regressor_", model), "n_estimators", None)
+            for target, model in self.models.items()
+        }
+
+    def _feature_rows(self, df):
+        """Unscaled feature matrix and per-target values of a training frame, with the fitted encoders."""
+        X = self.prepare_features(df)
+        target_values = {
+            target: df.loc[X.index, target].to_numpy(dtype=np.float64) for target in self.models if target in df.columns
+        }
+        return X.to_numpy(dtype=np.float64), target_values
+
+    def _update_training_state(self, X_test, target_values, train_rows, test_rows):
+        """Fold the new rows into the target scales and the test RMSE used by confidence and drift checks."""
+        predictions, _ = self.predict_matrix(X_test) if len(X_test) else ({}, {})
 
-        # Select features
-        X = input_df[self.feature_columns].fillna(0)
+        for target, y in target_values.items():
+            moments = _combine_moments(self.training_state["target_moments"][target], _moments(y[train_rows]))
+            self.training_state["target_moments"][target] = moments
+            self.target_scales[target] = float(np.sqrt(moments[2]))
 
-        predictions = {}
-        confidence_scores = {}
+            old_rmse = self.training_state["test_rmse"].get(target)
+            y_test = y[test_rows]
+            has_target = ~np.isnan(y_test)
+            if old_rmse is None or target not in predictions or not has_target.any():
+                continue
+
+            # Pool the squared errors of the old and new test rows
+            old_rows = self.training_state["test_rows"].get(target, 0)
+            squared_error = np.sum((y_test[has_target] - predictions[target][has_target]) ** 2)
+            rows = old_rows + int(has_target.sum())
+            self.training_state["test_rmse"][target] = float(np.sqrt((old_rmse**2 * old_rows + squared_error) / rows))
+            self.training_state["test_rows"][target] = rows
+
+    def _warm_start_models(self, X_new, target_values):
+        """Grow every model (and its quantile models) with trees fitted on the new rows."""
+        rows_before = self.training_state["rows"]
+
+        if self.multi_output_targets:
+            Y = np.column_stack([target_values[target] for target in self.multi_output_targets])
+            has_all = ~np.isnan(Y).any(axis=1)
+            if has_all.any():
+                model = self.models[self.multi_output_targets[0]]
+                self._warm_start(model, X_new[has_all], Y[has_all], rows_before)
+            return
+
+        for target, model in self.models.items():
+            y = target_values.get(target)
+            if y is None or np.isnan(y).all():
+                continue
+
+            has_target = ~np.isnan(y)
+            for estimator in [model, *self.interval_models.get(target, ())]:
+                self._warm_start(estimator, X_new[has_target], y[has_target], rows_before)
+
+    def _warm_start(self, model, X, y, rows_before):
+        """Add trees fitted on X, y to a fitted ensemble, keeping its existing trees."""
+        regressor = model
+        if hasattr(model, "regressor_"):
+            # Multi-output models fit standardised targets
+            regressor = model.regressor_
+            y = model.transformer_.transform(y)
+
+        if isinstance(regressor, GradientBoostingRegressor):
+            added = INCREMENTAL_BOOSTING_STAGES
+        else:
+            # New trees get the new rows' share of the forest's vote
+            added = max(1, round(regressor.n_estimators * len(X) / rows_before))
+
+        regressor.set_params(warm_start=True, n_estimators=regressor.n_estimators + added)
+        regressor.fit(X, y)
+        regressor.set_params(warm_start=False)
+
+        if isinstance(regressor, GradientBoostingRegressor):
+            # The new stages only saw the new rows; scale their correction by the rows' share of
+            # the data, as the forests' new trees get, so a few rows can't pull the ensemble over
+            share = len(X) / (rows_before + len(X))
+            for tree in regressor.estimators_[-added:, 0]:
+                tree.tree_.value[:] *= share
+
+    def _save_trained(self, mode):
+        """Save freshly trained models, as a new registry version when the registry is enabled."""
+        if not USE_MODEL_REGISTRY:
+            self.save_models()
+            return
+
+        version = self.registry.publish(self, samples=self.training_state["rows"], mode=mode)["version"]
+        self.model_info = {
+            "version": version,
+            "model_dir": self.registry.version_dir(version),
+            "loaded_at": time.time(),
+            "load_time_ms": None,  # Trained in this process, not loaded
+        }
+
+    def _train_per_target(self, X_scaled, train_rows, test_rows, target_values, parallel):
+        """Pick and fit an independent regressor for each target."""
+        # Per-target row indices into X_scaled, skipping rows where the target is missing
+        target_rows = {}
+        for target, y in target_values.items():
+            has_target = ~np.isnan(y)
+
+            if has_target.sum() < MIN_TRAINING_SAMPLES:
+                print(
+                    f"Not enough data for {target} "
+                    f"(need at least {MIN_TRAINING_SAMPLES} samples, have {has_target.sum()})"
+                )
+                continue
+
+            target_rows[target] = (train_rows[has_target[train_rows]], test_rows[has_target[test_rows]], y)
+
+        candidates = self._candidate_models()
+
+        # Cross-validate every (target, model, fold) combination in one parallel pass
+        with self._timed_stage("cross-validation"):
+            jobs = []
+            for target, (train, _, y) in target_rows.items():
+                for model_name, model in candidates.items():
+                    for fold_train, fold_test in KFold(n_splits=CV_FOLDS).split(train):
+                        jobs.append((target, model_name, clone(model), y, train[fold_train], train[fold_test]))
+
+            fold_scores = self._run_batches(
+                parallel, [delayed(_score_fold)(job[2], X_scaled, *job[3:]) for job in jobs], "cross-validation"
+            )
+
+        cv_scores = {}
+        for job, score in zip(jobs, fold_scores):
+            cv_scores.setdefault((job[0], job[1]), []).append(score)
+
+        # Pick the best candidate for each target
+        best_models = {}
+        for target in target_rows:
+            print(f"\nTraining model for {target}...")
+            best_models[target] = self._select_candidate(candidates, cv_scores, target)
+
+        # Gradient boosting has no per-tree spread, so bracket it with quantile models
+        fit_jobs = [(target, None, model) for target, model in best_models.items()]
+        for target, model in best_models.items():
+            if isinstance(model, GradientBoostingRegressor):
+                for alpha in CONFIDENCE_QUANTILES:
+                    fit_jobs.append((target, alpha, clone(model).set_params(loss="quantile", alpha=alpha)))
+
+        # Train best models (and quantile models) on their full training sets
+        with self._timed_stage("fit best models"):
+            fitted = parallel(
+                delayed(_fit_model)(model, X_scaled, target_rows[target][2], target_rows[target][0])
+                for target, _, model in fit_jobs
+            )
+
+        quantile_models = {}
+        for (target, alpha, _), model in zip(fit_jobs, fitted):
+            if alpha is not None:
+                quantile_models.setdefault(target, []).append(model)
+        self.interval_models = {target: tuple(models) for target, models in quantile_models.items()}
+
+        for target, model in zip(best_models, fitted):
+            _, test, y = target_rows[target]
+
+            # Test performance
+            y_pred = model.predict(X_scaled[test])
+            test_r2 = r2_score(y[test], y_pred)
+            test_rmse = np.sqrt(mean_squared_error(y[test], y_pred))
+
+            print(f"\n{target} best model ({type(model).__name__}) test R2: {test_r2:.3f}")
+            print(f"{target} best model test RMSE: {test_rmse:.3f}")
+
+            self.training_state["test_rmse"][target] = float(test_rmse)
+            self.training_state["test_rows"][target] = len(test)
+
+            self.models[target] = model
+
+    def _train_multi_output(self, X_scaled, train_rows, test_rows, target_values, parallel):
+        """Pick and fit one regressor that predicts every target in a single pass."""
+        targets = list(target_values)
+        Y = np.column_stack([target_values[target] for target in targets])
+
+        # Only rows with every target present can train a multi-output model
+        has_all = ~np.isnan(Y).any(axis=1)
+        train = train_rows[has_all[train_rows]]
+        test = test_rows[has_all[test_rows]]
+
+        if len(train) + len(test) < MIN_TRAINING_SAMPLES:
+            print(
+                f"Not enough data for the multi-output model "
+                f"(need at least {MIN_TRAINING_SAMPLES} samples, have {len(train) + len(test)})"
+            )
+            return
+
+        candidates = self._multi_output_candidates()
+
+        # Cross-validate every (model, fold) combination in one parallel pass
+        with self._timed_stage("cross-validation"):
+            jobs = []
+            for model_name, model in candidates.items():
+                for fold_train, fold_test in KFold(n_splits=CV_FOLDS).split(train):
+                    jobs.append((model_name, clone(model), train[fold_train], train[fold_test]))
+
+            fold_scores = self._run_batches(
+                parallel, [delayed(_score_fold)(job[1], X_scaled, Y, *job[2:]) for job in jobs], "cross-validation"
+            )
+
+        cv_scores = {}
+        for job, score in zip(jobs, fold_scores):
+            cv_scores.setdefault(("multi_output", job[0]), []).append(score)
+
+        print(f"\nTraining multi-output model for {', '.join(targets)}...")
+        best_model = self._select_candidate(candidates, cv_scores, "multi_output")
+
+        # Train the best model on the full training set
+        with self._timed_stage("fit best models"):
+            model = _fit_model(best_model, X_scaled, Y, train)
+
+        # Test performance, per target
+        Y_pred = model.predict(X_scaled[test])
+        for k, target in enumerate(targets):
+            test_r2 = r2_score(Y[test, k], Y_pred[:, k])
+            test_rmse = np.sqrt(mean_squared_error(Y[test, k], Y_pred[:, k]))
+
+            print(f"\n{target} multi-output test R2: {test_r2:.3f}")
+            print(f"{target} multi-output test RMSE: {test_rmse:.3f}")
+
+            self.training_state["test_rmse"][target] = float(test_rmse)
+            self.training_state["test_rows"][target] = len(test)
+
+            # Every target points at the same model; predict_matrix runs it once
+            self.models[target] = model
+
+        self.multi_output_targets = targets
+
+    def _select_candidate(self, candidates, cv_scores, key):
+        """Log the CV scores for one target and return an unfitted copy of the best candidate."""
+        best_score = -np.inf
+        best_model = None
+
+        for model_name, model in candidates.items():
+            scores = cv_scores[(key, model_name)]
+            avg_score = np.mean(scores)
+
+            print(f"  {model_name} CV R2: {avg_score:.3f} (+/- {np.std(scores) * 2:.3f})")
+
+            if avg_score > best_score:
+                best_score = avg_score
+                best_model = clone(model)
+
+        return best_model
+
+    def _run_batches(self, parallel, tasks, stage):
+        """Run delayed tasks on the worker pool, in batches when a progress callback is set.
+
+        The callback is called with stage again between batches, so it can stop
+        the run (e.g. a cancelled training job) without waiting for the whole stage.
+        """
+        if self._progress is None:
+            return parallel(tasks)
+
+        batch_size = 2 * effective_n_jobs(parallel.n_jobs)
+        results = []
+        for start in range(0, len(tasks), batch_size):
+            if start:
+                self._progress(stage)
+            results.extend(parallel(tasks[start : start + batch_size]))
+        return results
+
+    @contextmanager
+    def _timed_stage(self, stage):
+        """Record and log the wall time of a training stage."""
+        if self._progress is not None:
+            self._progress(stage)
+        start = time.perf_counter()
+        yield
+        self.training_times[stage] = time.perf_counter() - start
+        print(f"  [{stage}] {self.training_times[stage]:.2f}s")
+
+    def _candidate_models(self):
+        """Unfitted candidate models compared by cross-validation, in priority order."""
+        return {
+            "random_forest": RandomForestRegressor(n_estimators=100, random_state=RANDOM_STATE),
+            "gradient_boosting": GradientBoostingRegressor(n_estimators=100, random_state=RANDOM_STATE),
+        }
+
+    def _multi_output_candidates(self):
+        """Unfitted multi-output candidates, in priority order.
+
+        Targets are standardised before fitting so the shared split criterion
+        isn't dominated by the large-valued targets (amperage, wire feed speed).
+        """
+        return {
+            "random_forest": TransformedTargetRegressor(
+                regressor=RandomForestRegressor(n_estimators=100, random_state=RANDOM_STATE),
+                transformer=StandardScaler(),
+            ),
+            "extra_trees": TransformedTargetRegressor(
+                regressor=ExtraTreesRegressor(n_estimators=100, random_state=RANDOM_STATE),
+                transformer=StandardScaler(),
+            ),
+        }
+
+    def predict_parameters(self, input_data):
+        """Predict welding parameters for given input.
+
+        Served from the precomputed prediction grid when the input is on it,
+        otherwise by live inference.
+        """
+        if self.prediction_grid is not None:
+            result = self.prediction_grid.lookup(input_data)
+            if result is not None:
+                return result
+
+        return self.predict_batch([input_data])[0]
+
+    def build_prediction_grid(self, thicknesses=PREDICTION_GRID_THICKNESSES):
+        """Precompute predictions for every material, process, position, joint and thickness bucket."""
+        try:
+            materials = self.db_manager.get_reference_data()["materials"]
+        except Exception as e:
+            print(f"Skipping prediction grid, could not load materials: {e}")
+            return None
+
+        base_materials = [m for m in materials if m["type"] == "base"]
+        filler_materials = [m for m in materials if m["type"] == "filler"]
+        if not base_materials or not filler_materials:
+            return None
+
+        self.prediction_grid = PredictionGrid.build(self, base_materials, filler_materials, thicknesses)
+        print(f"Built prediction grid with {self.prediction_grid.predictions[..., 0].size} entries")
+        return self.prediction_grid
+
+    def _encode_categorical(self, col, values):
+        """Encode a column of categorical values, mapping unknown categories to 0."""
+        encoder = self.encoders[col]
+        mapping = self._encoder_maps.get(col)
+        if mapping is None or mapping[0] is not encoder:
+            mapping = (encoder, {label: code for code, label in enumerate(encoder.classes_)})
+            self._encoder_maps[col] = mapping
+        return np.fromiter((mapping[1].get(value, 0) for value in values), dtype=np.float64, count=len(values))
+
+    def build_feature_matrix(self, inputs):
+        """Build the unscaled feature matrix for a list of input dicts."""
+        X = np.empty((len(inputs), len(self.feature_columns)), dtype=np.float64)
+
+        for j, column in enumerate(self.feature_columns):
+            source = column[: -len("_encoded")] if column.endswith("_encoded") else None
+            if source in self.encoders:
+                X[:, j] = self._encode_categorical(source, [row.get(source) for row in inputs])
+            else:
+                X[:, j] = np.array([row.get(column) for row in inputs], dtype=np.float64)
+
+        # Missing values default to 0, matching the single-row DataFrame path
+        return np.nan_to_num(X, nan=0.0)
+
+    def predict_batch(self, inputs):
+        """Predict welding parameters for many inputs in one vectorized pass per target.
+
+        Returns a list of (predictions, confidence_scores) tuples, one per input.
+        """
+        if not inputs:
+            return []
+
+        X = self.build_feature_matrix(inputs)
+        target_predictions, target_confidence = self.predict_matrix(X)
+
+        results = []
+        for i in range(len(inputs)):
+            predictions = {target: float(values[i]) for target, values in target_predictions.items()}
+            confidence = {target: float(values[i]) for target, values in target_confidence.items()}
+            results.append((predictions, confidence))
+
+        return results
+
+    def predict_matrix(self, X):
+        """Run every target model over an unscaled feature matrix.
+
+        Returns two dicts mapping target -> array of predictions / confidence scores.
+        """
+        target_predictions = {}
+        target_confidence = {}
+
+        scaled = {}  # id(scaler) -> scaled matrix, so a shared scaler is applied once
+        outputs = {}  # id(model) -> predictions, so a multi-output model runs once
 
         for target, model in self.models.items():
             if target in self.scalers:
-                # Scale features
-                X_scaled = self.scalers[target].transform(X)
+                scaler = self.scalers[target]
+
+                # Scale features (trees split on float32, so match the training dtype)
+                if id(scaler) not in scaled:
+                    scaled[id(scaler)] = ((X - scaler.mean_) / scaler.scale_).astype(np.float32)
+                X_scaled = scaled[id(scaler)]
+
+                # Make predictions, with the per-tree spread where the model has one
+                if id(model) not in outputs:
+                    outputs[id(model)] = self._predict_with_spread(model, X_scaled)
+                predictions, spread = outputs[id(model)]
 
-                # Make prediction
-                pred = model.predict(X_scaled)[0]
-                predictions[target] = pred
+                if predictions.ndim == 2:
+                    k = self.multi_output_targets.index(target)
+                    predictions = predictions[:, k]
+                    spread = None if spread is None else spread[:, k]
+                target_predictions[target] = predictions
 
-                # Calculate confidence (simplified)
-                if hasattr(model, "predict_proba"):
-                    confidence_scores[target] = 0.8  # Placeholder
+                # Boosted models: the quantile interval, as an equivalent standard deviation
+                if spread is None and target in self.interval_models:
+                    lower, upper = self.interval_models[target]
+                    interval = self._quantile_predict(upper, X_scaled) - self._quantile_predict(lower, X_scaled)
+                    spread = np.abs(interval) / QUANTILE_INTERVAL_STDS
+
+                if spread is not None and self.target_scales.get(target):
+                    target_confidence[target] = 1 / (1 + spread / self.target_scales[target])
                 else:
-                    confidence_scores[target] = 0.7  # Placeholder
+                    # Models saved before confidence was tracked
+                    target_confidence[target] = np.full(len(X), 0.7)
+
+        return target_predictions, target_confidence
+
+    def _predict_with_spread(self, model, X_scaled):
+        """Predict with one model; return (predictions, per-tree spread or None).
+
+        Bagged forests are walked through their flattened node arrays, so the
+        prediction and the spread of all per-tree predictions come from one
+        vectorized traversal instead of a Python loop over the trees.
+        """
+        if isinstance(model, compact_forest.CompactEnsemble):
+            is_forest = model.meta["combine"] == "mean"
+        else:
+            is_forest = isinstance(getattr(model, "regressor_", model), (RandomForestRegressor, ExtraTreesRegressor))
+
+        if not is_forest:
+            return model.predict(X_scaled), None
+        return self._compact(model).predict_with_spread(X_scaled)
 
-        return predictions, confidence_scores
+    def _quantile_predict(self, model, X_scaled):
+        """Predict with a quantile model, through its flattened arrays for small inputs."""
+        if len(X_scaled) <= COMPACT_PREDICT_MAX_ROWS:
+            model = self._compact(model)
+        return model.predict(X_scaled)
 
-    def save_models(self):
+    def _compact(self, model):
+        """Return a cached CompactEnsemble view of a fitted tree ensemble."""
+        if isinstance(model, compact_forest.CompactEnsemble):
+            return model
+
+        cached = self._tree_arrays.get(id(model))
+        if cached is None or cached[0] is not model:
+            cached = self._tree_arrays[id(model)] = (
+                model,
+                compact_forest.CompactEnsemble(*compact_forest.flatten_ensemble(model)),
+            )
+        return cached[1]
+
+    def save_models(self, model_dir=MODEL_DIR):
         """Save trained models to disk."""
-        model_dir = os.path.dirname(__file__)
 
-        # Save models
-        for target, model in self.models.items():
-            joblib.dump(model, os.path.join(model_dir, f"{target}_model.joblib"))
+        # Save models: one multi-output file, or one file per target
+        multi_output_path = os.path.join(model_dir, MULTI_OUTPUT_MODEL_FILE)
+        if self.multi_output_targets:
+            model = self.models[self.multi_output_targets[0]]
+            joblib.dump({"model": model, "targets": self.multi_output_targets}, multi_output_path)
+            stale_files = list(MODEL_FILES.values())
+        else:
+            for target, model in self.models.items():
+                joblib.dump(model, os.path.join(model_dir, MODEL_FILES[target]))
+            stale_files = [MULTI_OUTPUT_MODEL_FILE]
 
-        # Save scalers
-        for target, scaler in self.scalers.items():
-            joblib.dump(scaler, os.path.join(model_dir, f"{target}_scaler.joblib"))
+        for filename in stale_files:
+            stale_path = os.path.join(model_dir, filename)
+            if os.path.exists(stale_path):
+                os.remove(stale_path)
 
-        # Save encoders
-        for col, encoder in self.encoders.items():
-            joblib.dump(encoder, os.path.join(model_dir, f"{col}_encoder.joblib"))
+        # Save the quantile models behind gradient boosting confidence
+        interval_path = os.path.join(model_dir, INTERVAL_MODEL_FILE)
+        if self.interval_models:
+            joblib.dump(self.interval_models, interval_path)
+        elif os.path.exists(interval_path):
+            os.remove(interval_path)
 
-        # Save feature columns
-        joblib.dump(self.feature_columns, os.path.join(model_dir, "feature_columns.joblib"))
+        # Save the shared scaler, encoders and feature columns as one artifact
+        preprocessing = {
+            "scaler": next(iter(self.scalers.values()), None),
+            "encoders": self.encoders,
+            "feature_columns": self.feature_columns,
+            "target_scales": self.target_scales,
+            "training_state": self.training_state,
+        }
+        joblib.dump(preprocessing, os.path.join(model_dir, PREPROCESSING_FILE))
 
-    def load_models(self):
-        """Load trained models from disk."""
-        model_dir = os.path.dirname(__file__)
+        # Remove the per-target scaler and encoder files written by older versions
+        for filename in [*SCALER_FILES.values(), *ENCODER_FILES.values(), "feature_columns.joblib"]:
+            legacy_path = os.path.join(model_dir, filename)
+            if os.path.exists(legacy_path):
+                os.remove(legacy_path)
+
+        # Save the prediction grid, removing a stale one from older models
+        grid_path = os.path.join(model_dir, PREDICTION_GRID_FILE)
+        if self.prediction_grid is not None:
+            self.prediction_grid.save(grid_path)
+        elif os.path.exists(grid_path):
+            os.remove(grid_path)
+
+        # Keep the compact export in step with the models just saved
+        compact_dir = os.path.join(model_dir, COMPACT_MODEL_SUBDIR)
+        if USE_COMPACT_MODELS:
+            self.export_compact(compact_dir)
+        elif os.path.exists(compact_dir):
+            shutil.rmtree(compact_dir)
+
+    def export_compact(self, export_dir=None):
+        """Export the trained models as flat node arrays (see models/compact_forest.py).
+
+        Defaults to the compact subdirectory of the directory the models were loaded from.
+        """
+        if export_dir is None:
+            export_dir = os.path.join(self.model_info.get("model_dir") or MODEL_DIR, COMPACT_MODEL_SUBDIR)
+
+        shared_scalers = {id(scaler): scaler for scaler in self.scalers.values()}
+        if len(shared_scalers) != 1:
+            raise ValueError("Compact export needs models trained with one shared scaler; retrain first")
+
+        # Write to a side directory and swap it in, so readers never see a partial export
+        staging_dir = export_dir + ".tmp"
+        if os.path.exists(staging_dir):
+            shutil.rmtree(staging_dir)
+        compact_forest.export_models(
+            staging_dir,
+            self.models,
+            next(iter(shared_scalers.values())),
+            self.encoders,
+            self.feature_columns,
+            self.multi_output_targets,
+            self.interval_models,
+            self.target_scales,
+        )
+        if os.path.exists(export_dir):
+            shutil.rmtree(export_dir)
+        os.replace(staging_dir, export_dir)
+        print(f"Exported compact models to {export_dir}")
+
+    def load_compact(self, export_dir):
+        """Load models exported by export_compact(), memory-mapped."""
+        compact = compact_forest.load_models(export_dir)
+        self.models = compact["models"]
+        self.scalers = {target: compact["scaler"] for target in self.models}
+        self.encoders = compact["encoders"]
+        self.feature_columns = compact["feature_columns"]
+        self.multi_output_targets = compact["multi_output_targets"]
+        self.interval_models = compact["interval_models"]
+        self.target_scales = compact["target_scales"]
+
+    def load_models(self, version=None):
+        """Load trained models from disk.
+
+        Loads the given registry version, else the registry's active version,
+        else the files in MODEL_DIR when nothing has been published. Reads the
+        single preprocessing artifact, or the per-target scaler and encoder
+        files of model directories saved by older versions.
+        """
+        if version is None and USE_MODEL_REGISTRY:
+            active = self.registry.active_version()
+            version = active["version"] if active else None
+        model_dir = self.registry.version_dir(version) if version else MODEL_DIR
+
+        start = time.perf_counter()
+        compact_dir = os.path.join(model_dir, COMPACT_MODEL_SUBDIR)
+        compact_manifest = os.path.join(compact_dir, compact_forest.MANIFEST_FILE)
 
         try:
-            # Load feature columns
-            self.feature_columns = joblib.load(os.path.join(model_dir, "feature_columns.joblib"))
+            self.models = {}
+            self.scalers = {}
+            self.interval_models = {}
+            self.target_scales = {}
+            self.training_state = {}
+
+            if USE_COMPACT_MODELS and os.path.exists(compact_manifest):
+                self.load_compact(compact_dir)
+                self._load_prediction_grid(model_dir)
+                self._record_load(version, model_dir, start)
+                print(f"Loaded {len(self.models)} compact models successfully!")
+                return True
+
+            preprocessing_path = os.path.join(model_dir, PREPROCESSING_FILE)
+            shared_scaler = None
+
+            if os.path.exists(preprocessing_path):
+                preprocessing = joblib.load(preprocessing_path)
+                self.feature_columns = preprocessing["feature_columns"]
+                self.encoders = dict(preprocessing["encoders"])
+                self.target_scales = preprocessing.get("target_scales", {})
+                self.training_state = preprocessing.get("training_state", {})
+                shared_scaler = preprocessing["scaler"]
+            else:
+                # Load feature columns
+                self.feature_columns = joblib.load(os.path.join(model_dir, "feature_columns.joblib"))
+
+                # Load encoders
+                for col, filename in ENCODER_FILES.items():
+                    encoder_path = os.path.join(model_dir, filename)
+                    if os.path.exists(encoder_path):
+                        self.encoders[col] = joblib.load(encoder_path)
 
             # Load models
-            targets = ["voltage", "amperage", "wire_feed_speed", "travel_speed"]
+            self.multi_output_targets = []
+            multi_output_path = os.path.join(model_dir, MULTI_OUTPUT_MODEL_FILE)
+            if shared_scaler is not None and os.path.exists(multi_output_path):
+                saved = joblib.load(multi_output_path)
+                self.multi_output_targets = list(saved["targets"])
+                for target in self.multi_output_targets:
+                    self.models[target] = saved["model"]
+                    self.scalers[target] = shared_scaler
+
+            targets = [] if self.multi_output_targets else ["voltage", "amperage", "wire_feed_speed", "travel_speed"]
             for target in targets:
-                model_path = os.path.join(model_dir, f"{target}_model.joblib")
-                scaler_path = os.path.join(model_dir, f"{target}_scaler.joblib")
+                model_path = os.path.join(model_dir, MODEL_FILES[target])
+                scaler_path = os.path.join(model_dir, SCALER_FILES[target])
 
-                if os.path.exists(model_path) and os.path.exists(scaler_path):
+                if os.path.exists(model_path) and shared_scaler is not None:
+                    self.models[target] = joblib.load(model_path)
+                    self.scalers[target] = shared_scaler
+                elif os.path.exists(model_path) and os.path.exists(scaler_path):
                     self.models[target] = joblib.load(model_path)
                     self.scalers[target] = joblib.load(scaler_path)
 
-            # Load encoders
-            categorical_columns = ["process", "position", "joint_type"]
-            for col in categorical_columns:
-                encoder_path = os.path.join(model_dir, f"{col}_encoder.joblib")
-                if os.path.exists(encoder_path):
-                    self.encoders[col] = joblib.load(encoder_path)
+            interval_path = os.path.join(model_dir, INTERVAL_MODEL_FILE)
+            if os.path.exists(interval_path):
+                self.interval_models = joblib.load(interval_path)
+
+            self._load_prediction_grid(model_dir)
+            self._record_load(version, model_dir, start)
 
             print(f"Loaded {len(self.models)} models successfully!")
             return True
@@ -228,7 +1061,35 @@ class WeldParameterPredictor:
             print(f"Error loading models: {e}")
             return False
 
+    def _record_load(self, version, model_dir, start):
+        """Record which model version was loaded, from where and how long it took."""
+        self.model_info = {
+            "version": version,
+            "model_dir": model_dir,
+            "loaded_at": time.time(),
+            "load_time_ms": round((time.perf_counter() - start) * 1000, 2),
+        }
+
+    def _load_prediction_grid(self, model_dir):
+        """Load the precomputed prediction grid, if enabled and saved."""
+        self.prediction_grid = None
+        grid_path = os.path.join(model_dir, PREDICTION_GRID_FILE)
+        if USE_PREDICTION_GRID and os.path.exists(grid_path):
+            self.prediction_grid = PredictionGrid.load(grid_path)
+
 
 if __name__ == "__main__":
     predictor = WeldParameterPredictor()
-    predictor.train_models()
+    if "--export-compact" in sys.argv:
+        # Export the saved models without retraining
+        if predictor.load_models():
+            predictor.export_compact()
+    elif "--columnar" in sys.argv:
+        # Train from the columnar export instead of SQLite
+        predictor.train_models(source="columnar")
+    elif "--incremental" in sys.argv:
+        # Update the saved models with new rows, refitting only when needed
+        predictor.load_models()
+        predictor.update_models()
+    else:
+        predictor.train_models()
@@ -0,0 +1,130 @@
+import json
+import os
+import shutil
+import time
+import uuid
+
+from config import MODEL_REGISTRY_DIR, MODEL_REGISTRY_KEEP
+
+MANIFEST_FILE = "manifest.json"
+VERSION_FILE = "version.json"
+STAGING_PREFIX = ".staging-"
+
+
+class ModelRegistry:
+    """Versioned model directories under MODEL_REGISTRY_DIR.
+
+    Every published model set gets its own directory named
+    <timestamp>-<id>, holding the files written by save_models plus a
+    version.json with its metadata. manifest.json lists the versions and
+    names the active one. Versions are written under a staging name and
+    renamed into place, and the manifest is replaced atomically, so readers
+    only ever see complete versions.
+    """
+
+    def __init__(self, root=MODEL_REGISTRY_DIR, keep=MODEL_REGISTRY_KEEP):
+        self.root = root
+        self.keep = keep
+        self.manifest_path = os.path.join(root, MANIFEST_FILE)
+
+    def manifest(self):
+        """Read the manifest; an empty one if nothing has been published."""
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"active": None, "versions": []}
+
+    def manifest_mtime(self):
+        """Modification time of the manifest in ns, or None if it does not exist."""
+        try:
+            return os.stat(self.manifest_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def active_version(self):
+        """Metadata of the active version, or None."""
+        manifest = self.manifest()
+        return next((v for v in manifest["versions"] if v["version"] == manifest["active"]), None)
+
+    def version_dir(self, version):
+        """Directory holding a version's model files."""
+        return os.path.join(self.root, version)
+
+    def publish(self, predictor, **metadata):
+        """Save a trained predictor as a new version and make it active.
+
+        Extra keyword arguments are stored in the version's metadata.
+        Returns the version metadata.
+        """
+        version = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        staging_dir = os.path.join(self.root, STAGING_PREFIX + version)
+        os.makedirs(staging_dir)
+
+        info = {
+            "version": version,
+            "created_at": time.time(),
+            "engine": predictor.engine,
+            "targets": list(predictor.models),
+            "training_times": {stage: round(seconds, 3) for stage, seconds in predictor.training_times.items()},
+            **metadata,
+        }
+
+        try:
+            predictor.save_models(staging_dir)
+            with open(os.path.join(staging_dir, VERSION_FILE), "w") as f:
+                json.dump(info, f, indent=2)
+            os.replace(staging_dir, self.version_dir(version))
+        except Exception:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            raise
+
+        self._write_manifest(active=version)
+        self._prune()
+        print(f"Published model version {version}")
+        return info
+
+    def activate(self, version):
+        """Make an already published version the active one (e.g. to roll back)."""
+        if not os.path.exists(os.path.join(self.version_dir(version), VERSION_FILE)):
+            raise ValueError(f"Unknown model version: {version}")
+        self._write_manifest(active=version)
+
+    def _scan_versions(self):
+        """Metadata of every complete version on disk, oldest first."""
+        versions = []
+        if not os.path.isdir(self.root):
+            return versions
+
+        for name in os.listdir(self.root):
+            version_file = os.path.join(self.root, name, VERSION_FILE)
+            if name.startswith(STAGING_PREFIX) or not os.path.exists(version_file):
+                continue
+            with open(version_file) as f:
+                versions.append(json.load(f))
+        return sorted(versions, key=lambda v: (v["created_at"], v["version"]))
+
+    def _write_manifest(self, active):
+        """Rebuild the manifest from the version directories and swap it in atomically.
+
+        Rebuilding from disk means concurrent publishers (the web app and a
+        CLI run) never drop each other's versions.
+        """
+        manifest = {"active": active, "updated_at": time.time(), "versions": self._scan_versions()}
+
+        tmp_path = f"{self.manifest_path}.{uuid.uuid4().hex[:6]}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _prune(self):
+        """Delete the oldest versions beyond keep, never the active one."""
+        manifest = self.manifest()
+        inactive = [v["version"] for v in manifest["versions"] if v["version"] != manifest["active"]]
+        stale = inactive[: max(0, len(inactive) - self.keep)]
+        if not stale:
+            return
+
+        for version in stale:
+            shutil.rmtree(self.version_dir(version), ignore_errors=True)
+        self._write_manifest(active=manifest["active"])
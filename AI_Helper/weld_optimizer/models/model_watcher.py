@@ -0,0 +1,83 @@
+import threading
+import time
+
+from config import MODEL_RELOAD_INTERVAL
+from models.ml_predictor import WeldParameterPredictor
+from models.model_registry import ModelRegistry
+
+
+class ModelWatcher:
+    """Polls the model registry and hot-swaps newly activated versions in.
+
+    get_predictor returns the predictor being served and on_swap receives a
+    freshly loaded one. Loading happens on the watcher thread, so requests
+    keep being answered by the old models until the swap.
+    """
+
+    def __init__(self, get_predictor, on_swap, registry=None, interval=MODEL_RELOAD_INTERVAL):
+        self.get_predictor = get_predictor
+        self.on_swap = on_swap
+        self.registry = registry or ModelRegistry()
+        self.interval = interval
+        self.reloads = 0
+        self.last_check = None
+        self.last_error = None
+        self._last_mtime = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start polling on a background daemon thread."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="model-watcher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop polling."""
+        self._stop.set()
+
+    def check(self):
+        """Check the manifest once; load and swap in a new active version. Returns True if swapped."""
+        self.last_check = time.time()
+
+        # Only re-read the manifest when it has been rewritten. The mtime is only recorded once the
+        # active version is in use, so a version that fails to load is retried on the next check.
+        mtime = self.registry.manifest_mtime()
+        if mtime is None or mtime == self._last_mtime:
+            return False
+
+        active = self.registry.active_version()
+        if active is None or active["version"] == self.get_predictor().model_info.get("version"):
+            self._last_mtime = mtime
+            return False
+
+        predictor = WeldParameterPredictor(engine=active.get("engine"))
+        if not predictor.load_models(version=active["version"]) or not predictor.models:
+            self.last_error = f"Could not load model version {active['version']}"
+            return False
+
+        self.on_swap(predictor)
+        self._last_mtime = mtime
+        self.reloads += 1
+        self.last_error = None
+        print(f"Hot-reloaded model version {active['version']}")
+        return True
+
+    def status(self):
+        """JSON-friendly watcher counters."""
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "interval": self.interval,
+            "last_check": self.last_check,
+            "reloads": self.reloads,
+            "last_error": self.last_error,
+        }
+
+    def _run(self):
+        """Poll until stopped."""
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                self.last_error = str(e)
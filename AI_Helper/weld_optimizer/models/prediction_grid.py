@@ -0,0 +1,164 @@
+import numpy as np
+
+# Order of the grid axes, before the thickness and target axes
+AXES = ["base", "filler", "process", "position", "joint_type"]
+
+BASE_PROPERTIES = ["base_carbon", "base_thermal", "base_melting_point", "base_density"]
+FILLER_PROPERTIES = ["filler_carbon", "filler_thermal"]
+
+
+def material_key(values):
+    """Hashable key for a tuple of material property values."""
+    return tuple(round(float(value or 0), 6) for value in values)
+
+
+class PredictionGrid:
+    """Precomputed predictions for the discrete input space.
+
+    Predictions are stored in one float64 array (the live models' precision) with axes
+    (base, filler, process, position, joint_type, thickness, target), so a
+    lookup is a handful of dict hits and one array index.
+    """
+
+    def __init__(self, targets, axis_labels, base_values, filler_values, thicknesses, predictions, confidence):
+        self.targets = list(targets)
+        self.axis_labels = {axis: list(labels) for axis, labels in axis_labels.items()}
+        self.base_values = np.asarray(base_values, dtype=np.float64)
+        self.filler_values = np.asarray(filler_values, dtype=np.float64)
+        self.thicknesses = np.asarray(thicknesses, dtype=np.float64)
+        self.predictions = np.asarray(predictions, dtype=np.float64)
+        self.confidence = np.asarray(confidence, dtype=np.float64)
+        self._build_index()
+
+    def _build_index(self):
+        """Build the label -> axis position maps used by lookup()."""
+        self._index = {axis: {label: i for i, label in enumerate(self.axis_labels[axis])} for axis in AXES}
+        self._index["base"] = {material_key(row): i for i, row in enumerate(self.base_values)}
+        self._index["filler"] = {material_key(row): i for i, row in enumerate(self.filler_values)}
+        self._thickness_index = {round(float(t), 6): i for i, t in enumerate(self.thicknesses)}
+
+    @property
+    def shape(self):
+        """Shape of the prediction array."""
+        return self.predictions.shape
+
+    @classmethod
+    def build(cls, predictor, base_materials, filler_materials, thicknesses):
+        """Predict every grid point with the predictor's trained models in one batch."""
+        axis_labels = {
+            "base": [m["name"] for m in base_materials],
+            "filler": [m["name"] for m in filler_materials],
+            "process": list(predictor.encoders["process"].classes_),
+            "position": list(predictor.encoders["position"].classes_),
+            "joint_type": list(predictor.encoders["joint_type"].classes_),
+        }
+        base_values = [
+            [m["carbon_content"], m["thermal_conductivity"], m["melting_point"], m["density"]] for m in base_materials
+        ]
+        filler_values = [[m["carbon_content"], m["thermal_conductivity"]] for m in filler_materials]
+        base_values = np.nan_to_num(np.array(base_values, dtype=np.float64))
+        filler_values = np.nan_to_num(np.array(filler_values, dtype=np.float64))
+
+        shape = [len(axis_labels[axis]) for axis in AXES] + [len(thicknesses)]
+        grid_index = np.indices(shape).reshape(len(shape), -1)
+        b, f, p, pos, j, t = grid_index
+
+        # Fill the feature matrix column by column straight from the grid indices
+        columns = {
+            "thickness": np.asarray(thicknesses, dtype=np.float64)[t],
+            "process_encoded": p,
+            "position_encoded": pos,
+            "joint_type_encoded": j,
+        }
+        for k, name in enumerate(BASE_PROPERTIES):
+            columns[name] = base_values[b, k]
+        for k, name in enumerate(FILLER_PROPERTIES):
+            columns[name] = filler_values[f, k]
+
+        X = np.column_stack([columns[column] for column in predictor.feature_columns]).astype(np.float64)
+        predictions, confidence = predictor.predict_matrix(X)
+
+        targets = list(predictions)
+        stacked_predictions = np.stack([predictions[target] for target in targets], axis=-1).reshape(shape + [-1])
+        stacked_confidence = np.stack([confidence[target] for target in targets], axis=-1).reshape(shape + [-1])
+
+        return cls(
+            targets, axis_labels, base_values, filler_values, thicknesses, stacked_predictions, stacked_confidence
+        )
+
+    def _locate(self, input_data):
+        """Return the grid position of an input's discrete axes, or None if off-grid."""
+        keys = {
+            "base": material_key(input_data.get(name) for name in BASE_PROPERTIES),
+            "filler": material_key(input_data.get(name) for name in FILLER_PROPERTIES),
+            "process": input_data.get("process"),
+            "position": input_data.get("position"),
+            "joint_type": input_data.get("joint_type"),
+        }
+        position = []
+        for axis in AXES:
+            i = self._index[axis].get(keys[axis])
+            if i is None:
+                return None
+            position.append(i)
+        return tuple(position)
+
+    def lookup(self, input_data, interpolate=True):
+        """Look up predictions for one input.
+
+        Returns (predictions, confidence_scores) dicts, or None if the input
+        is off the grid. Thicknesses between two buckets are linearly
+        interpolated when interpolate is set.
+        """
+        position = self._locate(input_data)
+        if position is None:
+            return None
+
+        thickness = float(input_data.get("thickness") or 0)
+        t = self._thickness_index.get(round(thickness, 6))
+
+        if t is not None:
+            predictions = self.predictions[position + (t,)]
+            confidence = self.confidence[position + (t,)]
+        elif interpolate and self.thicknesses[0] < thickness < self.thicknesses[-1]:
+            upper = int(np.searchsorted(self.thicknesses, thickness))
+            lower = upper - 1
+            weight = (thickness - self.thicknesses[lower]) / (self.thicknesses[upper] - self.thicknesses[lower])
+            predictions = (1 - weight) * self.predictions[position + (lower,)] + weight * self.predictions[
+                position + (upper,)
+            ]
+            confidence = np.minimum(self.confidence[position + (lower,)], self.confidence[position + (upper,)])
+        else:
+            return None
+
+        return (
+            {target: float(predictions[k]) for k, target in enumerate(self.targets)},
+            {target: float(confidence[k]) for k, target in enumerate(self.targets)},
+        )
+
+    def save(self, path):
+        """Save the grid as a single uncompressed .npz archive."""
+        np.savez(
+            path,
+            targets=np.array(self.targets),
+            thicknesses=self.thicknesses,
+            base_values=self.base_values,
+            filler_values=self.filler_values,
+            predictions=self.predictions,
+            confidence=self.confidence,
+            **{f"labels_{axis}": np.array(self.axis_labels[axis]) for axis in AXES},
+        )
+
+    @classmethod
+    def load(cls, path):
+        """Load a grid saved with save()."""
+        with np.load(path) as data:
+            return cls(
+                targets=data["targets"].tolist(),
+                axis_labels={axis: data[f"labels_{axis}"].tolist() for axis in AXES},
+                base_values=data["base_values"],
+                filler_values=data["filler_values"],
+                thicknesses=data["thicknesses"],
+                predictions=data["predictions"],
+                confidence=data["confidence"],
+            )
@@ -0,0 +1,158 @@
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from models.ml_predictor import TRAINING_STAGES, WeldParameterPredictor
+
+
+class TrainingCancelled(Exception):
+    """Raised inside a training run when its job has been cancelled."""
+
+
+class TrainingJob:
+    """Status of one background training run."""
+
+    def __init__(self, engine=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.engine = engine
+        self.status = "queued"  # queued, running, succeeded, failed or cancelled
+        self.stage = None
+        self.progress = 0.0
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.training_times = {}
+        self._cancel = threading.Event()
+
+    @property
+    def done(self):
+        """True once the job has stopped, whatever the outcome."""
+        return self.status in ("succeeded", "failed", "cancelled")
+
+    def to_dict(self):
+        """JSON-friendly view of the job."""
+        return {
+            "job_id": self.id,
+            "engine": self.engine,
+            "status": self.status,
+            "stage": self.stage,
+            "progress": round(self.progress, 3),
+            "cancel_requested": self._cancel.is_set(),
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "training_times": {stage: round(seconds, 3) for stage, seconds in self.training_times.items()},
+        }
+
+
+class TrainingJobRunner:
+    """Runs training jobs one at a time on a background thread.
+
+    Each job trains a fresh WeldParameterPredictor, so the predictor being
+    served is never touched mid-training. When a job succeeds, on_success is
+    called with the new predictor and swaps it in with a single assignment.
+    Cancellation takes effect at the next training stage boundary, or
+    between batches of cross-validation folds; model fits already running
+    are finished first.
+    """
+
+    def __init__(self, on_success, max_history=20):
+        self.on_success = on_success
+        self.max_history = max_history
+        self._jobs = OrderedDict()  # job id -> TrainingJob, oldest first
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+
+    def submit(self, engine=None):
+        """Queue a training job and return it."""
+        job = TrainingJob(engine)
+
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="training-jobs", daemon=True)
+                self._worker.start()
+
+        self._queue.put(job)
+        return job
+
+    def get(self, job_id):
+        """Return a job by id, or None."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self):
+        """All remembered jobs, newest first."""
+        with self._lock:
+            return list(reversed(self._jobs.values()))
+
+    def active_job(self):
+        """The queued or running job submitted last, or None."""
+        return next((job for job in self.jobs() if not job.done), None)
+
+    def cancel(self, job_id):
+        """Request cancellation of a job. Returns False if it is unknown or already finished."""
+        job = self.get(job_id)
+        if job is None or job.done:
+            return False
+
+        job._cancel.set()
+        return True
+
+    def _prune(self):
+        """Forget the oldest finished jobs beyond max_history."""
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[: max(0, len(self._jobs) - self.max_history)]:
+            del self._jobs[job_id]
+
+    def _run(self):
+        """Worker loop: train queued jobs until the process exits."""
+        while True:
+            job = self._queue.get()
+            try:
+                self._run_job(job)
+            finally:
+                self._queue.task_done()
+
+    def _run_job(self, job):
+        """Train one job's predictor and hand it to on_success."""
+        if job._cancel.is_set():
+            job.status = "cancelled"
+            job.finished_at = time.time()
+            return
+
+        job.status = "running"
+        job.started_at = time.time()
+
+        def progress(stage):
+            if job._cancel.is_set():
+                raise TrainingCancelled()
+            job.stage = stage
+            if stage in TRAINING_STAGES:
+                job.progress = TRAINING_STAGES.index(stage) / len(TRAINING_STAGES)
+
+        predictor = WeldParameterPredictor(engine=job.engine)
+        try:
+            predictor.train_models(progress=progress)
+            job.training_times = dict(predictor.training_times)
+
+            if not predictor.models:
+                raise RuntimeError("No models were trained; check that the database has training data")
+
+            self.on_success(predictor)
+            job.status = "succeeded"
+            job.progress = 1.0
+        except TrainingCancelled:
+            job.status = "cancelled"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
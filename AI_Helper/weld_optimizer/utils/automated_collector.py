@@ -7,29 +7,23 @@ This module handles automatic data collection from various sources including:
 - PDF parsing of AWS welding procedures
 """
 
-import requests
-import pandas as pd
 import numpy as np
 from bs4 import BeautifulSoup
-import re
 import json
 import os
 import sys
 from urllib.parse import urljoin, urlparse
-import time
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-import cv2
-import pytesseract
-from PIL import Image
-import tempfile
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 try:
     from database.db_manager import DatabaseManager
+    from utils.browser_pool import BrowserPool, create_driver, needs_browser
+    from utils.fetch_engine import FetchEngine
+    from utils.http_cache import HttpCache
+    from utils.ocr_pipeline import OcrPipeline
+    from utils.parameter_extraction import extract_page, parse_text_for_parameters
     from utils.validation import comprehensive_validation
 except ImportError:
     print("Warning: Could not import local modules")
@@ -38,8 +32,14 @@ except ImportError:
 class AutomatedDataCollector:
     """Automatically collect welding parameter data from various online sources."""
 
-    def __init__(self):
+    def __init__(self, fetch_engine=None, cache_only=None, browser_pool=None):
         self.db_manager = DatabaseManager()
+        # Shared by every download, so connections are reused and per-host limits hold across calls.
+        # Pages and images unchanged since the last run are served from the on-disk cache after a 304.
+        self.fetch_engine = fetch_engine or FetchEngine(cache=HttpCache(cache_only=cache_only))
+        # Created on first use: the OCR cache file and Chrome are only needed by some runs
+        self._ocr_pipeline = None
+        self._browser_pool = browser_pool
         self.collected_data = []
         self.sources = {
             "lincoln_electric": "https://www.lincolnelectric.com",
@@ -49,17 +49,28 @@ class AutomatedDataCollector:
             "welding_guru": "https://www.weldingguru.com",
         }
 
+    @property
+    def ocr_pipeline(self):
+        """Chart OCR on a process pool; each distinct image is only ever OCR'd once."""
+        if self._ocr_pipeline is None:
+            self._ocr_pipeline = OcrPipeline()
+        return self._ocr_pipeline
+
+    @property
+    def browser_pool(self):
+        """Browser sessions for pages that need JavaScript; Chrome starts with the first page and is kept."""
+        if self._browser_pool is None:
+            self._browser_pool = BrowserPool()
+        return self._browser_pool
+
     def setup_web_driver(self, headless=True):
-        """Setup Selenium web driver for dynamic content."""
-        chrome_options = Options()
-        if headless:
-            chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
+        """Setup Selenium web driver for dynamic content.
 
+        The collector itself renders pages on its shared browser_pool; this
+        returns a separate driver that the caller must quit.
+        """
         try:
-            driver = webdriver.Chrome(options=chrome_options)
-            return driver
+            return create_driver(headless)
         except Exception as e:
             print(f"Error setting up web driver: {e}")
             return None
@@ -77,27 +88,34 @@ class AutomatedDataCollector:
                 "welding parameter calculator",
             ]
 
+        # The fetch engine spaces out requests to the search engine
+        search_urls = [self._google_search_url(term) for term in search_terms]
         collected_urls = []
 
-        for term in search_terms:
+        for term, result in zip(search_terms, self.fetch_engine.fetch_all(search_urls)):
             print(f"Searching for: {term}")
-            urls = self._google_search_welding_data(term)
-            collected_urls.extend(urls)
-            time.sleep(2)  # Be respectful to search engines
+            collected_urls.extend(self._parse_search_results(term, result))
 
-        return list(set(collected_urls))  # Remove duplicates
+        return list(dict.fromkeys(collected_urls))  # Remove duplicates, keeping search order
 
-    def _google_search_welding_data(self, query):
-        """Perform Google search for welding parameter data."""
+    def _google_search_url(self, query):
+        """Google search URL for a query."""
         # Note: In a real implementation, you'd use Google Custom Search API
         # This is a simplified example
-        search_url = f"https://www.google.com/search?q={query.replace(' ', '+')}"
+        return f"https://www.google.com/search?q={query.replace(' ', '+')}"
 
-        headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
+    def _google_search_welding_data(self, query):
+        """Perform Google search for welding parameter data."""
+        return self._parse_search_results(query, self.fetch_engine.fetch(self._google_search_url(query)))
+
+    def _parse_search_results(self, query, result):
+        """Extract welding resource URLs from a fetched search results page."""
+        if not result.ok:
+            print(f"Error searching for {query}: {result.error or f'HTTP {result.status}'}")
+            return []
 
         try:
-            response = requests.get(search_url, headers=headers)
-            soup = BeautifulSoup(response.content, "html.parser")
+            soup = BeautifulSoup(result.content, "html.parser")
 
             # Extract search result URLs
             urls = []
@@ -137,221 +155,75 @@ class AutomatedDataCollector:
 
     def extract_data_from_url(self, url):
         """Extract welding parameter data from a given URL."""
-        print(f"Extracting data from: {url}")
-
-        try:
-            headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
-
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.content, "html.parser")
-
-            # Look for tables containing welding parameters
-            tables = soup.find_all("table")
-            extracted_data = []
-
-            for table in tables:
-                if self._contains_welding_parameters(table):
-                    data = self._parse_welding_table(table)
-                    if data:
-                        extracted_data.extend(data)
-
-            # Look for images that might contain parameter charts
-            images = soup.find_all("img")
-            for img in images:
-                if self._is_parameter_chart(img):
-                    img_data = self._extract_from_image(img, url)
-                    if img_data:
-                        extracted_data.extend(img_data)
-
-            return extracted_data
-
-        except Exception as e:
-            print(f"Error extracting data from {url}: {e}")
-            return []
-
-    def _contains_welding_parameters(self, table):
-        """Check if table contains welding parameter data."""
-        text = table.get_text().lower()
-        parameter_keywords = [
-            "voltage",
-            "amperage",
-            "current",
-            "wire speed",
-            "travel speed",
-            "thickness",
-            "material",
-            "electrode",
-            "gas flow",
-        ]
+        return self.extract_data_from_urls([url])[url]
+
+    def extract_data_from_urls(self, urls):
+        """Extract welding parameter data from several URLs, fetched concurrently.
+
+        All pages are downloaded first, then every chart image they link to,
+        each batch through the fetch engine. Pages that yield nothing and only
+        build their content with JavaScript are rendered on the browser pool
+        in between. Returns {url: records}.
+        """
+        urls = list(dict.fromkeys(urls))
+        extracted = {url: [] for url in urls}
+        chart_urls = {}  # image URL -> pages that show it
+        dynamic_urls = []
+
+        for result in self.fetch_engine.fetch_all(urls):
+            print(f"Extracting data from: {result.url}")
+            if self._extract_page_result(result, extracted, chart_urls) == 0 and self._needs_browser(result):
+                dynamic_urls.append(result.url)
+
+        if dynamic_urls:
+            if self.fetch_engine.cache is not None and self.fetch_engine.cache.cache_only:
+                print(f"Skipping {len(dynamic_urls)} JavaScript pages in cache-only mode")
+            else:
+                for result in self.browser_pool.render_all(dynamic_urls):
+                    print(f"Rendering data from: {result.url}")
+                    self._extract_page_result(result, extracted, chart_urls)
+
+        charts = []
+        for result in self.fetch_engine.fetch_all(chart_urls):
+            if result.ok:
+                charts.append(result)
+            else:
+                print(f"Error downloading image {result.url}: {result.error or f'HTTP {result.status}'}")
 
-        keyword_count = sum(1 for keyword in parameter_keywords if keyword in text)
-        return keyword_count >= 3  # Must contain at least 3 parameter keywords
+        # OCR every downloaded chart in one batch across the worker processes
+        texts = self.ocr_pipeline.ocr_images([result.content for result in charts]) if charts else []
+        for result, text in zip(charts, texts):
+            img_data = parse_text_for_parameters(text)
+            for page_url in chart_urls[result.url]:
+                extracted[page_url].extend(img_data)
 
-    def _parse_welding_table(self, table):
-        """Parse HTML table to extract welding parameters."""
-        try:
-            # Convert HTML table to pandas DataFrame
-            df = pd.read_html(str(table))[0]
-
-            # Standardize column names
-            df.columns = [col.lower().strip() for col in df.columns]
-
-            # Map common column variations to standard names
-            column_mapping = {
-                "material": ["material", "base metal", "base material"],
-                "thickness": ["thickness", "thick", "gauge"],
-                "voltage": ["voltage", "volts", "v"],
-                "amperage": ["amperage", "amps", "current", "a"],
-                "wire_speed": ["wire speed", "wire feed", "wfs", "ipm"],
-                "travel_speed": ["travel speed", "travel", "ts"],
-                "process": ["process", "welding process"],
-                "electrode": ["electrode", "wire", "rod"],
-            }
-
-            # Rename columns based on mapping
-            for standard_name, variations in column_mapping.items():
-                for col in df.columns:
-                    if any(var in col for var in variations):
-                        df.rename(columns={col: standard_name}, inplace=True)
-                        break
-
-            # Convert to list of dictionaries
-            records = df.to_dict("records")
-
-            # Clean and validate records
-            cleaned_records = []
-            for record in records:
-                cleaned = self._clean_parameter_record(record)
-                if cleaned and self._validate_parameter_record(cleaned):
-                    cleaned_records.append(cleaned)
-
-            return cleaned_records
+        return extracted
 
-        except Exception as e:
-            print(f"Error parsing table: {e}")
-            return []
+    def _extract_page_result(self, result, extracted, chart_urls):
+        """Add a fetched page's table records to extracted and its chart images to chart_urls.
 
-    def _is_parameter_chart(self, img_tag):
-        """Check if image is likely a welding parameter chart."""
-        src = img_tag.get("src", "")
-        alt = img_tag.get("alt", "").lower()
-        title = img_tag.get("title", "").lower()
-
-        chart_keywords = ["chart", "table", "parameter", "setting", "welding", "mig", "tig", "voltage", "amperage"]
-
-        text_to_check = f"{src} {alt} {title}".lower()
-        return any(keyword in text_to_check for keyword in chart_keywords)
+        Returns how many records and charts were found, or None if the page failed.
+        """
+        if not result.ok:
+            print(f"Error extracting data from {result.url}: {result.error or f'HTTP {result.status}'}")
+            return None
 
-    def _extract_from_image(self, img_tag, base_url):
-        """Extract welding parameters from image using OCR."""
         try:
-            img_url = urljoin(base_url, img_tag.get("src"))
-
-            # Download image
-            response = requests.get(img_url, timeout=10)
-
-            # Save to temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as tmp_file:
-                tmp_file.write(response.content)
-                tmp_path = tmp_file.name
-
-            # Process with OCR
-            extracted_text = pytesseract.image_to_string(Image.open(tmp_path))
-
-            # Clean up temporary file
-            os.unlink(tmp_path)
-
-            # Parse text for parameters
-            parameters = self._parse_text_for_parameters(extracted_text)
-
-            return parameters
+            # Parameter tables and chart images, from one parse of the page
+            records, charts = extract_page(result.content)
+            extracted[result.url].extend(records)
+            for src in charts:
+                chart_urls.setdefault(urljoin(result.url, src), []).append(result.url)
+            return len(records) + len(charts)
 
         except Exception as e:
-            print(f"Error extracting from image: {e}")
-            return []
-
-    def _parse_text_for_parameters(self, text):
-        """Parse OCR text to extract welding parameters."""
-        parameters = []
-        lines = text.split("\n")
-
-        # Look for parameter patterns
-        voltage_pattern = r"(\d+(?:\.\d+)?)\s*(?:v|volt|voltage)"
-        amperage_pattern = r"(\d+(?:\.\d+)?)\s*(?:a|amp|amperage|current)"
-        thickness_pattern = r"(\d+(?:\.\d+)?)\s*(?:mm|inch|in|thick)"
-
-        current_record = {}
-
-        for line in lines:
-            line = line.lower().strip()
-
-            # Extract voltage
-            voltage_match = re.search(voltage_pattern, line)
-            if voltage_match:
-                current_record["voltage"] = float(voltage_match.group(1))
-
-            # Extract amperage
-            amperage_match = re.search(amperage_pattern, line)
-            if amperage_match:
-                current_record["amperage"] = float(amperage_match.group(1))
-
-            # Extract thickness
-            thickness_match = re.search(thickness_pattern, line)
-            if thickness_match:
-                current_record["thickness"] = float(thickness_match.group(1))
-
-            # If we have enough parameters, save the record
-            if len(current_record) >= 3:
-                parameters.append(current_record.copy())
-                current_record = {}
-
-        return parameters
-
-    def _clean_parameter_record(self, record):
-        """Clean and standardize a parameter record."""
-        cleaned = {}
-
-        # Extract numeric values from strings
-        for key, value in record.items():
-            if pd.isna(value):
-                continue
-
-            if key in ["voltage", "amperage", "thickness", "wire_speed", "travel_speed"]:
-                # Extract numeric value
-                if isinstance(value, str):
-                    numbers = re.findall(r"(\d+(?:\.\d+)?)", value)
-                    if numbers:
-                        cleaned[key] = float(numbers[0])
-                elif isinstance(value, (int, float)):
-                    cleaned[key] = float(value)
-            else:
-                cleaned[key] = str(value).strip()
-
-        return cleaned if cleaned else None
-
-    def _validate_parameter_record(self, record):
-        """Validate that a parameter record is reasonable."""
-        # Check for minimum required fields
-        required_fields = ["voltage", "amperage"]
-        if not all(field in record for field in required_fields):
-            return False
-
-        # Check parameter ranges
-        ranges = {
-            "voltage": (8, 50),
-            "amperage": (20, 500),
-            "thickness": (0.5, 100),
-            "wire_speed": (50, 800),
-            "travel_speed": (1, 30),
-        }
-
-        for field, (min_val, max_val) in ranges.items():
-            if field in record:
-                value = record[field]
-                if not (min_val <= value <= max_val):
-                    return False
+            print(f"Error extracting data from {result.url}: {e}")
+            return None
 
-        return True
+    def _needs_browser(self, result):
+        """Check if a fetched HTML page has to be rendered in a browser to show its content."""
+        content_type = result.headers.get("Content-Type", "text/html")
+        return "html" in content_type.lower() and needs_browser(result.content)
 
     def collect_from_manufacturer_apis(self):
         """Collect data from manufacturer APIs where available."""
@@ -370,13 +242,15 @@ class AutomatedDataCollector:
         all_collected_data = []
         processed_count = 0
 
-        for url in urls[:max_sources]:
-            if processed_count >= max_sources:
-                break
-
-            print(f"Processing source {processed_count + 1}/{max_sources}: {url}")
-            data = self.extract_data_from_url(url)
+        # Sources are fetched concurrently; the fetch engine keeps each server's request rate polite
+        self.fetch_engine.reset_stats()
+        for stage in (self._ocr_pipeline, self._browser_pool):
+            if stage is not None:
+                stage.reset_stats()
+        extracted = self.extract_data_from_urls(urls[:max_sources])
 
+        for url, data in extracted.items():
+            print(f"Processing source {processed_count + 1}/{len(extracted)}: {url}")
             if data:
                 all_collected_data.extend(data)
                 print(f"  ✅ Extracted {len(data)} records")
@@ -384,11 +258,31 @@ class AutomatedDataCollector:
                 print(f"  ❌ No data found")
 
             processed_count += 1
-            time.sleep(1)  # Be respectful to servers
 
+        stats = self.fetch_engine.stats()
         print(f"\n📊 Collection Summary:")
         print(f"  - Sources processed: {processed_count}")
         print(f"  - Total records collected: {len(all_collected_data)}")
+        print(
+            f"  - Downloaded {stats['pages']} files ({stats['bytes'] / 1024:.0f} KB, {stats['failures']} failed, "
+            f"{stats['from_cache']} from cache): "
+            f"{stats['pages_per_second']:.1f} pages/s, {stats['bytes_per_second'] / 1024:.0f} KB/s"
+        )
+        browser_stats = self._browser_pool.stats() if self._browser_pool is not None else {"pages": 0, "failures": 0}
+        if browser_stats["pages"] or browser_stats["failures"]:
+            print(
+                f"  - Rendered {browser_stats['pages']} JavaScript pages ({browser_stats['failures']} failed) on "
+                f"{browser_stats['sessions_started']} browser sessions started in "
+                f"{browser_stats['startup_seconds']:.1f}s: {browser_stats['pages_per_second']:.1f} pages/s"
+            )
+        ocr_stats = self._ocr_pipeline.stats() if self._ocr_pipeline is not None else {"images": 0}
+        if ocr_stats["images"]:
+            print(
+                f"  - Charts read: {ocr_stats['images']} ({ocr_stats['cache_hits']} cached, "
+                f"{ocr_stats['failures']} failed): {ocr_stats['images_per_second']:.1f} images/s"
+            )
+            for pid, worker in ocr_stats["workers"].items():
+                print(f"      worker {pid}: {worker['images']} images, {worker['images_per_second']:.1f} images/s")
 
         # Save collected data to database
         if all_collected_data:
@@ -401,22 +295,29 @@ class AutomatedDataCollector:
 
         return False
 
+    def close(self):
+        """Shut down the browser sessions, OCR workers and HTTP connections."""
+        for stage in (self._browser_pool, self._ocr_pipeline):
+            if stage is not None:
+                stage.close()
+        self.fetch_engine.close()
+
     def _save_collected_data(self, data_list):
         """Save collected data to the database."""
-        saved_count = 0
+        db_records = []
+        source_indexes = []  # Position in data_list of each converted record
+        for index, record in enumerate(data_list):
+            # Convert to database format
+            db_record = self._convert_to_db_format(record)
+            if db_record:
+                db_records.append(db_record)
+                source_indexes.append(index)
 
-        for record in data_list:
-            try:
-                # Convert to database format
-                db_record = self._convert_to_db_format(record)
-                if db_record:
-                    self.db_manager.add_weld_parameter(db_record)
-                    saved_count += 1
-            except Exception as e:
-                print(f"Error saving record: {e}")
-                continue
+        result = self.db_manager.add_weld_parameters_bulk(db_records)
+        for index, error in result["failures"]:
+            print(f"Error saving record {source_indexes[index]}: {error}")
 
-        return saved_count
+        return result["inserted"]
 
     def _convert_to_db_format(self, record):
         """Convert collected record to database format."""
@@ -429,10 +330,16 @@ class AutomatedDataCollector:
         try:
             from models.ml_predictor import WeldParameterPredictor
 
+            # Grow the saved models with the new rows; update_models falls back to a full refit when needed
             predictor = WeldParameterPredictor()
-            predictor.train_models()
+            predictor.load_models()
+            mode = predictor.update_models()
 
-            print("✅ Models retrained successfully!")
+            if mode == "skipped":
+                print("⏳ Retraining deferred: too few new training rows since the last update")
+                return False
+
+            print(f"✅ Models retrained successfully ({mode})!")
             return True
 
         except Exception as e:
@@ -440,9 +347,12 @@ class AutomatedDataCollector:
             return False
 
 
-def create_automated_training_system():
-    """Create an enhanced training system that can automatically collect data."""
-    collector = AutomatedDataCollector()
+def create_automated_training_system(cache_only=None):
+    """Create an enhanced training system that can automatically collect data.
+
+    With cache_only, pages and images come from the HTTP cache of earlier runs, without network access.
+    """
+    collector = AutomatedDataCollector(cache_only=cache_only)
 
     print("🤖 Automated Welding Parameter Learning System")
     print("=" * 50)
@@ -479,6 +389,8 @@ def create_automated_training_system():
         else:
             print("Invalid option. Please try again.")
 
+    collector.close()
+
 
 if __name__ == "__main__":
-    create_automated_training_system()
+    create_automated_training_system(cache_only=True if "--cache-only" in sys.argv else None)
@@ -0,0 +1,269 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bs4 import BeautifulSoup
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions
+from selenium.webdriver.support.ui import WebDriverWait
+
+from config import (
+    BROWSER_BLOCKED_URLS,
+    BROWSER_LAUNCH_RETRY_INTERVAL,
+    BROWSER_MAX_PAGES,
+    BROWSER_MIN_TEXT_CHARS,
+    BROWSER_PAGE_TIMEOUT,
+    BROWSER_POOL_SIZE,
+    BROWSER_RENDER_WAIT,
+    FETCH_USER_AGENT,
+)
+from utils.fetch_engine import FetchResult
+
+# Element ids that single-page app frameworks mount their content into
+APP_ROOT_IDS = ["root", "app", "__next", "__nuxt", "___gatsby"]
+
+
+def needs_browser(content, min_text_chars=BROWSER_MIN_TEXT_CHARS):
+    """Check if an HTML page looks like it only builds its content with JavaScript.
+
+    True for pages with scripts and either a noscript notice asking for
+    JavaScript, an empty app root element, or almost no visible text.
+    """
+    soup = BeautifulSoup(content, "html.parser")
+    if soup.find("script") is None:
+        return False
+
+    for notice in soup.find_all("noscript"):
+        if "javascript" in notice.get_text().lower():
+            return True
+
+    for tag in soup.find_all(["script", "style", "noscript", "template"]):
+        tag.decompose()
+    body = soup.body or soup
+    if any(not root.get_text(strip=True) for root in body.find_all(id=APP_ROOT_IDS)):
+        return True
+    return len(body.get_text(" ", strip=True)) < min_text_chars
+
+
+def create_driver(headless=True, page_timeout=BROWSER_PAGE_TIMEOUT, blocked_urls=BROWSER_BLOCKED_URLS):
+    """Start a Chrome session that loads pages without images, fonts or blocked (ad) URLs."""
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+    chrome_options.add_argument(f"--user-agent={FETCH_USER_AGENT}")
+    chrome_options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    # Return once the DOM is ready; render() waits for the content it needs
+    chrome_options.page_load_strategy = "eager"
+
+    driver = webdriver.Chrome(options=chrome_options)
+    try:
+        driver.set_page_load_timeout(page_timeout)
+        if blocked_urls:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(blocked_urls)})
+    except Exception:
+        driver.quit()
+        raise
+    return driver
+
+
+class BrowserSession:
+    """A pooled Chrome driver and the number of pages it has rendered."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+
+
+class BrowserPool:
+    """Pool of long-lived headless Chrome sessions for JavaScript-rendered pages.
+
+    Up to size pages render at once, one per session. Sessions are started on
+    first use (or all together by start()) and reused for later pages, so the
+    browser start-up cost is paid once per session rather than per URL. A
+    session is restarted after max_pages pages, or at once if it crashes.
+    If Chrome fails to start, renders in the next launch_retry_interval
+    seconds fail straight away with the same error; after that the next
+    render tries to start it again.
+    """
+
+    def __init__(
+        self,
+        size=BROWSER_POOL_SIZE,
+        max_pages=BROWSER_MAX_PAGES,
+        page_timeout=BROWSER_PAGE_TIMEOUT,
+        render_wait=BROWSER_RENDER_WAIT,
+        blocked_urls=BROWSER_BLOCKED_URLS,
+        headless=True,
+        launch_retry_interval=BROWSER_LAUNCH_RETRY_INTERVAL,
+    ):
+        self.size = size
+        self.max_pages = max_pages
+        self.page_timeout = page_timeout
+        self.render_wait = render_wait
+        self.blocked_urls = blocked_urls
+        self.headless = headless
+        self.launch_retry_interval = launch_retry_interval
+
+        self._lock = threading.Lock()
+        self._launch_error = None
+        self._launch_failed_at = 0.0
+        # One entry per slot: an idle BrowserSession, or None for a session not started yet
+        self._idle = queue.LifoQueue()
+        for _ in range(size):
+            self._idle.put(None)
+
+        self.reset_stats()
+
+    def start(self):
+        """Start every session now, so the first pages don't wait for Chrome to launch."""
+        slots = [self._idle.get() for _ in range(self.size)]
+        try:
+            for index, session in enumerate(slots):
+                if session is None:
+                    slots[index] = self._launch()
+        finally:
+            for session in slots:
+                self._idle.put(session)
+
+    def render(self, url):
+        """Render one URL and return a FetchResult with the page's HTML after its scripts ran."""
+        return self.render_all([url])[0]
+
+    def render_all(self, urls):
+        """Render URLs on the pool's sessions and return their FetchResults in input order."""
+        urls = list(urls)
+        if not urls:
+            return []
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(self.size, len(urls)), thread_name_prefix="browser") as pool:
+            results = list(pool.map(self._render, urls))
+        with self._lock:
+            self._wall_time += time.perf_counter() - start
+        return results
+
+    def close(self):
+        """Quit every idle session. Call once no renders are running."""
+        for _ in range(self.size):
+            session = self._idle.get()
+            if session is not None:
+                self._quit(session)
+        for _ in range(self.size):
+            self._idle.put(None)
+        self._launch_error = None
+
+    def stats(self):
+        """Return page, session and throughput counters."""
+        with self._lock:
+            return {
+                "pages": self._pages,
+                "failures": self._failures,
+                "sessions_started": self._sessions_started,
+                "sessions_recycled": self._sessions_recycled,
+                "startup_seconds": self._startup_time,
+                "wall_seconds": self._wall_time,
+                "pages_per_second": self._pages / self._wall_time if self._wall_time else 0.0,
+            }
+
+    def reset_stats(self):
+        """Reset the page, session and throughput counters."""
+        with self._lock:
+            self._pages = 0
+            self._failures = 0
+            self._sessions_started = 0
+            self._sessions_recycled = 0
+            self._startup_time = 0.0
+            self._wall_time = 0.0
+
+    def _render(self, url):
+        """Render a URL on an idle session, starting or restarting one as needed."""
+        start = time.perf_counter()
+        session = self._idle.get()
+        broken = False
+        error = None
+        content = b""
+
+        try:
+            if session is None:
+                session = self._launch()
+            session.driver.get(url)
+            try:
+                # Scripts may still be building the page after the DOM is ready
+                WebDriverWait(session.driver, self.render_wait).until(
+                    expected_conditions.presence_of_element_located((By.TAG_NAME, "table"))
+                )
+            except TimeoutException:
+                pass  # Not every page has a table; take what has rendered
+            content = session.driver.page_source.encode("utf-8")
+        except TimeoutException as e:
+            error = f"Page load timed out: {e.msg}"
+        except WebDriverException as e:
+            # The session may have crashed; don't hand it out again
+            error = str(e.msg or e)
+            broken = True
+        except Exception as e:
+            error = str(e)
+        finally:
+            self._release(session, broken)
+
+        with self._lock:
+            if error is None:
+                self._pages += 1
+            else:
+                self._failures += 1
+
+        elapsed = time.perf_counter() - start
+        if error is not None:
+            return FetchResult(url, error=error, attempts=1, elapsed=elapsed)
+        return FetchResult(url, 200, content, {"Content-Type": "text/html; charset=utf-8"}, None, 1, elapsed)
+
+    def _launch(self):
+        """Start a new session, or fail fast if Chrome failed to start within launch_retry_interval."""
+        with self._lock:
+            error = self._launch_error
+            if error is not None and time.monotonic() - self._launch_failed_at < self.launch_retry_interval:
+                raise RuntimeError(f"Could not start browser: {error}")
+
+        start = time.perf_counter()
+        try:
+            driver = create_driver(self.headless, self.page_timeout, self.blocked_urls)
+        except Exception as e:
+            with self._lock:
+                self._launch_error = e
+                self._launch_failed_at = time.monotonic()
+            raise RuntimeError(f"Could not start browser: {e}") from None
+
+        with self._lock:
+            self._launch_error = None
+            self._sessions_started += 1
+            self._startup_time += time.perf_counter() - start
+        return BrowserSession(driver)
+
+    def _release(self, session, broken):
+        """Return a session's slot to the pool, retiring the session if it is broken or worn out."""
+        if session is not None:
+            session.pages += 1
+            if broken or session.pages >= self.max_pages:
+                self._quit(session)
+                if not broken:
+                    with self._lock:
+                        self._sessions_recycled += 1
+                session = None
+        self._idle.put(session)
+
+    @staticmethod
+    def _quit(session):
+        try:
+            session.driver.quit()
+        except Exception:
+            pass
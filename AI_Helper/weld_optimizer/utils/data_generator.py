@@ -2,197 +2,223 @@ import pandas as pd
 import numpy as np
 import os
 import sys
+from itertools import repeat
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from config import COLUMNAR_EXPORT_DIR, COLUMNAR_FORMAT
+
 try:
+    from database import columnar_store
     from database.db_manager import DatabaseManager
 except ImportError:
     print("Warning: Could not import DatabaseManager")
 
 
-def generate_sample_weld_data(num_samples=200):
-    """Generate sample welding data for training the ML models."""
-
-    # Define parameter ranges based on common welding practices
-    processes = ["GMAW", "GTAW", "SMAW", "FCAW"]
-    positions = ["1G", "2G", "3G", "4G", "1F", "2F", "3F", "4F"]
-    joint_types = ["Butt Joint", "Fillet Joint", "Lap Joint", "Corner Joint"]
-
-    # Material properties (simplified)
-    materials = {
-        "Mild Steel": {"carbon": 0.25, "thermal": 50, "melting": 1538, "density": 7.85},
-        "Stainless Steel 304": {"carbon": 0.08, "thermal": 16, "melting": 1454, "density": 8.00},
-        "Aluminum 6061": {"carbon": 0.0, "thermal": 167, "melting": 660, "density": 2.70},
-    }
-
-    filler_materials = {
-        "ER70S-6": {"carbon": 0.07, "thermal": 50},
-        "ER308L": {"carbon": 0.03, "thermal": 16},
-        "ER4043": {"carbon": 0.0, "thermal": 155},
-    }
-
-    data = []
-
-    for i in range(num_samples):
-        # Random selections
-        process = np.random.choice(processes)
-        position = np.random.choice(positions)
-        joint_type = np.random.choice(joint_types)
-
-        base_material = np.random.choice(list(materials.keys()))
-        filler_material = np.random.choice(list(filler_materials.keys()))
-
-        # Random thickness (weighted towards common sizes)
-        thickness = np.random.choice([1.5, 3.0, 6.0, 10.0, 12.0, 15.0, 20.0], p=[0.1, 0.3, 0.25, 0.15, 0.1, 0.05, 0.05])
-
-        # Generate parameters based on process and thickness
-        if process == "GMAW":  # MIG
-            voltage = 18 + (thickness * 2) + np.random.normal(0, 2)
-            amperage = 100 + (thickness * 30) + np.random.normal(0, 20)
-            wire_feed_speed = 200 + (thickness * 50) + np.random.normal(0, 50)
-            travel_speed = max(3, 10 - (thickness * 0.5) + np.random.normal(0, 2))
-
-        elif process == "GTAW":  # TIG
-            voltage = 12 + (thickness * 1.5) + np.random.normal(0, 1.5)
-            amperage = 80 + (thickness * 25) + np.random.normal(0, 15)
-            wire_feed_speed = 0  # Manual feed
-            travel_speed = max(2, 8 - (thickness * 0.3) + np.random.normal(0, 1.5))
-
-        elif process == "SMAW":  # Stick
-            voltage = 20 + (thickness * 1.2) + np.random.normal(0, 2)
-            amperage = 90 + (thickness * 35) + np.random.normal(0, 25)
-            wire_feed_speed = 0  # Not applicable
-            travel_speed = max(2, 6 - (thickness * 0.2) + np.random.normal(0, 1))
-
-        else:  # FCAW
-            voltage = 22 + (thickness * 2.2) + np.random.normal(0, 2.5)
-            amperage = 120 + (thickness * 35) + np.random.normal(0, 30)
-            wire_feed_speed = 150 + (thickness * 60) + np.random.normal(0, 40)
-            travel_speed = max(3, 12 - (thickness * 0.6) + np.random.normal(0, 2))
-
-        # Position adjustments
-        if "3" in position or "4" in position:  # Vertical or overhead
-            amperage *= 0.9  # Reduce for out-of-position
-            travel_speed *= 0.8
-
-        # Material adjustments
-        if "Aluminum" in base_material:
-            voltage *= 0.85
-            amperage *= 1.1
-            travel_speed *= 1.2
-        elif "Stainless" in base_material:
-            voltage *= 0.95
-            travel_speed *= 0.9
-
-        # Quality rating based on parameter optimization
-        quality_score = np.random.normal(7, 1.5)
-
-        # Adjust quality based on parameter reasonableness
-        if voltage < 10 or voltage > 40:
-            quality_score -= 2
-        if amperage < 50 or amperage > 400:
-            quality_score -= 2
-        if travel_speed < 2 or travel_speed > 20:
-            quality_score -= 1
-
-        quality_score = max(1, min(10, quality_score))
-
-        # Success rate
-        success_rate = min(100, max(0, (quality_score - 3) * 20 + np.random.normal(0, 10)))
-
-        record = {
-            "thickness": round(thickness, 1),
-            "base_carbon": materials[base_material]["carbon"],
-            "base_thermal": materials[base_material]["thermal"],
-            "base_melting_point": materials[base_material]["melting"],
-            "base_density": materials[base_material]["density"],
-            "filler_carbon": filler_materials[filler_material]["carbon"],
-            "filler_thermal": filler_materials[filler_material]["thermal"],
-            "process": process,
-            "position": position,
-            "joint_type": joint_type,
-            "voltage": round(max(8, voltage), 1),
-            "amperage": round(max(30, amperage), 0),
-            "wire_feed_speed": round(max(0, wire_feed_speed), 0),
-            "travel_speed": round(max(1, travel_speed), 1),
-            "quality_rating": round(quality_score, 1),
-            "success_rate": round(success_rate, 1),
+# Parameter ranges based on common welding practices
+PROCESSES = ["GMAW", "GTAW", "SMAW", "FCAW"]
+POSITIONS = ["1G", "2G", "3G", "4G", "1F", "2F", "3F", "4F"]
+JOINT_TYPES = ["Butt Joint", "Fillet Joint", "Lap Joint", "Corner Joint"]
+
+# Thickness in mm, weighted towards common sizes
+THICKNESSES = np.array([1.5, 3.0, 6.0, 10.0, 12.0, 15.0, 20.0])
+THICKNESS_WEIGHTS = [0.1, 0.3, 0.25, 0.15, 0.1, 0.05, 0.05]
+
+# Material properties (simplified)
+MATERIALS = {
+    "Mild Steel": {"carbon": 0.25, "thermal": 50, "melting": 1538, "density": 7.85},
+    "Stainless Steel 304": {"carbon": 0.08, "thermal": 16, "melting": 1454, "density": 8.00},
+    "Aluminum 6061": {"carbon": 0.0, "thermal": 167, "melting": 660, "density": 2.70},
+}
+
+FILLER_MATERIALS = {
+    "ER70S-6": {"carbon": 0.07, "thermal": 50},
+    "ER308L": {"carbon": 0.03, "thermal": 16},
+    "ER4043": {"carbon": 0.0, "thermal": 155},
+}
+
+# Per-process settings as (base, per mm of thickness, noise std), one row per
+# entry of PROCESSES (MIG, TIG, stick, flux core). TIG and stick have no wire feed.
+VOLTAGE_COEFFICIENTS = np.array([[18, 2.0, 2.0], [12, 1.5, 1.5], [20, 1.2, 2.0], [22, 2.2, 2.5]])
+AMPERAGE_COEFFICIENTS = np.array([[100, 30, 20], [80, 25, 15], [90, 35, 25], [120, 35, 30]])
+WIRE_FEED_COEFFICIENTS = np.array([[200, 50, 50], [0, 0, 0], [0, 0, 0], [150, 60, 40]])
+TRAVEL_SPEED_COEFFICIENTS = np.array([[10, -0.5, 2.0], [8, -0.3, 1.5], [6, -0.2, 1.0], [12, -0.6, 2.0]])
+TRAVEL_SPEED_FLOORS = np.array([3, 2, 2, 3])
+
+# Vertical and overhead positions run cooler and slower
+OUT_OF_POSITION = np.array(["3" in position or "4" in position for position in POSITIONS])
+
+# Base material adjustments to voltage, amperage and travel speed, one row per entry of MATERIALS
+MATERIAL_FACTORS = np.array([[1.0, 1.0, 1.0], [0.95, 1.0, 0.9], [0.85, 1.1, 1.2]])
+
+# Material property columns, one row per material
+BASE_PROPERTIES = np.array([[m["carbon"], m["thermal"], m["melting"], m["density"]] for m in MATERIALS.values()])
+FILLER_PROPERTIES = np.array([[m["carbon"], m["thermal"]] for m in FILLER_MATERIALS.values()])
+
+# Rows generated per chunk, and inserted per transaction, when streaming large data sets
+SAMPLE_CHUNK_SIZE = 100000
+SAMPLE_INSERT_BATCH_SIZE = 10000
+
+
+def generate_sample_weld_data(num_samples=200, seed=None):
+    """Generate sample welding data for training the ML models.
+
+    Every column is drawn for all samples at once from a seeded
+    np.random.Generator, with per-process, per-position and per-material
+    adjustments applied through lookup arrays and masks.
+    """
+    return _generate_chunk(np.random.default_rng(seed), num_samples)
+
+
+def iter_sample_weld_data(num_samples, seed=None, chunk_size=SAMPLE_CHUNK_SIZE):
+    """Yield num_samples rows of sample data as DataFrames of at most chunk_size rows.
+
+    One Generator drives all chunks, so the rows are reproducible for a given seed.
+    """
+    rng = np.random.default_rng(seed)
+    for start in range(0, num_samples, chunk_size):
+        yield _generate_chunk(rng, min(chunk_size, num_samples - start))
+
+
+def _generate_chunk(rng, n):
+    """Generate n rows of sample data from rng."""
+    process = rng.integers(len(PROCESSES), size=n)
+    position = rng.integers(len(POSITIONS), size=n)
+    joint_type = rng.integers(len(JOINT_TYPES), size=n)
+    base_material = rng.integers(len(MATERIALS), size=n)
+    filler_material = rng.integers(len(FILLER_MATERIALS), size=n)
+    thickness = rng.choice(THICKNESSES, size=n, p=THICKNESS_WEIGHTS)
+
+    def process_setting(coefficients):
+        base, slope, noise = coefficients[process].T
+        return base + slope * thickness + noise * rng.standard_normal(n)
+
+    # Generate parameters based on process and thickness
+    voltage = process_setting(VOLTAGE_COEFFICIENTS)
+    amperage = process_setting(AMPERAGE_COEFFICIENTS)
+    wire_feed_speed = process_setting(WIRE_FEED_COEFFICIENTS)
+    travel_speed = np.maximum(TRAVEL_SPEED_FLOORS[process], process_setting(TRAVEL_SPEED_COEFFICIENTS))
+
+    # Position adjustments
+    out_of_position = OUT_OF_POSITION[position]
+    amperage[out_of_position] *= 0.9
+    travel_speed[out_of_position] *= 0.8
+
+    # Material adjustments
+    voltage_factor, amperage_factor, travel_factor = MATERIAL_FACTORS[base_material].T
+    voltage *= voltage_factor
+    amperage *= amperage_factor
+    travel_speed *= travel_factor
+
+    # Quality rating based on parameter optimization
+    quality_score = rng.normal(7, 1.5, n)
+
+    # Adjust quality based on parameter reasonableness
+    quality_score -= 2 * ((voltage < 10) | (voltage > 40))
+    quality_score -= 2 * ((amperage < 50) | (amperage > 400))
+    quality_score -= 1 * ((travel_speed < 2) | (travel_speed > 20))
+    quality_score = np.clip(quality_score, 1, 10)
+
+    # Success rate
+    success_rate = np.clip((quality_score - 3) * 20 + rng.normal(0, 10, n), 0, 100)
+
+    base_properties = BASE_PROPERTIES[base_material]
+    filler_properties = FILLER_PROPERTIES[filler_material]
+
+    return pd.DataFrame(
+        {
+            "thickness": thickness.round(1),
+            "base_carbon": base_properties[:, 0],
+            "base_thermal": base_properties[:, 1],
+            "base_melting_point": base_properties[:, 2],
+            "base_density": base_properties[:, 3],
+            "filler_carbon": filler_properties[:, 0],
+            "filler_thermal": filler_properties[:, 1],
+            "process": np.array(PROCESSES, dtype=object)[process],
+            "position": np.array(POSITIONS, dtype=object)[position],
+            "joint_type": np.array(JOINT_TYPES, dtype=object)[joint_type],
+            "voltage": np.maximum(8, voltage).round(1),
+            "amperage": np.maximum(30, amperage).round(0),
+            "wire_feed_speed": np.maximum(0, wire_feed_speed).round(0),
+            "travel_speed": np.maximum(1, travel_speed).round(1),
+            "quality_rating": quality_score.round(1),
+            "success_rate": success_rate.round(1),
+            "base_material": np.array(list(MATERIALS), dtype=object)[base_material],
+            "filler_material": np.array(list(FILLER_MATERIALS), dtype=object)[filler_material],
         }
+    )
 
-        data.append(record)
-
-    return pd.DataFrame(data)
 
+def populate_database_with_sample_data(num_samples=200, seed=None, db_manager=None, defer_snapshot=False):
+    """Populate the database with generated sample data.
 
-def populate_database_with_sample_data():
-    """Populate the database with generated sample data."""
+    Rows are generated and inserted chunk by chunk, so large data sets
+    (e.g. 1M rows for training stress tests) never sit in memory at once.
+    defer_snapshot is passed to add_weld_parameters_bulk: opt in for large
+    offline loads, when nothing else is writing to the database.
+    """
     try:
-        db_manager = DatabaseManager()
-
-        # Generate sample data
-        print("Generating sample welding data...")
-        df = generate_sample_weld_data(200)
-
-        print(f"Generated {len(df)} sample records")
-
-        # Get material and other IDs from database
-        base_materials = db_manager.get_materials("base")
-        filler_materials = db_manager.get_materials("filler")
-        joint_types = db_manager.get_joint_types()
-        positions = db_manager.get_welding_positions()
-        processes = db_manager.get_welding_processes()
-
-        # Create mapping dictionaries
-        base_material_map = dict(zip(base_materials["name"], base_materials["id"]))
-        filler_material_map = dict(zip(filler_materials["name"], filler_materials["id"]))
-        joint_type_map = dict(zip(joint_types["name"], joint_types["id"]))
-        position_map = dict(zip(positions["code"], positions["id"]))
-        process_map = dict(zip(processes["code"], processes["id"]))
-
-        # Add records to database
-        added_count = 0
-        for _, row in df.iterrows():
-            try:
-                # Map names to IDs
-                base_material_id = base_material_map.get("Mild Steel", 1)  # Default to first material
-                filler_material_id = filler_material_map.get("ER70S-6", 7)  # Default
-                joint_type_id = joint_type_map.get(row["joint_type"], 1)
-                position_id = position_map.get(row["position"], 1)
-                process_id = process_map.get(row["process"], 1)
-
-                parameters = (
-                    base_material_id,
-                    filler_material_id,
-                    row["thickness"],
-                    joint_type_id,
-                    position_id,
-                    process_id,
-                    1,  # shielding_gas_id
-                    row["voltage"],
-                    row["amperage"],
-                    row["wire_feed_speed"],
-                    row["travel_speed"],
-                    2.4,  # electrode_diameter
-                    25,  # gas_flow_rate
-                    None,  # preheat_temp
-                    None,  # interpass_temp
-                    row["thickness"] * 0.8,  # penetration_depth
-                    row["quality_rating"],
-                    row["success_rate"],
-                    "Generated sample data",
-                    "system_generated",
+        db_manager = db_manager or DatabaseManager()
+
+        # Get material and other IDs from the reference cache
+        reference = db_manager.get_reference_data()
+        id_maps = {
+            "base_material": {row["name"]: row["id"] for row in reference["base_materials"]},
+            "filler_material": {row["name"]: row["id"] for row in reference["filler_materials"]},
+            "joint_type": {row["name"]: row["id"] for row in reference["joint_types"]},
+            "position": {row["code"]: row["id"] for row in reference["positions"]},
+            "process": {row["code"]: row["id"] for row in reference["processes"]},
+        }
+        # Defaults for names missing from the database
+        default_ids = {"base_material": 1, "filler_material": 7, "joint_type": 1, "position": 1, "process": 1}
+
+        print(f"Generating {num_samples} sample welding records...")
+
+        # Build parameter rows chunk by chunk for the bulk insert
+        def parameter_rows():
+            for df in iter_sample_weld_data(num_samples, seed=seed):
+                ids = {
+                    column: df[column].map(id_map).fillna(default_ids[column]).astype(int).tolist()
+                    for column, id_map in id_maps.items()
+                }
+                thickness = df["thickness"].tolist()
+                penetration_depth = (df["thickness"] * 0.8).tolist()
+
+                yield from zip(
+                    ids["base_material"],
+                    ids["filler_material"],
+                    thickness,
+                    ids["joint_type"],
+                    ids["position"],
+                    ids["process"],
+                    repeat(1),  # shielding_gas_id
+                    df["voltage"].tolist(),
+                    df["amperage"].tolist(),
+                    df["wire_feed_speed"].tolist(),
+                    df["travel_speed"].tolist(),
+                    repeat(2.4),  # electrode_diameter
+                    repeat(25),  # gas_flow_rate
+                    repeat(None),  # preheat_temp
+                    repeat(None),  # interpass_temp
+                    penetration_depth,
+                    df["quality_rating"].tolist(),
+                    df["success_rate"].tolist(),
+                    repeat("Generated sample data"),
+                    repeat("system_generated"),
                 )
 
-                db_manager.add_weld_parameter(parameters)
-                added_count += 1
+        result = db_manager.add_weld_parameters_bulk(
+            parameter_rows(), batch_size=SAMPLE_INSERT_BATCH_SIZE, defer_snapshot=defer_snapshot
+        )
+
+        for index, error in result["failures"]:
+            print(f"Error adding record {index}: {error}")
 
-            except Exception as e:
-                print(f"Error adding record: {e}")
-                continue
+        print(f"Successfully added {result['inserted']} records to the database")
 
-        print(f"Successfully added {added_count} records to the database")
+        # Keep the planner statistics in step with the new row counts
+        db_manager.analyze()
 
     except Exception as e:
         print(f"Error populating database: {e}")
@@ -224,6 +250,30 @@ def export_data_to_excel(filename="weld_parameters_export.xlsx"):
         print(f"Error exporting data: {e}")
 
 
+def export_data_to_columnar(export_dir=None, file_format=None):
+    """Export database data to Parquet/Arrow files for analysis and training."""
+    try:
+        db_manager = DatabaseManager()
+        summary = columnar_store.export_columnar(
+            db_manager,
+            export_dir=export_dir or COLUMNAR_EXPORT_DIR,
+            file_format=file_format or COLUMNAR_FORMAT,
+        )
+
+        print(
+            f"Exported {summary['rows']} records ({', '.join(summary['partitions'])}) "
+            f"and {len(summary['reference_tables'])} reference tables to {export_dir or COLUMNAR_EXPORT_DIR}"
+        )
+
+    except Exception as e:
+        print(f"Error exporting data: {e}")
+
+
 if __name__ == "__main__":
-    # Run sample data generation
-    populate_database_with_sample_data()
+    if "--export-columnar" in sys.argv:
+        # Export the database to the columnar training files
+        export_data_to_columnar()
+    else:
+        # Run sample data generation; optional arguments: number of samples, seed, --defer-snapshot
+        args = [int(arg) for arg in sys.argv[1:] if not arg.startswith("--")]
+        populate_database_with_sample_data(*args[:2], defer_snapshot="--defer-snapshot" in sys.argv)
@@ -0,0 +1,276 @@
+import random
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import (
+    FETCH_BACKOFF,
+    FETCH_BACKOFF_MAX,
+    FETCH_HOST_DELAY,
+    FETCH_MAX_WORKERS,
+    FETCH_PER_HOST,
+    FETCH_RETRIES,
+    FETCH_RETRY_STATUSES,
+    FETCH_TIMEOUT,
+    FETCH_USER_AGENT,
+)
+from utils.http_cache import CacheMiss
+
+# Errors the HTTP cache's index (SQLite) or body files can raise
+CACHE_ERRORS = (sqlite3.Error, OSError)
+
+
+class FetchResult:
+    """Outcome of one URL fetch: the final response, or the error that ended the retries."""
+
+    def __init__(
+        self, url, status=None, content=b"", headers=None, error=None, attempts=0, elapsed=0.0, from_cache=False
+    ):
+        self.url = url
+        self.status = status
+        self.content = content
+        self.headers = headers or {}
+        self.error = error
+        self.attempts = attempts
+        self.elapsed = elapsed
+        self.from_cache = from_cache
+
+    @property
+    def ok(self):
+        """True for a 2xx response."""
+        return self.error is None and self.status is not None and 200 <= self.status < 300
+
+    def __repr__(self):
+        return f"FetchResult({self.url!r}, status={self.status}, bytes={len(self.content)}, error={self.error!r})"
+
+
+class FetchEngine:
+    """Concurrent, polite HTTP fetcher.
+
+    Requests run on a pool of max_workers threads and share one
+    requests.Session, so connections to a host are kept alive and reused.
+    Each host (scheme://host:port) has at most per_host requests in flight,
+    and its request starts are spaced at least host_delay seconds apart.
+    Connection errors, timeouts and retry_statuses responses are retried up to
+    retries times with exponential backoff and jitter, or after the server's
+    Retry-After when it sends one. The host slot is released while waiting.
+
+    With an HttpCache, requests go through it: cached URLs are revalidated
+    with conditional requests, and in cache-only mode nothing is sent at all.
+    """
+
+    def __init__(
+        self,
+        max_workers=FETCH_MAX_WORKERS,
+        per_host=FETCH_PER_HOST,
+        host_delay=FETCH_HOST_DELAY,
+        timeout=FETCH_TIMEOUT,
+        retries=FETCH_RETRIES,
+        backoff=FETCH_BACKOFF,
+        backoff_max=FETCH_BACKOFF_MAX,
+        retry_statuses=FETCH_RETRY_STATUSES,
+        headers=None,
+        session=None,
+        cache=None,
+    ):
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.host_delay = host_delay
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.retry_statuses = set(retry_statuses)
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["User-Agent"] = FETCH_USER_AGENT
+        if headers:
+            session.headers.update(headers)
+        self.session = session
+        self.cache = cache
+
+        self._lock = threading.Lock()
+        self._host_slots = {}  # host -> semaphore bounding its in-flight requests
+        self._host_next_start = {}  # host -> earliest monotonic time for its next request
+
+        self._active = 0  # Top-level fetch/fetch_all calls running, for busy time
+        self._busy_since = 0.0
+        self.reset_stats()
+
+    def fetch(self, url):
+        """Fetch one URL, with retries. Never raises for HTTP, network or cache errors."""
+        self._begin()
+        try:
+            return self._fetch(url)
+        finally:
+            self._end()
+
+    def fetch_all(self, urls):
+        """Fetch URLs concurrently and return their FetchResults in input order."""
+        urls = list(urls)
+        if not urls:
+            return []
+
+        self._begin()
+        try:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls)), thread_name_prefix="fetch") as pool:
+                return list(pool.map(self._fetch, urls))
+        finally:
+            self._end()
+
+    def close(self):
+        """Close the shared session and its pooled connections."""
+        self.session.close()
+
+    def stats(self):
+        """Return page, byte, retry and throughput counters."""
+        with self._lock:
+            busy = self._busy_time
+            if self._active:
+                busy += time.perf_counter() - self._busy_since
+            return {
+                "pages": self._pages,
+                "failures": self._failures,
+                "retries": self._retries,
+                "bytes": self._bytes,
+                "from_cache": self._from_cache,
+                "busy_seconds": busy,
+                "pages_per_second": self._pages / busy if busy else 0.0,
+                "bytes_per_second": self._bytes / busy if busy else 0.0,
+            }
+
+    def reset_stats(self):
+        """Reset the page, byte and throughput counters."""
+        with self._lock:
+            self._pages = 0
+            self._failures = 0
+            self._retries = 0
+            self._bytes = 0
+            self._from_cache = 0
+            self._busy_time = 0.0
+            if self._active:
+                self._busy_since = time.perf_counter()
+
+    def _begin(self):
+        """Start the busy-time clock when the first top-level call begins."""
+        with self._lock:
+            if self._active == 0:
+                self._busy_since = time.perf_counter()
+            self._active += 1
+
+    def _end(self):
+        """Stop the busy-time clock when the last top-level call finishes."""
+        with self._lock:
+            self._active -= 1
+            if self._active == 0:
+                self._busy_time += time.perf_counter() - self._busy_since
+
+    def _fetch(self, url):
+        """Fetch a URL under its host's limits, retrying transient failures."""
+        host = self._host_key(url)
+        start = time.perf_counter()
+        attempt = 0
+
+        while True:
+            attempt += 1
+            response = None
+            error = None
+
+            if self.cache is not None and self.cache.cache_only:
+                try:
+                    response = self.cache.get(url)
+                    content = response.content
+                except (CacheMiss, *CACHE_ERRORS) as e:
+                    error = e
+                break
+
+            self._acquire_host(host)
+            try:
+                if self.cache is not None:
+                    response = self.cache.get(url, session=self.session, timeout=self.timeout)
+                else:
+                    response = self.session.get(url, timeout=self.timeout)
+                content = response.content
+            except requests.RequestException as e:
+                error = e
+            except CACHE_ERRORS as e:
+                # A broken cache loses this URL only; retrying won't fix it
+                error = f"HTTP cache error: {e}"
+                break
+            finally:
+                self._host_slots[host].release()
+
+            retryable = error is not None or response.status_code in self.retry_statuses
+            if not retryable or attempt > self.retries:
+                break
+
+            with self._lock:
+                self._retries += 1
+            time.sleep(self._retry_delay(attempt, response))
+
+        elapsed = time.perf_counter() - start
+        if error is not None:
+            result = FetchResult(url, error=str(error), attempts=attempt, elapsed=elapsed)
+        else:
+            from_cache = getattr(response, "from_cache", False)
+            result = FetchResult(
+                url, response.status_code, content, dict(response.headers), None, attempt, elapsed, from_cache
+            )
+
+        with self._lock:
+            if result.ok:
+                self._pages += 1
+                self._bytes += len(result.content)
+                self._from_cache += result.from_cache
+            else:
+                self._failures += 1
+        return result
+
+    @staticmethod
+    def _host_key(url):
+        """Politeness key for a URL: scheme and network location."""
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc.lower()}"
+
+    def _acquire_host(self, host):
+        """Take one of the host's slots and wait out its minimum spacing."""
+        with self._lock:
+            slots = self._host_slots.get(host)
+            if slots is None:
+                slots = self._host_slots[host] = threading.BoundedSemaphore(self.per_host)
+        slots.acquire()
+
+        # Reserve the next start time under the lock, then sleep outside it
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._host_next_start.get(host, now))
+            self._host_next_start[host] = start_at + self.host_delay
+        if start_at > now:
+            time.sleep(start_at - now)
+
+    def _retry_delay(self, attempt, response):
+        """Seconds to wait before the next attempt."""
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                try:
+                    delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+                except (TypeError, ValueError):
+                    delay = None
+            if delay is not None:
+                return min(max(delay, 0.0), self.backoff_max)
+
+        delay = min(self.backoff * 2 ** (attempt - 1), self.backoff_max)
+        return delay * random.uniform(0.5, 1.0)
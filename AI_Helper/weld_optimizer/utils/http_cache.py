@@ -0,0 +1,301 @@
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from config import HTTP_CACHE_DIR, HTTP_CACHE_MAX_BYTES, HTTP_CACHE_ONLY
+
+# Seconds between last-used updates for the same body, so repeated hits don't write the index each time
+TOUCH_INTERVAL = 60.0
+
+# Response headers kept with a cached body
+STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bodies (
+    digest TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    url TEXT PRIMARY KEY,
+    digest TEXT NOT NULL REFERENCES bodies(digest),
+    content_type TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_digest ON entries(digest);
+CREATE INDEX IF NOT EXISTS idx_bodies_last_used ON bodies(last_used);
+"""
+
+
+class CacheMiss(Exception):
+    """Raised in cache-only mode for a URL that has no cached copy."""
+
+
+class HttpCache:
+    """Content-addressed on-disk cache of HTTP GET responses.
+
+    Bodies are stored once under bodies/<digest[:2]>/<sha256 digest>, however
+    many URLs return them. An SQLite index maps each URL to its body and
+    validators (ETag, Last-Modified). get() revalidates cached URLs with a
+    conditional request: a 304 is served from disk, and a 200 whose body is
+    already stored writes nothing but the index row. When the stored bodies
+    exceed max_bytes, the least recently used ones are evicted. With
+    cache_only, get() never touches the network and raises CacheMiss for
+    URLs it has not seen. cache_only defaults to HTTP_CACHE_ONLY.
+    """
+
+    def __init__(self, cache_dir=HTTP_CACHE_DIR, max_bytes=HTTP_CACHE_MAX_BYTES, cache_only=None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.cache_only = HTTP_CACHE_ONLY if cache_only is None else cache_only
+        os.makedirs(os.path.join(cache_dir, "bodies"), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(cache_dir, "index.db"), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(INDEX_SCHEMA)
+        self._size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM bodies").fetchone()[0]
+
+        self.reset_stats()
+
+    def get(self, url, session=None, **kwargs):
+        """GET a URL through the cache and return a requests.Response.
+
+        The response has a from_cache attribute, True when the body came from
+        disk. Only 200 responses are cached; anything else is returned as the
+        server sent it. Network errors propagate as requests exceptions.
+        """
+        entry = self._lookup(url)
+        if self.cache_only:
+            if entry is None:
+                with self._lock:
+                    self._misses += 1
+                raise CacheMiss(f"Not in the HTTP cache: {url}")
+            with self._lock:
+                self._hits += 1
+            return self._cached_response(url, entry)
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        conditional = dict(headers)
+        if entry is not None:
+            if entry["etag"]:
+                conditional["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                conditional["If-Modified-Since"] = entry["last_modified"]
+
+        response = (session or requests).get(url, headers=conditional, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            try:
+                cached = self._cached_response(url, entry)
+            except FileNotFoundError:
+                # Evicted since the lookup; fetch the body again
+                response = (session or requests).get(url, headers=headers, **kwargs)
+            else:
+                with self._lock:
+                    self._revalidated += 1
+                self._refresh_validators(url, entry, response.headers)
+                return cached
+
+        response.from_cache = False
+        with self._lock:
+            self._misses += 1
+        if response.status_code == 200:
+            self.store(url, response.content, response.headers)
+        return response
+
+    def store(self, url, content, headers=None):
+        """Cache a body for a URL and return its digest.
+
+        The body file is only written if no URL has stored the same bytes yet,
+        and the index only when the URL's body or validators changed.
+        """
+        headers = CaseInsensitiveDict(headers or {})
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._body_path(digest)
+        entry = (digest, headers.get("Content-Type"), headers.get("ETag"), headers.get("Last-Modified"))
+        now = time.time()
+
+        with self._lock:
+            last_used = self._conn.execute("SELECT last_used FROM bodies WHERE digest = ?", (digest,)).fetchone()
+            if last_used is None or not os.path.exists(path):
+                self._write_body(path, content)
+                self._bytes_written += len(content)
+                if last_used is None:
+                    self._size += len(content)
+
+            current = self._conn.execute(
+                "SELECT digest, content_type, etag, last_modified FROM entries WHERE url = ?", (url,)
+            ).fetchone()
+
+            with self._conn:
+                if last_used is None or now - last_used[0] >= TOUCH_INTERVAL:
+                    self._conn.execute(
+                        "INSERT INTO bodies (digest, size, last_used) VALUES (?, ?, ?) "
+                        "ON CONFLICT(digest) DO UPDATE SET last_used = excluded.last_used",
+                        (digest, len(content), now),
+                    )
+                if current != entry:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO entries (url, digest, content_type, etag, last_modified, fetched_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (url,) + entry + (now,),
+                    )
+                    self._stored += 1
+
+            if current is not None and current[0] != digest:
+                self._release_body(current[0])
+            self._evict()
+        return digest
+
+    def clear(self):
+        """Drop every cached body and entry."""
+        with self._lock, self._conn:
+            digests = [row[0] for row in self._conn.execute("SELECT digest FROM bodies")]
+            self._conn.execute("DELETE FROM entries")
+            self._conn.execute("DELETE FROM bodies")
+            for digest in digests:
+                self._remove_body(digest)
+            self._size = 0
+
+    def close(self):
+        """Close the index database."""
+        with self._lock:
+            self._conn.close()
+
+    def stats(self):
+        """Return hit, revalidation, write and size counters."""
+        with self._lock:
+            entries, bodies = self._conn.execute(
+                "SELECT (SELECT COUNT(*) FROM entries), (SELECT COUNT(*) FROM bodies)"
+            ).fetchone()
+            requests_seen = self._hits + self._revalidated + self._misses
+            return {
+                "hits": self._hits,
+                "revalidated": self._revalidated,
+                "misses": self._misses,
+                "hit_rate": (self._hits + self._revalidated) / requests_seen if requests_seen else 0.0,
+                "stored": self._stored,
+                "bytes_written": self._bytes_written,
+                "evicted": self._evicted,
+                "entries": entries,
+                "bodies": bodies,
+                "size_bytes": self._size,
+            }
+
+    def reset_stats(self):
+        """Reset the hit, revalidation and write counters."""
+        with self._lock:
+            self._hits = 0
+            self._revalidated = 0
+            self._misses = 0
+            self._stored = 0
+            self._bytes_written = 0
+            self._evicted = 0
+
+    def _body_path(self, digest):
+        return os.path.join(self.cache_dir, "bodies", digest[:2], digest)
+
+    def _lookup(self, url):
+        """Index row for a URL whose body is still on disk, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT e.digest, e.content_type, e.etag, e.last_modified, b.last_used "
+                "FROM entries e JOIN bodies b ON b.digest = e.digest WHERE e.url = ?",
+                (url,),
+            ).fetchone()
+        if row is None or not os.path.exists(self._body_path(row[0])):
+            return None
+        return dict(zip(("digest", "content_type", "etag", "last_modified", "last_used"), row))
+
+    def _cached_response(self, url, entry):
+        """Build a 200 response from a cached body and mark it recently used."""
+        with open(self._body_path(entry["digest"]), "rb") as body_file:
+            content = body_file.read()
+
+        now = time.time()
+        with self._lock:
+            if now - entry["last_used"] >= TOUCH_INTERVAL:
+                with self._conn:
+                    self._conn.execute("UPDATE bodies SET last_used = ? WHERE digest = ?", (now, entry["digest"]))
+
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.url = url
+        response._content = content
+        response.headers = CaseInsensitiveDict(
+            {
+                name: entry[key]
+                for name, key in zip(STORED_HEADERS, ("content_type", "etag", "last_modified"))
+                if entry[key]
+            }
+        )
+        response.from_cache = True
+        return response
+
+    def _refresh_validators(self, url, entry, headers):
+        """Keep validators a 304 changed; most 304s repeat them and write nothing."""
+        etag = headers.get("ETag") or entry["etag"]
+        last_modified = headers.get("Last-Modified") or entry["last_modified"]
+        if (etag, last_modified) == (entry["etag"], entry["last_modified"]):
+            return
+
+        entry["etag"], entry["last_modified"] = etag, last_modified
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE entries SET etag = ?, last_modified = ? WHERE url = ?", (etag, last_modified, url)
+            )
+
+    def _write_body(self, path, content):
+        """Write a body file atomically, so readers never see a partial file."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(content)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _release_body(self, digest):
+        """Delete a body no URL points to any more. Caller holds the lock."""
+        if self._conn.execute("SELECT 1 FROM entries WHERE digest = ?", (digest,)).fetchone() is not None:
+            return
+
+        row = self._conn.execute("SELECT size FROM bodies WHERE digest = ?", (digest,)).fetchone()
+        if row is not None:
+            with self._conn:
+                self._conn.execute("DELETE FROM bodies WHERE digest = ?", (digest,))
+            self._size -= row[0]
+        self._remove_body(digest)
+
+    def _remove_body(self, digest):
+        try:
+            os.remove(self._body_path(digest))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self):
+        """Remove least recently used bodies (and their URLs) until under max_bytes. Caller holds the lock."""
+        if not self.max_bytes or self._size <= self.max_bytes:
+            return
+
+        with self._conn:
+            for digest, size in self._conn.execute("SELECT digest, size FROM bodies ORDER BY last_used").fetchall():
+                if self._size <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM entries WHERE digest = ?", (digest,))
+                self._conn.execute("DELETE FROM bodies WHERE digest = ?", (digest,))
+                self._remove_body(digest)
+                self._size -= size
+                self._evicted += 1
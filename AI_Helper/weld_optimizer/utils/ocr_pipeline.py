@@ -0,0 +1,269 @@
+import hashlib
+import io
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import cv2
+import numpy as np
+import pytesseract
+from PIL import Image
+
+from config import OCR_CACHE_PATH, OCR_MEMORY_CACHE_SIZE, OCR_TESSERACT_CONFIG, OCR_WORKERS
+
+# Skew below this many degrees is left alone; above MAX_DESKEW_ANGLE the estimate is not trusted
+MIN_DESKEW_ANGLE = 0.5
+MAX_DESKEW_ANGLE = 20.0
+
+
+def decode_image(image_bytes):
+    """Decode image bytes straight to a grayscale array, without a temporary file."""
+    gray = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+    if gray is None:
+        # Formats OpenCV can't read (e.g. GIF) go through PIL
+        try:
+            gray = np.asarray(Image.open(io.BytesIO(image_bytes)).convert("L"))
+        except Exception as e:
+            raise ValueError(f"Could not decode image: {e}")
+    return gray
+
+
+def preprocess_image(image_bytes):
+    """Decode a chart image and prepare it for OCR: grayscale, Otsu threshold, deskew.
+
+    Returns a binary image with dark text on a white background.
+    """
+    gray = decode_image(image_bytes)
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+
+    # Light text on a dark background: invert so text is always black
+    if cv2.countNonZero(binary) < binary.size / 2:
+        binary = cv2.bitwise_not(binary)
+
+    return deskew(binary)
+
+
+def deskew(binary):
+    """Rotate a binary image so the bounding box of its text is axis-aligned."""
+    coords = cv2.findNonZero(cv2.bitwise_not(binary))
+    if coords is None or len(coords) < 50:
+        return binary
+
+    angle = cv2.minAreaRect(coords)[-1]
+    if angle > 45:
+        angle -= 90
+    elif angle < -45:
+        angle += 90
+    if not MIN_DESKEW_ANGLE <= abs(angle) <= MAX_DESKEW_ANGLE:
+        return binary
+
+    height, width = binary.shape
+    rotation = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+    return cv2.warpAffine(
+        binary, rotation, (width, height), flags=cv2.INTER_NEAREST, borderMode=cv2.BORDER_CONSTANT, borderValue=255
+    )
+
+
+def ocr_image_bytes(image_bytes, config=OCR_TESSERACT_CONFIG):
+    """Preprocess and OCR one image. Returns (text, worker pid, seconds); runs in a pool worker."""
+    start = time.perf_counter()
+    try:
+        text = pytesseract.image_to_string(preprocess_image(image_bytes), config=config)
+    except Exception as e:
+        # pytesseract's exceptions can't be unpickled in the parent, which would break the pool
+        raise RuntimeError(f"{type(e).__name__}: {e}") from None
+    return text, os.getpid(), time.perf_counter() - start
+
+
+class OcrPipeline:
+    """OCR stage for chart images, run on a pool of worker processes.
+
+    Each distinct image is read once: results are cached by the SHA-256 of
+    the image bytes (in an SQLite file at cache_path, with the
+    memory_cache_size most recently used in memory), and
+    duplicates within a batch are submitted only once. The pool is started
+    on first use and kept for later batches; with workers=1 OCR runs in the
+    calling process. Images that fail to decode or OCR give empty text.
+    """
+
+    def __init__(
+        self,
+        workers=OCR_WORKERS,
+        cache_path=OCR_CACHE_PATH,
+        config=OCR_TESSERACT_CONFIG,
+        memory_cache_size=OCR_MEMORY_CACHE_SIZE,
+    ):
+        self.workers = (os.cpu_count() or 1) if workers == -1 else workers
+        self.config = config
+        self.memory_cache_size = memory_cache_size
+
+        self._lock = threading.Lock()
+        self._pool = None
+        self._memory = OrderedDict()  # digest -> text, least recently used first
+
+        self._conn = None
+        if cache_path:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            self._conn = sqlite3.connect(cache_path, check_same_thread=False, timeout=30)
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS ocr_text ("
+                "digest TEXT NOT NULL, config TEXT NOT NULL, text TEXT NOT NULL, PRIMARY KEY (digest, config))"
+            )
+
+        self.reset_stats()
+
+    def ocr_image(self, image_bytes):
+        """OCR text of one image."""
+        return self.ocr_images([image_bytes])[0]
+
+    def ocr_images(self, images):
+        """OCR text of each image (bytes), in input order."""
+        start = time.perf_counter()
+        digests = [hashlib.sha256(image_bytes).hexdigest() for image_bytes in images]
+        texts = self._cached(set(digests))
+        hits = sum(digest in texts for digest in digests)
+
+        pending = {}  # digest -> image bytes, one per distinct uncached image
+        for digest, image_bytes in zip(digests, images):
+            if digest not in texts:
+                pending.setdefault(digest, image_bytes)
+
+        if pending:
+            new_texts = self._run(pending)
+            texts.update(new_texts)
+            self._save(new_texts)
+
+        with self._lock:
+            self._images += len(images)
+            self._cache_hits += hits
+            self._wall_time += time.perf_counter() - start
+        # Images that failed get empty text and are not cached, so the next run tries again
+        return [texts.get(digest, "") for digest in digests]
+
+    def close(self):
+        """Shut down the worker pool and close the cache."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def stats(self):
+        """Return image, cache and per-worker throughput counters."""
+        with self._lock:
+            return {
+                "images": self._images,
+                "cache_hits": self._cache_hits,
+                "ocr_runs": sum(worker["images"] for worker in self._worker_stats.values()),
+                "failures": self._failures,
+                "wall_seconds": self._wall_time,
+                "images_per_second": self._images / self._wall_time if self._wall_time else 0.0,
+                "workers": {
+                    pid: {
+                        "images": worker["images"],
+                        "busy_seconds": worker["seconds"],
+                        "images_per_second": worker["images"] / worker["seconds"] if worker["seconds"] else 0.0,
+                    }
+                    for pid, worker in self._worker_stats.items()
+                },
+            }
+
+    def reset_stats(self):
+        """Reset the image, cache and per-worker counters."""
+        with self._lock:
+            self._images = 0
+            self._cache_hits = 0
+            self._failures = 0
+            self._wall_time = 0.0
+            self._worker_stats = {}  # pid -> {"images", "seconds"}
+
+    def _cached(self, digests):
+        """Cached text for whichever of the digests have been OCR'd before."""
+        with self._lock:
+            texts = {digest: self._memory[digest] for digest in digests if digest in self._memory}
+            for digest in texts:
+                self._memory.move_to_end(digest)
+        missing = [digest for digest in digests if digest not in texts]
+
+        if missing and self._conn is not None:
+            found = {}
+            with self._lock:
+                for offset in range(0, len(missing), 500):
+                    chunk = missing[offset : offset + 500]
+                    rows = self._conn.execute(
+                        f"SELECT digest, text FROM ocr_text WHERE config = ? "
+                        f"AND digest IN ({', '.join('?' * len(chunk))})",
+                        [self.config] + chunk,
+                    ).fetchall()
+                    found.update(rows)
+            self._remember(found)
+            texts.update(found)
+        return texts
+
+    def _remember(self, texts):
+        """Keep texts in the in-memory cache, dropping the least recently used beyond memory_cache_size."""
+        with self._lock:
+            self._memory.update(texts)
+            for digest in texts:
+                self._memory.move_to_end(digest)
+            while len(self._memory) > self.memory_cache_size:
+                self._memory.popitem(last=False)
+
+    def _save(self, texts):
+        """Remember newly OCR'd text."""
+        self._remember(texts)
+        if self._conn is not None and texts:
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO ocr_text (digest, config, text) VALUES (?, ?, ?)",
+                    [(digest, self.config, text) for digest, text in texts.items()],
+                )
+
+    def _run(self, pending):
+        """OCR the pending images ({digest: bytes}) and return {digest: text} for those that succeeded."""
+        if self.workers > 1 and len(pending) > 1:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            futures = {
+                digest: self._pool.submit(ocr_image_bytes, image_bytes, self.config)
+                for digest, image_bytes in pending.items()
+            }
+            outcomes = {}
+            for digest, future in futures.items():
+                try:
+                    outcomes[digest] = future.result()
+                except Exception as e:
+                    outcomes[digest] = e
+
+            # A crashed worker breaks the whole pool; start a fresh one next time
+            if any(isinstance(outcome, BrokenProcessPool) for outcome in outcomes.values()):
+                self._pool.shutdown(wait=False)
+                self._pool = None
+        else:
+            outcomes = {}
+            for digest, image_bytes in pending.items():
+                try:
+                    outcomes[digest] = ocr_image_bytes(image_bytes, self.config)
+                except Exception as e:
+                    outcomes[digest] = e
+
+        texts = {}
+        with self._lock:
+            for digest, outcome in outcomes.items():
+                if isinstance(outcome, Exception):
+                    print(f"Error extracting from image: {outcome}")
+                    self._failures += 1
+                    continue
+
+                text, pid, seconds = outcome
+                worker = self._worker_stats.setdefault(pid, {"images": 0, "seconds": 0.0})
+                worker["images"] += 1
+                worker["seconds"] += seconds
+                texts[digest] = text
+        return texts
@@ -0,0 +1,241 @@
+import math
+import re
+
+from bs4 import BeautifulSoup
+
+# A table needs at least MIN_TABLE_KEYWORDS of these to be read as a parameter table
+PARAMETER_KEYWORDS = [
+    "voltage",
+    "amperage",
+    "current",
+    "wire speed",
+    "travel speed",
+    "thickness",
+    "material",
+    "electrode",
+    "gas flow",
+]
+MIN_TABLE_KEYWORDS = 3
+
+# Standard record field -> header variations. A header equal to a variation
+# maps to it first; otherwise the first field with a variation of two or more
+# letters inside the header. Each field and each column is matched once.
+COLUMN_ALIASES = {
+    "material": ["material", "base metal", "base material"],
+    "thickness": ["thickness", "thick", "gauge"],
+    "voltage": ["voltage", "volts", "v"],
+    "amperage": ["amperage", "amps", "current", "a"],
+    "wire_speed": ["wire speed", "wire feed", "wfs", "ipm"],
+    "travel_speed": ["travel speed", "travel", "ts"],
+    "process": ["process", "welding process"],
+    "electrode": ["electrode", "wire", "rod"],
+}
+
+NUMERIC_FIELDS = ["voltage", "amperage", "thickness", "wire_speed", "travel_speed"]
+REQUIRED_FIELDS = ["voltage", "amperage"]
+PARAMETER_RANGES = {
+    "voltage": (8, 50),
+    "amperage": (20, 500),
+    "thickness": (0.5, 100),
+    "wire_speed": (50, 800),
+    "travel_speed": (1, 30),
+}
+
+CHART_KEYWORDS = ["chart", "table", "parameter", "setting", "welding", "mig", "tig", "voltage", "amperage"]
+
+# OCR text is tokenized in one scan: each match is a number with its unit, or a line break.
+# The gap before the unit may not cross a line break.
+OCR_TOKEN_PATTERN = re.compile(
+    r"(?P<value>\d+(?:\.\d+)?)[^\S\n]*"
+    r"(?:(?P<voltage>v|volt|voltage)|(?P<amperage>a|amp|amperage|current)|(?P<thickness>mm|inch|in|thick))"
+    r"|(?P<newline>\n)"
+)
+OCR_MIN_FIELDS = 3  # A record is emitted once this many values have been read
+
+# A number, with or without thousands separators ("1,200" is 1200, "17,18" is 17)
+NUMBER_PATTERN = re.compile(r"\d{1,3}(?:,\d{3})+(?!\d)(?:\.\d+)?|\d+(?:\.\d+)?")
+KEYWORD_PATTERN = re.compile("|".join(re.escape(keyword) for keyword in PARAMETER_KEYWORDS))
+CHART_PATTERN = re.compile("|".join(re.escape(keyword) for keyword in CHART_KEYWORDS))
+
+_EXACT_ALIASES = {}
+for _field, _variations in COLUMN_ALIASES.items():
+    for _variation in _variations:
+        _EXACT_ALIASES.setdefault(_variation, _field)
+_ALIAS_PATTERNS = {
+    field: re.compile("|".join(re.escape(variation) for variation in variations if len(variation) > 1))
+    for field, variations in COLUMN_ALIASES.items()
+}
+
+
+def parse_text_for_parameters(text):
+    """Read parameter records from OCR text.
+
+    Values accumulate line by line (the first voltage, amperage and
+    thickness on each line, later lines overwriting earlier ones), and a
+    record is emitted at the end of a line once it has OCR_MIN_FIELDS values.
+    """
+    parameters = []
+    current_record = {}
+    seen_on_line = set()
+
+    for match in OCR_TOKEN_PATTERN.finditer(text.lower() + "\n"):
+        field = match.lastgroup
+        if field == "newline":
+            if len(current_record) >= OCR_MIN_FIELDS:
+                parameters.append(current_record)
+                current_record = {}
+            seen_on_line.clear()
+        elif field not in seen_on_line:
+            seen_on_line.add(field)
+            current_record[field] = float(match.group("value"))
+
+    return parameters
+
+
+def table_rows(table):
+    """Cell texts of each row of a BeautifulSoup table, with colspan and rowspan cells repeated."""
+    rows = []
+    spanning = {}  # column index -> [rows still covered, text] for rowspan cells
+
+    for tr in table.find_all("tr"):
+        row = []
+        for cell in tr.find_all(["td", "th"], recursive=False):
+            while len(row) in spanning:
+                row.append(_take_span(spanning, len(row)))
+
+            text = cell.get_text(" ", strip=True)
+            rowspan = _span(cell, "rowspan")
+            for _ in range(_span(cell, "colspan")):
+                if rowspan > 1:
+                    spanning[len(row)] = [rowspan - 1, text]
+                row.append(text)
+
+        while len(row) in spanning:
+            row.append(_take_span(spanning, len(row)))
+        if row:
+            rows.append(row)
+
+    return rows
+
+
+def _span(cell, attribute):
+    try:
+        return max(int(cell.get(attribute, 1)), 1)
+    except (TypeError, ValueError):
+        return 1
+
+
+def _take_span(spanning, column):
+    """Text of a rowspan cell continuing into this row."""
+    remaining, text = spanning[column]
+    if remaining == 1:
+        del spanning[column]
+    else:
+        spanning[column][0] = remaining - 1
+    return text
+
+
+def contains_welding_parameters(text):
+    """Check if text mentions at least MIN_TABLE_KEYWORDS different parameter keywords."""
+    found = set()
+    for match in KEYWORD_PATTERN.finditer(text.lower()):
+        found.add(match.group(0))
+        if len(found) >= MIN_TABLE_KEYWORDS:
+            return True
+    return False
+
+
+def standardize_columns(headers):
+    """Map table headers to standard record fields; unmatched headers are lowercased."""
+    names = [header.lower().strip() for header in headers]
+    columns = list(names)
+    unmatched = set(range(len(names)))
+    matched_fields = set()
+
+    for index, name in enumerate(names):
+        field = _EXACT_ALIASES.get(name)
+        if field is not None and field not in matched_fields:
+            columns[index] = field
+            unmatched.discard(index)
+            matched_fields.add(field)
+
+    for field, pattern in _ALIAS_PATTERNS.items():
+        if field in matched_fields:
+            continue
+        for index in sorted(unmatched):
+            if pattern.search(names[index]):
+                columns[index] = field
+                unmatched.discard(index)
+                matched_fields.add(field)
+                break
+
+    return columns
+
+
+def parse_welding_table(rows):
+    """Cleaned, validated parameter records from a table's rows (see table_rows).
+
+    The first row is the header.
+    """
+    if len(rows) < 2:
+        return []
+
+    columns = standardize_columns(rows[0])
+    records = []
+    for row in rows[1:]:
+        cleaned = clean_parameter_record(dict(zip(columns, row)))
+        if cleaned and validate_parameter_record(cleaned):
+            records.append(cleaned)
+    return records
+
+
+def clean_parameter_record(record):
+    """Clean and standardize a parameter record."""
+    cleaned = {}
+
+    for key, value in record.items():
+        if value is None or value == "" or (isinstance(value, float) and math.isnan(value)):
+            continue
+
+        if key in NUMERIC_FIELDS:
+            # Extract numeric value
+            if isinstance(value, str):
+                number = NUMBER_PATTERN.search(value)
+                if number:
+                    cleaned[key] = float(number.group(0).replace(",", ""))
+            elif isinstance(value, (int, float)):
+                cleaned[key] = float(value)
+        else:
+            cleaned[key] = str(value).strip()
+
+    return cleaned if cleaned else None
+
+
+def validate_parameter_record(record):
+    """Validate that a parameter record is reasonable."""
+    if not all(field in record for field in REQUIRED_FIELDS):
+        return False
+
+    for field, (min_val, max_val) in PARAMETER_RANGES.items():
+        if field in record and not min_val <= record[field] <= max_val:
+            return False
+    return True
+
+
+def is_parameter_chart(img_tag):
+    """Check if an image is likely a welding parameter chart."""
+    text = f"{img_tag.get('src', '')} {img_tag.get('alt', '')} {img_tag.get('title', '')}"
+    return CHART_PATTERN.search(text.lower()) is not None
+
+
+def extract_page(content):
+    """Parse an HTML page once and return (parameter records from its tables, chart image srcs)."""
+    soup = BeautifulSoup(content, "html.parser")
+
+    records = []
+    for table in soup.find_all("table"):
+        if contains_welding_parameters(table.get_text(" ")):
+            records.extend(parse_welding_table(table_rows(table)))
+
+    charts = [img["src"] for img in soup.find_all("img", src=True) if is_parameter_chart(img)]
+    return records, charts
@@ -383,8 +383,6 @@ class WeldingDataCollector:
 
     def save_to_database(self, data_list):
         """Save collected data to the database."""
-        saved_count = 0
-
         # Get reference data for IDs
         try:
             processes = self.db_manager.get_welding_processes()
@@ -399,18 +397,20 @@ class WeldingDataCollector:
             print(f"Warning: Could not load reference data from database: {e}")
             return 0
 
-        for record in data_list:
-            try:
-                # Map to database format
-                db_record = self._convert_to_db_record(record, process_map, material_map, position_map)
-                if db_record:
-                    self.db_manager.add_weld_parameter(db_record)
-                    saved_count += 1
-            except Exception as e:
-                print(f"Error saving record: {e}")
-                continue
+        db_records = []
+        source_indexes = []  # Position in data_list of each converted record
+        for index, record in enumerate(data_list):
+            # Map to database format
+            db_record = self._convert_to_db_record(record, process_map, material_map, position_map)
+            if db_record:
+                db_records.append(db_record)
+                source_indexes.append(index)
 
-        return saved_count
+        result = self.db_manager.add_weld_parameters_bulk(db_records)
+        for index, error in result["failures"]:
+            print(f"Error saving record {source_indexes[index]}: {error}")
+
+        return result["inserted"]
 
     def _convert_to_db_record(self, record, process_map, material_map, position_map):
         """Convert collected record to database format."""
@@ -462,10 +462,16 @@ class WeldingDataCollector:
 
             from models.ml_predictor import WeldParameterPredictor
 
+            # Grow the saved models with the new rows; update_models falls back to a full refit when needed
             predictor = WeldParameterPredictor()
-            predictor.train_models()
+            predictor.load_models()
+            mode = predictor.update_models()
+
+            if mode == "skipped":
+                print("⏳ Retraining deferred: too few new training rows since the last update")
+                return False
 
-            print("✅ Models retrained successfully!")
+            print(f"✅ Models retrained successfully ({mode})!")
             return True
 
         except Exception as e:
@@ -1,4 +1,6 @@
 from flask import Flask, render_template, request, jsonify, flash, redirect, url_for
+import base64
+import json
 import os
 import sys
 
@@ -6,8 +8,11 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 try:
-    from database.db_manager import DatabaseManager
+    from config import DATABASE_PAGE_SIZE, PREDICT_BATCH_MAX_SIZE, RULE_BASED_CONFIDENCE, USE_MODEL_REGISTRY
+    from database.db_manager import PARAMETER_SORT_COLUMNS, DatabaseManager
     from models.ml_predictor import WeldParameterPredictor
+    from models.model_watcher import ModelWatcher
+    from models.training_jobs import TrainingJobRunner
 except ImportError as e:
     print(f"Import error: {e}")
     print("Please ensure the database and models modules are available")
@@ -23,26 +28,40 @@ predictor = WeldParameterPredictor()
 predictor.load_models()
 
 
+def swap_predictor(new_predictor):
+    """Serve predictions from a newly trained predictor.
+
+    Rebinding the global is a single atomic assignment, so a request sees
+    either the old model set or the new one, never a mix.
+    """
+    global predictor
+    predictor = new_predictor
+
+
+# Background training; finished jobs swap their predictor in
+training_jobs = TrainingJobRunner(on_success=swap_predictor)
+
+# Hot reload: versions published by other processes (CLI, collectors) are loaded and swapped in
+model_watcher = ModelWatcher(get_predictor=lambda: predictor, on_swap=swap_predictor)
+if USE_MODEL_REGISTRY:
+    model_watcher.start()
+
+
 @app.route("/")
 def index():
     """Main page for parameter prediction."""
     try:
-        # Get dropdown options from database
-        base_materials = db_manager.get_materials("base").to_dict("records")
-        filler_materials = db_manager.get_materials("filler").to_dict("records")
-        joint_types = db_manager.get_joint_types().to_dict("records")
-        positions = db_manager.get_welding_positions().to_dict("records")
-        processes = db_manager.get_welding_processes().to_dict("records")
-        shielding_gases = db_manager.get_shielding_gases().to_dict("records")
+        # Get dropdown options from the in-memory reference cache
+        reference = db_manager.get_reference_data()
 
         return render_template(
             "index.html",
-            base_materials=base_materials,
-            filler_materials=filler_materials,
-            joint_types=joint_types,
-            positions=positions,
-            processes=processes,
-            shielding_gases=shielding_gases,
+            base_materials=reference["base_materials"],
+            filler_materials=reference["filler_materials"],
+            joint_types=reference["joint_types"],
+            positions=reference["positions"],
+            processes=reference["processes"],
+            shielding_gases=reference["shielding_gases"],
         )
     except Exception as e:
         flash(f"Error loading data: {str(e)}", "error")
@@ -65,26 +84,18 @@ def predict():
         form_data = request.get_json() if request.is_json else request.form.to_dict()
 
         # Prepare input for prediction
-        input_data = {
-            "thickness": float(form_data.get("thickness", 0)),
-            "base_carbon": float(form_data.get("base_carbon", 0)),
-            "base_thermal": float(form_data.get("base_thermal", 0)),
-            "base_melting_point": float(form_data.get("base_melting_point", 0)),
-            "base_density": float(form_data.get("base_density", 0)),
-            "filler_carbon": float(form_data.get("filler_carbon", 0)),
-            "filler_thermal": float(form_data.get("filler_thermal", 0)),
-            "process": form_data.get("process", ""),
-            "position": form_data.get("position", ""),
-            "joint_type": form_data.get("joint_type", ""),
-        }
+        input_data = parse_prediction_input(form_data)
+
+        # Bind the predictor once; a training job may swap the global mid-request
+        active_predictor = predictor
 
-        if not predictor.models:
+        if not active_predictor.models:
             # Fallback to rule-based predictions if no models are trained
             predictions = generate_rule_based_predictions(input_data)
-            confidence = {k: 0.6 for k in predictions.keys()}
+            confidence = {k: RULE_BASED_CONFIDENCE for k in predictions.keys()}
         else:
             # Use ML predictions
-            predictions, confidence = predictor.predict_parameters(input_data)
+            predictions, confidence = active_predictor.predict_parameters(input_data)
 
         # Format predictions
         formatted_predictions = {
@@ -110,6 +121,63 @@ def predict():
             return redirect(url_for("index"))
 
 
+@app.route("/predict_batch", methods=["POST"])
+def predict_batch():
+    """Generate parameter predictions for many joints in one request.
+
+    Expects a JSON body of the form {"inputs": [{...}, ...]} where each entry
+    has the same fields as /predict. Predictions are returned as numbers, in
+    input order.
+    """
+    try:
+        payload = request.get_json(silent=True) or {}
+        raw_inputs = payload.get("inputs") if isinstance(payload, dict) else payload
+
+        if not isinstance(raw_inputs, list):
+            return jsonify({"success": False, "error": "Expected a JSON list under 'inputs'"}), 400
+        if len(raw_inputs) > PREDICT_BATCH_MAX_SIZE:
+            error_msg = f"Batch too large ({len(raw_inputs)} inputs, max {PREDICT_BATCH_MAX_SIZE})"
+            return jsonify({"success": False, "error": error_msg}), 400
+
+        inputs = [parse_prediction_input(item) for item in raw_inputs]
+        active_predictor = predictor
+
+        if not active_predictor.models:
+            # Fallback to rule-based predictions if no models are trained
+            results = []
+            for input_data in inputs:
+                predictions = generate_rule_based_predictions(input_data)
+                results.append((predictions, {k: RULE_BASED_CONFIDENCE for k in predictions.keys()}))
+        else:
+            results = active_predictor.predict_batch(inputs)
+
+        return jsonify(
+            {
+                "success": True,
+                "predictions": [dict(predictions, confidence=confidence) for predictions, confidence in results],
+            }
+        )
+
+    except Exception as e:
+        return jsonify({"success": False, "error": f"Error generating predictions: {str(e)}"})
+
+
+def parse_prediction_input(form_data):
+    """Convert submitted form or JSON fields into a predictor input dict."""
+    return {
+        "thickness": float(form_data.get("thickness", 0)),
+        "base_carbon": float(form_data.get("base_carbon", 0)),
+        "base_thermal": float(form_data.get("base_thermal", 0)),
+        "base_melting_point": float(form_data.get("base_melting_point", 0)),
+        "base_density": float(form_data.get("base_density", 0)),
+        "filler_carbon": float(form_data.get("filler_carbon", 0)),
+        "filler_thermal": float(form_data.get("filler_thermal", 0)),
+        "process": form_data.get("process", ""),
+        "position": form_data.get("position", ""),
+        "joint_type": form_data.get("joint_type", ""),
+    }
+
+
 def generate_rule_based_predictions(input_data):
     """Generate rule-based predictions when ML models aren't available."""
     thickness = input_data.get("thickness", 3.0)
@@ -168,37 +236,168 @@ def feedback():
 
 @app.route("/database")
 def database_view():
-    """View database contents."""
+    """View database contents.
+
+    Renders the filters and statistics; the table itself is filled page by
+    page from /api/parameters.
+    """
     try:
-        parameters = db_manager.get_weld_parameters()
-        return render_template("database.html", parameters=parameters.to_dict("records"))
+        filters, sort, descending, limit = parse_parameter_query(request.args)
+        reference = db_manager.get_reference_data()
+        return render_template(
+            "database.html",
+            stats=db_manager.get_parameter_stats(filters),
+            filters=filters,
+            sort=sort,
+            descending=descending,
+            limit=limit,
+            sort_columns=PARAMETER_SORT_COLUMNS,
+            processes=reference["processes"],
+            base_materials=reference["base_materials"],
+            positions=reference["positions"],
+        )
     except Exception as e:
         flash(f"Error loading database: {str(e)}", "error")
-        return render_template("database.html", parameters=[])
+        return render_template(
+            "database.html",
+            stats=None,
+            filters={},
+            sort="id",
+            descending=False,
+            limit=DATABASE_PAGE_SIZE,
+            sort_columns=PARAMETER_SORT_COLUMNS,
+            processes=[],
+            base_materials=[],
+            positions=[],
+        )
+
+
+@app.route("/api/parameters")
+def api_parameters():
+    """API endpoint for one page of weld parameter records.
+
+    Accepts the /database filters (process, base_material, position,
+    thickness_min, thickness_max), sort, order (asc or desc), limit and the
+    cursor returned as next_cursor by the previous page.
+    """
+    try:
+        filters, sort, descending, limit = parse_parameter_query(request.args)
+        after = decode_cursor(request.args["cursor"]) if request.args.get("cursor") else None
+        page = db_manager.get_parameter_page(filters, sort=sort, descending=descending, after=after, limit=limit)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+    next_cursor = encode_cursor(page["next_cursor"]) if page["next_cursor"] else None
+    return jsonify({"rows": page["rows"], "next_cursor": next_cursor})
+
+
+def parse_parameter_query(args):
+    """Read the database view's filters, sort order and page size from query arguments."""
+    filters = {key: args.get(key) or None for key in ("process", "base_material", "position")}
+    for key in ("thickness_min", "thickness_max"):
+        value = args.get(key)
+        filters[key] = float(value) if value else None
+
+    sort = args.get("sort", "id")
+    descending = args.get("order", "asc") == "desc"
+    limit = int(args.get("limit") or DATABASE_PAGE_SIZE)
+    return filters, sort, descending, limit
+
+
+def encode_cursor(cursor):
+    """Encode a keyset cursor as an opaque URL-safe token."""
+    return base64.urlsafe_b64encode(json.dumps([cursor["value"], cursor["id"]]).encode()).decode()
+
+
+def decode_cursor(token):
+    """Decode a token from encode_cursor; raises ValueError if it is malformed."""
+    try:
+        value, last_id = json.loads(base64.urlsafe_b64decode(token.encode()))
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {token}") from e
+    return {"value": value, "id": int(last_id)}
 
 
 @app.route("/api/materials/<material_type>")
 def api_materials(material_type):
     """API endpoint for getting materials."""
     try:
-        materials = db_manager.get_materials(material_type)
-        return jsonify(materials.to_dict("records"))
+        materials = db_manager.get_reference_data()["materials"]
+        return jsonify([m for m in materials if m["type"] == material_type])
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
-@app.route("/train_models")
-def train_models():
-    """Trigger model training."""
-    try:
-        predictor.train_models()
-        flash("Models trained successfully!", "success")
-    except Exception as e:
-        flash(f"Error training models: {str(e)}", "error")
+@app.route("/api/db_stats")
+def api_db_stats():
+    """API endpoint for database connection pool counters."""
+    return jsonify(db_manager.pool_stats())
+
 
+@app.route("/api/model_version")
+def api_model_version():
+    """API endpoint for the model version being served, its load time and the registry's active version."""
+    return jsonify(
+        {
+            "serving": predictor.model_info,
+            "active": model_watcher.registry.active_version(),
+            "watcher": model_watcher.status(),
+        }
+    )
+
+
+@app.route("/train_models", methods=["GET", "POST"])
+def train_models():
+    """Start model training in the background.
+
+    Returns straight away; poll /api/train_jobs/<job_id> for progress. A
+    job already queued or running is reused rather than starting another.
+    """
+    job = training_jobs.active_job()
+    started = job is None
+    if started:
+        engine = request.args.get("engine")
+        job = training_jobs.submit(engine=engine if engine in ("per_target", "multi_output") else None)
+
+    if request.is_json or request.args.get("format") == "json":
+        return jsonify({"success": True, "started": started, "job": job.to_dict()}), 202
+
+    if started:
+        flash(f"Model training started in the background (job {job.id})", "success")
+    else:
+        flash(f"Model training is already in progress (job {job.id}, {job.status})", "success")
     return redirect(url_for("index"))
 
 
+@app.route("/api/train_jobs")
+def api_train_jobs():
+    """API endpoint listing recent training jobs, newest first."""
+    return jsonify([job.to_dict() for job in training_jobs.jobs()])
+
+
+@app.route("/api/train_jobs/<job_id>")
+def api_train_job(job_id):
+    """API endpoint for one training job's status and progress."""
+    job = training_jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": f"Unknown training job: {job_id}"}), 404
+    return jsonify(job.to_dict())
+
+
+@app.route("/api/train_jobs/<job_id>/cancel", methods=["POST"])
+def api_cancel_train_job(job_id):
+    """API endpoint to cancel a queued or running training job.
+
+    A running job stops at its next stage or cross-validation batch, so its
+    status may stay "running" for a while after the request.
+    """
+    if not training_jobs.cancel(job_id):
+        return jsonify({"success": False, "error": f"No active training job: {job_id}"}), 404
+    return jsonify({"success": True, "job": training_jobs.get(job_id).to_dict()})
+
+
 if __name__ == "__main__":
     # Ensure database exists
     try:
@@ -2,13 +2,31 @@ import requests
 from bs4 import BeautifulSoup
 import csv
 import os
+import sys
+
+# Share the weld optimizer's on-disk HTTP cache, so pages and images unchanged
+# since the last run cost a conditional request instead of a full download
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "AI_Helper", "weld_optimizer"))
+
+from utils.http_cache import CacheMiss, HttpCache
+
+session = requests.Session()
+_cache = None
+
+
+def get_cache():
+    """The shared HTTP cache, opened on first use."""
+    global _cache
+    if _cache is None:
+        _cache = HttpCache()
+    return _cache
 
 
 def gather_data(url):
     try:
-        response = requests.get(url)
+        response = get_cache().get(url, session=session, timeout=10)
         response.raise_for_status()
-    except requests.RequestException as e:
+    except (requests.RequestException, CacheMiss) as e:
         print(f"Error fetching {url}: {e}")
         return [], []
 
@@ -44,9 +62,9 @@ def download_image(url):
         return "No image"
 
     try:
-        response = requests.get(url)
+        response = get_cache().get(url, session=session, timeout=10)
         response.raise_for_status()
-    except requests.RequestException as e:
+    except (requests.RequestException, CacheMiss) as e:
         print(f"Error downloading image {url}: {e}")
         return "No image"
 
@@ -55,12 +73,21 @@ def download_image(url):
     img_name = os.path.basename(url)
     img_path = os.path.join("images", img_name)
 
-    with open(img_path, "wb") as img_file:
-        img_file.write(response.content)
+    # Only rewrite the file when its content differs (another URL may share the basename)
+    if not (os.path.exists(img_path) and file_matches(img_path, response.content)):
+        with open(img_path, "wb") as img_file:
+            img_file.write(response.content)
 
     return img_path
 
 
+def file_matches(path, content):
+    if os.path.getsize(path) != len(content):
+        return False
+    with open(path, "rb") as existing:
+        return existing.read() == content
+
+
 def save_to_csv(headers, data, filename):
     with open(filename, mode="w", newline="") as file:
         writer = csv.writer(file)
@@ -70,6 +97,10 @@ def save_to_csv(headers, data, filename):
 
 
 def main():
+    # --cache-only works offline from the pages and images cached by earlier runs
+    if "--cache-only" in sys.argv:
+        get_cache().cache_only = True
+
     urls = [
         "https://weldguru.com/mig-welder-settings/",
         "https://weldguru.com/wp-content/uploads/wire-selection-settings-chart-large.jpg/",